@@ -0,0 +1,107 @@
+"""
+Latency / memory benchmark for the ModelManager inference backends.
+
+Every backend runs in its own subprocess so import time and resident memory are
+measured in isolation. Results are printed (and optionally written) as JSON.
+
+Usage (from app/digital_advisor):
+    python -m benchmarks.bench_inference_backends --backends keras numpy tflite --tickers APP NVDA --iterations 200
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+
+def _model_path(company: str) -> str:
+    from src.config import MODEL_TYPE1_CONFIG, COMPANIES_TYPE1, MODEL_TYPE2_CONFIG
+    model_dir = MODEL_TYPE1_CONFIG["MODEL_DIR"] if company in COMPANIES_TYPE1 else MODEL_TYPE2_CONFIG["MODEL_DIR"]
+    return os.path.join(model_dir, f"{company}_model.keras")
+
+
+def _percentiles(samples_ms: list) -> dict:
+    samples = np.asarray(samples_ms)
+    return {
+        "mean_ms": float(samples.mean()),
+        "p50_ms": float(np.percentile(samples, 50)),
+        "p95_ms": float(np.percentile(samples, 95)),
+        "p99_ms": float(np.percentile(samples, 99)),
+    }
+
+
+def run_backend(backend: str, tickers: list, iterations: int) -> dict:
+    """Runs inside the worker subprocess: import, load and time single-sample predictions."""
+    start = time.perf_counter()
+    if backend == "keras":
+        from tensorflow.keras.models import load_model as loader
+    elif backend == "numpy":
+        from src.utils.numpy_inference import NumpyModel
+        loader = NumpyModel.from_keras_file
+    elif backend == "tflite":
+        from src.utils.tflite_inference import TFLiteModel
+        loader = TFLiteModel.from_keras_file
+    else:
+        raise ValueError(f"Unknown backend '{backend}'")
+    import_s = time.perf_counter() - start
+
+    rng = np.random.default_rng(0)
+    result = {"backend": backend, "import_s": import_s, "tickers": {}}
+    for company in tickers:
+        start = time.perf_counter()
+        model = loader(_model_path(company))
+        load_s = time.perf_counter() - start  # includes the one-off conversion for an uncached tflite model
+
+        input_shape = tuple(model.input_shape[1:]) if backend == "keras" else model.input_shape
+        x = rng.random((1, *input_shape), dtype=np.float32)
+        model.predict(x)  # warm-up (graph tracing for keras)
+
+        latencies = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            model.predict(x)
+            latencies.append((time.perf_counter() - start) * 1000)
+        result["tickers"][company] = {"load_s": load_s, **_percentiles(latencies)}
+
+    # ru_maxrss is reported in KiB on Linux
+    result["max_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["keras", "numpy", "tflite"])
+    parser.add_argument("--tickers", nargs="+", default=["APP", "NVDA"])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", help="Optional path for the JSON results")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_backend(args.worker, args.tickers, args.iterations)))
+        return
+
+    env = dict(os.environ, TF_CPP_MIN_LOG_LEVEL="3")
+    results = []
+    for backend in args.backends:
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_inference_backends", "--worker", backend,
+             "--tickers", *args.tickers, "--iterations", str(args.iterations)],
+            capture_output=True, text=True, check=True, env=env
+        )
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    report = json.dumps({"results": results}, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
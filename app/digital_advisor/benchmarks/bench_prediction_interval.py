@@ -0,0 +1,68 @@
+"""
+Latency of a Monte-Carlo dropout interval (Predictor.predict_interval) against a point
+prediction (Predictor.predict_window) on the same window, per backend and sample count.
+
+Usage (from app/digital_advisor):
+    python -m benchmarks.bench_prediction_interval --backends numpy keras --tickers APP META --samples 16 64 256
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from benchmarks.bench_inference_backends import _percentiles
+
+
+def _time_ms(fn, iterations: int) -> list:
+    fn()  # warm-up (artifact loading, graph tracing for keras)
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def run(backends: list, tickers: list, sample_counts: list, iterations: int) -> list:
+    from src.services.prediction_service import Predictor, get_model_config
+
+    rng = np.random.default_rng(0)
+    results = []
+    for backend in backends:
+        predictor = Predictor(backend=backend, use_inference_pool=False, micro_batching=False)
+        for company in tickers:
+            model_config = get_model_config(company)
+            window = 100.0 + rng.normal(size=(model_config["SEQ_LENGTH"], len(model_config["FEATURES"])))
+            point = _percentiles(_time_ms(lambda: predictor.predict_window(company, window), iterations))
+            entry = {"backend": backend, "ticker": company, "point": point, "intervals": {}}
+            for samples in sample_counts:
+                interval = _percentiles(_time_ms(
+                    lambda: predictor.predict_interval(company, window, samples=samples), iterations))
+                interval["extra_p50_ms"] = interval["p50_ms"] - point["p50_ms"]
+                entry["intervals"][str(samples)] = interval
+            results.append(entry)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["numpy", "keras"])
+    parser.add_argument("--tickers", nargs="+", default=["APP", "META"])
+    parser.add_argument("--samples", nargs="+", type=int, default=[16, 64, 256])
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--output", help="Optional path for the JSON results")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+    report = json.dumps({"results": run(args.backends, args.tickers, args.samples, args.iterations)}, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+End-to-end PredictionService benchmark on synthetic data and artifacts.
+
+Generates synthetic cleaned_dataset bars (SQLite) and random model/scaler/PCA artifacts
+shaped like MODEL_TYPE1_CONFIG / MODEL_TYPE2_CONFIG (see benchmarks/synthetic.py), then,
+for every inference backend in its own subprocess, measures:
+
+- import_s: importing the prediction stack
+- cold_ms: first run_prediction per ticker (artifact loading included)
+- warm: run_prediction latency when the prediction has to be generated (model run + save)
+- cached: run_prediction latency for an already served prediction
+- batch: run_predictions throughput over every ticker (tickers/s)
+- stages: mean per-stage latency from the prediction.stage.* histograms
+- max_rss_mb: peak resident memory of the worker
+
+Results are printed (and optionally written) as JSON.
+
+Usage (from app/digital_advisor):
+    python -m benchmarks.bench_prediction_service --backends numpy keras --iterations 100 --output results.json
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_inference_backends import _percentiles
+from benchmarks.synthetic import build_synthetic_artifacts, create_benchmark_app, seed_database, use_artifact_dir
+
+DEFAULT_TICKERS = ["APP", "PEP", "TSLA", "BKNG", "META", "NVDA", "PLTR"]
+
+
+def _reset_predictions(service, tickers: list) -> None:
+    """Forgets the served predictions (stored and in-process) so the next call runs the model again."""
+    from src.extensions import db
+    from src.models.prediction import Prediction
+    from src.utils.prediction_cache import PredictionCache
+
+    Prediction.query.filter(Prediction.ticker.in_(tickers)).delete(synchronize_session=False)
+    db.session.commit()
+    # invalidate_cache() only forgets the latest bars; the values for an unchanged bar would still be served
+    cache = service.prediction_cache
+    service.prediction_cache = PredictionCache(max_entries=cache.max_entries, ttl_seconds=cache.ttl_seconds)
+
+
+def _time_ms(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def run_worker(backend: str, artifact_dir: str, database_uri: str, tickers: list,
+               iterations: int, batch_rounds: int) -> dict:
+    """Runs inside the worker subprocess (INFERENCE_BACKEND is set in its environment)."""
+    start = time.perf_counter()
+    from src.services.prediction_service import PredictionService
+    from src.utils.stage_timing import stage_timings_snapshot
+    import_s = time.perf_counter() - start
+
+    use_artifact_dir(artifact_dir)
+    app = create_benchmark_app(database_uri)
+    result = {"backend": backend, "import_s": import_s, "tickers": {}}
+    with app.app_context():
+        service = PredictionService()
+        _reset_predictions(service, tickers)
+
+        for company in tickers:
+            cold_ms = _time_ms(lambda: service.run_prediction(company))
+            warm = []
+            for _ in range(iterations):
+                _reset_predictions(service, [company])
+                warm.append(_time_ms(lambda: service.run_prediction(company)))
+            cached = [_time_ms(lambda: service.run_prediction(company)) for _ in range(iterations)]
+            result["tickers"][company] = {"cold_ms": cold_ms, "warm": _percentiles(warm),
+                                          "cached": _percentiles(cached)}
+
+        batch = []
+        for _ in range(batch_rounds):
+            _reset_predictions(service, tickers)
+            batch.append(_time_ms(lambda: service.run_predictions(tickers)))
+        result["batch"] = {**_percentiles(batch), "tickers_per_s": len(tickers) * len(batch) / (sum(batch) / 1000)}
+
+        result["stages"] = {
+            company: {name: histogram["mean"] for name, histogram in stages.items()}
+            for company, stages in stage_timings_snapshot(tickers).items()
+        }
+
+    # ru_maxrss is reported in KiB on Linux
+    result["max_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return result
+
+
+def prepare(workdir: str, tickers: list, num_bars: int, seed: int) -> tuple:
+    """Builds the synthetic artifacts and database once; returns (artifact_dir, database_uri)."""
+    artifact_dir = os.path.join(workdir, "artifacts")
+    database_path = os.path.join(workdir, "benchmark.db")
+    if os.path.exists(database_path):
+        os.remove(database_path)
+    database_uri = f"sqlite:///{database_path}"
+    build_synthetic_artifacts(artifact_dir, tickers, num_bars=num_bars, seed=seed)
+    app = create_benchmark_app(database_uri)
+    with app.app_context():
+        seed_database(tickers, num_bars, seed)
+    return artifact_dir, database_uri
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["numpy", "keras", "tflite"])
+    parser.add_argument("--tickers", nargs="+", default=DEFAULT_TICKERS)
+    parser.add_argument("--bars", type=int, default=2_000, help="Synthetic bars per ticker")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--batch-rounds", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", help="Keep the synthetic artifacts and database here (default: a temp dir)")
+    parser.add_argument("--output", help="Optional path for the JSON results")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--artifact-dir", help=argparse.SUPPRESS)
+    parser.add_argument("--database-uri", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.artifact_dir, args.database_uri, args.tickers,
+                                    args.iterations, args.batch_rounds)))
+        return
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="digital_advisor_bench_")
+    try:
+        artifact_dir, database_uri = prepare(workdir, args.tickers, args.bars, args.seed)
+        results = []
+        for backend in args.backends:
+            env = dict(os.environ, TF_CPP_MIN_LOG_LEVEL="3", INFERENCE_BACKEND=backend)
+            completed = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_prediction_service", "--worker", backend,
+                 "--artifact-dir", artifact_dir, "--database-uri", database_uri, "--tickers", *args.tickers,
+                 "--iterations", str(args.iterations), "--batch-rounds", str(args.batch_rounds)],
+                capture_output=True, text=True, check=True, env=env
+            )
+            results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    config = {"tickers": args.tickers, "bars": args.bars, "iterations": args.iterations,
+              "batch_rounds": args.batch_rounds, "seed": args.seed}
+    report = json.dumps({"config": config, "results": results}, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Throughput and tail latency of concurrent TensorFlow workers under different thread-pool sizes.
+
+Simulates a multi-worker deployment: for every thread setting, PROCESSES worker processes
+each load the models through ModelManager (which applies TF_INTRA_OP_THREADS /
+TF_INTER_OP_THREADS before the first load), wait until all of them are ready, then call
+model.predict in a loop for DURATION seconds. Reported per setting: aggregate predictions/s
+and latency percentiles over every call of every worker. The models are the synthetic
+artifacts of benchmarks/synthetic.py, so no trained models are needed.
+
+Settings are "intra,inter" pairs or "auto"; "0,0" is TensorFlow's default (pools as wide as
+the machine in every process).
+
+Usage (from app/digital_advisor):
+    python -m benchmarks.bench_tf_threading --processes 4 --settings 0,0 auto 1,1 2,1 --duration 10
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.bench_inference_backends import _percentiles
+from benchmarks.synthetic import build_synthetic_artifacts, use_artifact_dir
+
+
+def run_worker(artifact_dir: str, tickers: list, duration: float, batch_size: int) -> dict:
+    """Runs inside a worker subprocess: load, report ready, wait for "go", then predict in a loop."""
+    from src.utils.prediction_utils import ModelManager
+
+    use_artifact_dir(artifact_dir)
+    manager = ModelManager()
+    models = {company: manager.get_model(company) for company in tickers}
+    rng = np.random.default_rng(os.getpid())
+    inputs = {}
+    for company, model in models.items():
+        input_shape = tuple(model.input_shape[1:]) if manager.backend == "keras" else tuple(model.input_shape)
+        inputs[company] = rng.random((batch_size, *input_shape), dtype=np.float32)
+        model.predict(inputs[company])  # warm-up (graph tracing for keras)
+
+    print("ready", flush=True)
+    sys.stdin.readline()
+
+    latencies = []
+    deadline = time.perf_counter() + duration
+    i = 0
+    while time.perf_counter() < deadline:
+        company = tickers[i % len(tickers)]
+        start = time.perf_counter()
+        models[company].predict(inputs[company])
+        latencies.append((time.perf_counter() - start) * 1000)
+        i += 1
+    return {"intra_op": manager.intra_op_threads, "inter_op": manager.inter_op_threads, "latencies_ms": latencies}
+
+
+def run_setting(setting: str, processes: int, backend: str, artifact_dir: str, tickers: list,
+                duration: float, batch_size: int) -> dict:
+    intra, _, inter = setting.partition(",") if setting != "auto" else ("auto", "", "auto")
+    env = dict(os.environ, TF_CPP_MIN_LOG_LEVEL="3", INFERENCE_BACKEND=backend,
+               TF_INTRA_OP_THREADS=intra, TF_INTER_OP_THREADS=inter or "auto", TF_SERVING_PROCESSES=str(processes))
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.bench_tf_threading", "--worker", "--artifact-dir", artifact_dir,
+             "--tickers", *tickers, "--duration", str(duration), "--batch-size", str(batch_size)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, env=env
+        )
+        for _ in range(processes)
+    ]
+    for worker in workers:
+        # Skip anything printed while loading (e.g. Keras progress bars) up to the ready line
+        line = worker.stdout.readline()
+        while line and line.strip() != "ready":
+            line = worker.stdout.readline()
+        if not line:
+            raise RuntimeError(f"Benchmark worker failed to start (exit code {worker.wait()}).")
+    for worker in workers:
+        worker.stdin.write("go\n")
+        worker.stdin.flush()
+
+    results = []
+    for worker in workers:
+        output, _ = worker.communicate()
+        if worker.returncode != 0:
+            raise RuntimeError(f"Benchmark worker exited with code {worker.returncode}.")
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    latencies = [latency for result in results for latency in result["latencies_ms"]]
+    return {
+        "setting": setting,
+        "processes": processes,
+        "intra_op": results[0]["intra_op"],
+        "inter_op": results[0]["inter_op"],
+        "predictions_per_s": len(latencies) * batch_size / duration,
+        **_percentiles(latencies),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", nargs="+", type=int, default=[os.cpu_count() or 1],
+                        help="Concurrent worker processes (one run per value)")
+    parser.add_argument("--settings", nargs="+", default=["0,0", "auto", "1,1"])
+    parser.add_argument("--backend", default="keras", choices=["keras", "tflite"])
+    parser.add_argument("--tickers", nargs="+", default=["APP", "META"])
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load per run")
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--output", help="Optional path for the JSON results")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--artifact-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_worker(args.artifact_dir, args.tickers, args.duration, args.batch_size)))
+        return
+
+    workdir = tempfile.mkdtemp(prefix="digital_advisor_bench_")
+    try:
+        artifact_dir = os.path.join(workdir, "artifacts")
+        build_synthetic_artifacts(artifact_dir, args.tickers)
+        results = [
+            run_setting(setting, processes, args.backend, artifact_dir, args.tickers, args.duration, args.batch_size)
+            for processes in args.processes for setting in args.settings
+        ]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    config = {"backend": args.backend, "tickers": args.tickers, "duration_s": args.duration,
+              "batch_size": args.batch_size, "cpu_count": os.cpu_count()}
+    report = json.dumps({"config": config, "results": results}, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Synthetic cleaned_dataset rows and model/scaler/PCA artifacts for the benchmarks.
+
+The artifacts have the layout and shapes of the real ones (MODEL_TYPE1_CONFIG /
+MODEL_TYPE2_CONFIG: LSTM -> Dropout -> Dense -> Dense over SEQ_LENGTH x FEATURES, a
+MinMaxScaler, and for Type 2 a PCA in front of the model) but random weights, so every
+optimization of the prediction path can be measured without the trained models.
+"""
+
+import datetime
+import os
+
+import numpy as np
+
+# Layer sizes of the shipped models
+LSTM_UNITS = {1: 64, 2: 96}
+DENSE_UNITS = 25
+DROPOUT_RATE = 0.3
+PCA_COMPONENTS = 3
+
+BENCHMARK_START = datetime.datetime(2024, 1, 2, 14, 30)
+
+
+def synthetic_bars(company: str, num_bars: int, seed: int = 0, start: datetime.datetime = BENCHMARK_START) -> list:
+    """Random-walk one-minute bars (cleaned_dataset column -> value dicts) with slowly moving macro values."""
+    rng = np.random.default_rng([seed, sum(map(ord, company))])
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.001, num_bars)))
+    volume = rng.integers(1_000, 100_000, num_bars)
+    drift = np.linspace(0.0, 1.0, num_bars)
+    rows = []
+    for i in range(num_bars):
+        rows.append({
+            "company_prefix": company,
+            "date_value": start + datetime.timedelta(minutes=i),
+            "open_value": float(close[i - 1] if i else close[0]),
+            "high_value": float(close[i] * 1.0005),
+            "low_value": float(close[i] * 0.9995),
+            "close_value": float(close[i]),
+            "volume": int(volume[i]),
+            "gdp_growth": 0.02 + 0.001 * drift[i],
+            "consumer_price_index_for_all_urban_consumers": 300.0 + drift[i],
+            "retail_sales_data_excluding_food_services": 600_000.0 + 100.0 * drift[i],
+            "crude_oil_price": 75.0 + 2.0 * drift[i],
+            "interest_rate_fed_funds": 5.3,
+            "stock_market_volatility_vix_index": 14.0 + drift[i],
+            "ten_year_treasury_yield": 4.1 + 0.1 * drift[i],
+        })
+    return rows
+
+
+def seed_database(companies: list, num_bars: int, seed: int = 0) -> None:
+    """Inserts `num_bars` synthetic bars per company into cleaned_dataset (needs an app context)."""
+    from src.extensions import db
+    from src.models.dataset import Dataset
+
+    for company in companies:
+        db.session.bulk_insert_mappings(Dataset, synthetic_bars(company, num_bars, seed))
+    db.session.commit()
+
+
+def create_benchmark_app(database_uri: str):
+    """Minimal Flask app with the prediction tables, without the production startup hooks."""
+    from flask import Flask
+    from src.extensions import db
+
+    app = Flask(__name__)
+    app.config.from_mapping(SQLALCHEMY_DATABASE_URI=database_uri, SQLALCHEMY_TRACK_MODIFICATIONS=False)
+    db.init_app(app)
+    with app.app_context():
+        # Register every table on the metadata before create_all
+        import src.models.dataset, src.models.prediction, src.models.prediction_claim  # noqa: F401
+        import src.models.prediction_accuracy  # noqa: F401
+        db.create_all()
+    return app
+
+
+def use_artifact_dir(artifact_dir: str) -> None:
+    """Points MODEL_TYPE1_CONFIG / MODEL_TYPE2_CONFIG at a synthetic artifact directory (in this process)."""
+    from src.config import MODEL_TYPE1_CONFIG, MODEL_TYPE2_CONFIG
+
+    MODEL_TYPE1_CONFIG.update(MODEL_DIR=os.path.join(artifact_dir, "saved_models_type1"),
+                              SCALER_DIR=os.path.join(artifact_dir, "saved_scalers_type1"))
+    MODEL_TYPE2_CONFIG.update(MODEL_DIR=os.path.join(artifact_dir, "saved_models_type2"),
+                              SCALER_DIR=os.path.join(artifact_dir, "saved_scalers_type2"),
+                              PCA_DIR=os.path.join(artifact_dir, "saved_pca_models"))
+
+
+def _random_keras_model(seq_length: int, num_inputs: int, num_outputs: int, lstm_units: int, seed: int):
+    import keras
+
+    keras.utils.set_random_seed(seed)
+    return keras.Sequential([
+        keras.Input(shape=(seq_length, num_inputs)),
+        keras.layers.LSTM(lstm_units),
+        keras.layers.Dropout(DROPOUT_RATE),
+        keras.layers.Dense(DENSE_UNITS, activation="relu"),
+        keras.layers.Dense(num_outputs),
+    ])
+
+
+def build_synthetic_artifacts(artifact_dir: str, companies: list, num_bars: int = 2_000, seed: int = 0) -> None:
+    """
+    Writes `<company>_model.keras`, `<company>_scaler.pkl` and (Type 2) `<company>_pca.pkl` for every
+    company under artifact_dir, in the saved_artifacts layout. Scalers and PCAs are fitted on the
+    features of the synthetic bars, so predictions stay in a realistic range.
+    """
+    import joblib
+    from types import SimpleNamespace
+    from sklearn.decomposition import PCA
+    from sklearn.preprocessing import MinMaxScaler
+    from src.config import COMPANIES_TYPE1, MODEL_TYPE1_CONFIG, MODEL_TYPE2_CONFIG
+    from src.services.prediction_service import build_feature_matrix_from_rows
+
+    for company in companies:
+        model_type = 1 if company in COMPANIES_TYPE1 else 2
+        model_config = MODEL_TYPE1_CONFIG if model_type == 1 else MODEL_TYPE2_CONFIG
+        rows = [SimpleNamespace(**row) for row in synthetic_bars(company, num_bars, seed)]
+        features = build_feature_matrix_from_rows(company, rows, model_config)
+
+        scaler = MinMaxScaler().fit(features)
+        scaler_dir = os.path.join(artifact_dir, f"saved_scalers_type{model_type}")
+        os.makedirs(scaler_dir, exist_ok=True)
+        joblib.dump(scaler, os.path.join(scaler_dir, f"{company}_scaler.pkl"))
+
+        num_inputs = len(model_config["FEATURES"])
+        if model_type == 2:
+            pca = PCA(n_components=PCA_COMPONENTS).fit(scaler.transform(features))
+            pca_dir = os.path.join(artifact_dir, "saved_pca_models")
+            os.makedirs(pca_dir, exist_ok=True)
+            joblib.dump(pca, os.path.join(pca_dir, f"{company}_pca.pkl"))
+            num_inputs = PCA_COMPONENTS
+
+        model_dir = os.path.join(artifact_dir, f"saved_models_type{model_type}")
+        os.makedirs(model_dir, exist_ok=True)
+        model = _random_keras_model(model_config["SEQ_LENGTH"], num_inputs, 1 if model_type == 1 else PCA_COMPONENTS,
+                                    LSTM_UNITS[model_type], seed)
+        model.save(os.path.join(model_dir, f"{company}_model.keras"))
@@ -2,10 +2,13 @@ import os
 from flask import Flask, render_template, request, jsonify
 from .extensions import db, migrate, jwt, cors
 from .config import Config
+from .cli import register_commands
 from .routes.auth_routes import auth_bp
 from .routes.portfolio_routes import portfolio_bp
 from .routes.price_routes import price_bp
-from .routes.prediction_routes import prediction_bp
+from .routes.prediction_routes import prediction_bp, get_prediction_service
+from .routes.health_routes import health_bp
+from .services.prediction_scheduler import SCHEDULER_MODES, create_scheduler
 from .routes.balance_routes import balance_bp
 from .routes.transaction_routes import transaction_bp
 
@@ -23,9 +26,23 @@ def create_app():
     jwt.init_app(app)
     cors.init_app(app)  # Enable CORS for the app
 
-    # # Load models (commented out as per your provided code)
-    # model_dir = app.config.get("MODEL_DIRECTORY")
-    # app.models = load_models_from_directory(model_dir)
+    register_commands(app)
+
+    # Optionally warm up every model/scaler/PCA artifact in a background thread pool.
+    # /healthz/ready reports 503 until all of them are loaded.
+    if app.config.get("PRELOAD_MODELS"):
+        get_prediction_service().predictor.preload(
+            max_workers=app.config.get("PRELOAD_MAX_WORKERS", 4),
+            wait=False
+        )
+
+    # Precompute next-minute predictions in the background so /predict is a plain DB read.
+    scheduler_mode = app.config.get("PREDICTION_SCHEDULER_MODE", "off")
+    if scheduler_mode not in SCHEDULER_MODES:
+        raise ValueError(f"Unsupported PREDICTION_SCHEDULER_MODE '{scheduler_mode}'. Use one of {SCHEDULER_MODES}.")
+    if scheduler_mode == "embedded":
+        app.extensions["prediction_scheduler"] = create_scheduler(app, get_prediction_service)
+        app.extensions["prediction_scheduler"].start()
 
     # Register API blueprints
     app.register_blueprint(auth_bp)
@@ -34,6 +51,7 @@ def create_app():
     app.register_blueprint(prediction_bp)
     app.register_blueprint(balance_bp)
     app.register_blueprint(transaction_bp)
+    app.register_blueprint(health_bp)
 
     # Frontend routes (serving HTML pages)
     @app.route('/')
@@ -109,7 +127,7 @@ def create_app():
 # If you run your app directly using `python app.py` for local development
 if __name__ == '__main__':
     app = create_app()
-    # IMPORTANT: use_reloader=False is crucial with APScheduler
-    # as it prevents duplicate jobs from being scheduled when Flask reloads.
+    # IMPORTANT: use_reloader=False is crucial with PREDICTION_SCHEDULER_MODE=embedded
+    # as it prevents a second scheduler thread in the reloader's parent process.
     app.run(debug=True, use_reloader=False) 
 
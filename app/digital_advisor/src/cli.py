@@ -0,0 +1,160 @@
+# app/cli.py
+
+import json
+import os
+import click
+
+
+def register_commands(app):
+    """Registers the project's Flask CLI commands (`flask <command>`)."""
+
+    @app.cli.command("startup-report")
+    @click.option("--top", default=20, show_default=True, help="Number of modules to list.")
+    @click.option("--as-json", is_flag=True, help="Print the raw report as JSON.")
+    def startup_report(top, as_json):
+        """Measures create_app() import time per module."""
+        from src.utils.startup_report import collect_startup_report
+
+        project_dir = os.path.abspath(os.path.join(app.root_path, ".."))
+        report = collect_startup_report(top=top, cwd=project_dir)
+        if as_json:
+            click.echo(json.dumps(report, indent=2))
+            return
+
+        click.echo(f"Total import time: {report['total_import_ms']:.0f} ms "
+                   f"({report['modules_imported']} modules)")
+        click.echo(f"Heavy packages loaded at boot: {', '.join(report['heavy_modules_loaded']) or 'none'}")
+        click.echo("\nImport time per package:")
+        for entry in report["slowest_packages"]:
+            click.echo(f"  {entry['self_ms']:9.1f} ms  {entry['package']}")
+        click.echo("\nSlowest modules:")
+        for entry in report["slowest_modules"]:
+            click.echo(f"  {entry['self_ms']:9.1f} ms  {entry['module']}")
+
+    @app.cli.command("prediction-scheduler")
+    @click.option("--once", is_flag=True, help="Run a single tick and print its summary.")
+    def prediction_scheduler(once):
+        """Precomputes next-minute predictions whenever new dataset bars arrive."""
+        from src.routes.prediction_routes import get_prediction_service
+        from src.services.prediction_scheduler import create_scheduler
+
+        scheduler = create_scheduler(app, get_prediction_service)
+        if once:
+            click.echo(json.dumps(scheduler.run_once(), indent=2, default=str))
+            return
+        if app.config.get("PREDICTION_SCHEDULER_MODE") == "embedded":
+            click.echo("Warning: PREDICTION_SCHEDULER_MODE=embedded, web processes run the scheduler too "
+                       "(the lock file keeps ticks from overlapping).")
+        click.echo(f"Prediction scheduler running every {scheduler.interval_seconds:.0f}s. Press Ctrl+C to stop.")
+        try:
+            scheduler.run_forever()
+        except KeyboardInterrupt:
+            scheduler.stop()
+
+    @app.cli.command("quantization-report")
+    @click.option("--tickers", default=None, help="Comma-separated tickers. Defaults to every configured ticker.")
+    @click.option("--windows", default=200, show_default=True, help="Most recent windows to predict per ticker.")
+    @click.option("--precisions", default="float16,int8", show_default=True, help="Reduced precisions to compare.")
+    @click.option("--as-json", is_flag=True, help="Print the raw report as JSON.")
+    def quantization_report(tickers, windows, precisions, as_json):
+        """Compares float16/int8 NumPy models with float32 over recent cleaned_dataset windows."""
+        from src.config import COMPANIES_TYPE1, COMPANIES_TYPE2
+        from src.routes.prediction_routes import get_prediction_service
+        from src.services.quantization_report import build_quantization_report
+
+        companies = tickers.split(",") if tickers else list(COMPANIES_TYPE1) + list(COMPANIES_TYPE2)
+        report = build_quantization_report(get_prediction_service(), companies, num_windows=windows,
+                                           precisions=[p.strip() for p in precisions.split(",") if p.strip()])
+        if as_json:
+            click.echo(json.dumps(report, indent=2))
+            return
+
+        click.echo(f"{'ticker':8} {'precision':9} {'weights':>10} {'latency':>10} {'MAE vs f32':>11} "
+                   f"{'max err':>9} {'rel err':>8} {'MAE vs actual':>14}")
+        for company, entry in report["companies"].items():
+            for precision, metrics in entry.items():
+                if precision == "windows":
+                    continue
+                click.echo(f"{company:8} {precision:9} {metrics['weight_bytes'] / 1024:8.1f}KB "
+                           f"{metrics['latency_ms']:8.3f}ms {metrics.get('mae', 0.0):11.4f} "
+                           f"{metrics.get('max_abs_error', 0.0):9.4f} {metrics.get('mean_relative_error_pct', 0.0):7.3f}% "
+                           f"{metrics['mae_vs_actual'] if metrics['mae_vs_actual'] is not None else float('nan'):14.4f}")
+        for company, error in report["errors"].items():
+            click.echo(f"{company:8} error: {error}")
+
+    @app.cli.command("build-artifact-bundles")
+    @click.option("--tickers", default=None, help="Comma-separated tickers. Defaults to every configured ticker.")
+    @click.option("--output-dir", default=None, help="Bundle directory. Defaults to BUNDLE_DIR.")
+    def build_artifact_bundles(tickers, output_dir):
+        """Converts the saved_artifacts models, scalers and PCAs into memory-mappable bundles."""
+        from src.utils.artifact_bundle import build_bundles
+
+        companies = tickers.split(",") if tickers else None
+        result = build_bundles(companies, output_dir)
+        for company, path in result["built"].items():
+            click.echo(f"{company:8} -> {path}")
+        for company, error in result["errors"].items():
+            click.echo(f"{company:8} error: {error}")
+        if result["errors"]:
+            raise SystemExit(1)
+
+    @app.cli.command("backtest")
+    @click.option("--tickers", default=None, help="Comma-separated tickers. Defaults to every configured ticker.")
+    @click.option("--start", type=click.DateTime(), default=None, help="First predicted bar (inclusive).")
+    @click.option("--end", type=click.DateTime(), default=None, help="Last predicted bar (inclusive).")
+    @click.option("--batch-size", default=4096, show_default=True, help="Windows per forward pass.")
+    @click.option("--as-json", is_flag=True, help="Print the raw results as JSON.")
+    def backtest(tickers, start, end, batch_size, as_json):
+        """Scores the models on cleaned_dataset history (MAE, RMSE, directional accuracy)."""
+        from src.config import COMPANIES_TYPE1, COMPANIES_TYPE2
+        from src.routes.prediction_routes import get_prediction_service
+        from src.services.backtest_service import BacktestService
+
+        companies = tickers.split(",") if tickers else list(COMPANIES_TYPE1) + list(COMPANIES_TYPE2)
+        results, errors = BacktestService(get_prediction_service().predictor).run_backtest(
+            companies, start=start, end=end, batch_size=batch_size)
+        if as_json:
+            click.echo(json.dumps({"results": results, "errors": errors}, indent=2))
+            return
+
+        click.echo(f"{'ticker':8} {'bars':>8} {'MAE':>10} {'RMSE':>10} {'naive MAE':>10} {'direction':>9} {'time':>9}")
+        for company, metrics in results.items():
+            direction = metrics["directional_accuracy"]
+            click.echo(f"{company:8} {metrics['samples']:8d} {metrics['mae']:10.4f} {metrics['rmse']:10.4f} "
+                       f"{metrics['naive_mae']:10.4f} {direction * 100 if direction is not None else float('nan'):8.1f}% "
+                       f"{metrics['total_ms'] / 1000:8.2f}s")
+        for company, error in errors.items():
+            click.echo(f"{company:8} error: {error}")
+
+    @app.cli.command("update-accuracy")
+    @click.option("--tickers", default=None, help="Comma-separated tickers. Defaults to every configured ticker.")
+    def update_accuracy(tickers):
+        """Scores the stored predictions whose bars have arrived (the scheduler does this every tick)."""
+        from src.services.accuracy_service import AccuracyTracker
+
+        scored = AccuracyTracker().update(tickers.split(",") if tickers else None)
+        click.echo(json.dumps(scored, indent=2))
+
+    @app.cli.command("backfill-predictions")
+    @click.option("--tickers", default=None, help="Comma-separated tickers. Defaults to every configured ticker.")
+    @click.option("--start", type=click.DateTime(), default=None, help="First predicted-for minute (inclusive).")
+    @click.option("--end", type=click.DateTime(), default=None, help="Last predicted-for minute (inclusive).")
+    @click.option("--batch-size", default=4096, show_default=True, help="Windows per forward pass.")
+    @click.option("--chunk-size", default=5000, show_default=True, help="Rows per INSERT statement.")
+    @click.option("--overwrite", is_flag=True, help="Replace predictions already stored for the same minute.")
+    def backfill_predictions(tickers, start, end, batch_size, chunk_size, overwrite):
+        """Stores the model's predictions for every historical minute in the range into app_data."""
+        from src.config import COMPANIES_TYPE1, COMPANIES_TYPE2
+        from src.routes.prediction_routes import get_prediction_service
+        from src.services.backfill_service import BackfillService
+
+        companies = tickers.split(",") if tickers else list(COMPANIES_TYPE1) + list(COMPANIES_TYPE2)
+        results, errors = BackfillService(get_prediction_service().predictor).backfill(
+            companies, start=start, end=end, batch_size=batch_size, chunk_size=chunk_size, overwrite=overwrite)
+        for company, summary in results.items():
+            click.echo(f"{company:8} {summary['written']:8d}/{summary['predicted']:<8d} "
+                       f"{summary['start']} .. {summary['end']} {summary['total_ms'] / 1000:8.2f}s")
+        for company, error in errors.items():
+            click.echo(f"{company:8} error: {error}")
+        if errors:
+            raise SystemExit(1)
@@ -1,5 +1,6 @@
 # app/config.py
 import os
+import tempfile
 
 basedir = os.path.abspath(os.path.dirname(__file__))
 
@@ -15,9 +16,109 @@ class Config:
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Load every model/scaler/PCA artifact in a thread pool at startup instead of on first request
+    PRELOAD_MODELS = os.getenv("PRELOAD_MODELS", "false").lower() in ("1", "true", "yes")
+    PRELOAD_MAX_WORKERS = int(os.getenv("PRELOAD_MAX_WORKERS", "4"))
+
+    # Background precomputation of next-minute predictions: "off", "embedded" (thread inside the
+    # web process) or "standalone" (only `flask prediction-scheduler` runs it)
+    PREDICTION_SCHEDULER_MODE = os.getenv("PREDICTION_SCHEDULER_MODE", "off").lower()
+    PREDICTION_SCHEDULER_INTERVAL_SECONDS = float(os.getenv("PREDICTION_SCHEDULER_INTERVAL_SECONDS", "60"))
+    PREDICTION_SCHEDULER_JITTER_SECONDS = float(os.getenv("PREDICTION_SCHEDULER_JITTER_SECONDS", "5"))
+    PREDICTION_SCHEDULER_LOCK_FILE = os.getenv("PREDICTION_SCHEDULER_LOCK_FILE", os.path.join(tempfile.gettempdir(), "digital_advisor_prediction_scheduler.lock"))
+
+    # Stale-while-revalidate serving for /predict and /prices: answer from the last stored value
+    # (up to SWR_MAX_STALENESS_SECONDS old) and refresh it on a background executor.
+    # /prices snapshots younger than SWR_PRICE_FRESH_SECONDS are served without any refresh.
+    SWR_ENABLED = os.getenv("SWR_ENABLED", "false").lower() in ("1", "true", "yes")
+    SWR_MAX_STALENESS_SECONDS = float(os.getenv("SWR_MAX_STALENESS_SECONDS", "120"))
+    SWR_PRICE_FRESH_SECONDS = float(os.getenv("SWR_PRICE_FRESH_SECONDS", "5"))
+    SWR_REFRESH_WORKERS = int(os.getenv("SWR_REFRESH_WORKERS", "2"))
+
+    # Attach the per-stage timings of /predict (latest-bar query, feature build, forward pass,
+    # save, ...) to its responses as a Server-Timing header
+    SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "false").lower() in ("1", "true", "yes")
+
 # Base directory for saved artifacts (models, scalers, PCA objects)
 BASE_SAVE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'saved_artifacts')) # Assumes saved_artifacts is sibling to app
 
+# Artifact source: "legacy" loads the .keras archive and the joblib scaler/PCA pickles; "bundle"
+# memory-maps the per-company bundles in BUNDLE_DIR (built by `flask build-artifact-bundles`).
+# In bundle mode the preprocessors always come from the bundle; the model does too with the
+# "numpy" backend (keras/tflite still load the .keras archive).
+ARTIFACT_FORMAT = os.getenv("ARTIFACT_FORMAT", "legacy").lower()
+BUNDLE_DIR = os.getenv("BUNDLE_DIR", os.path.join(BASE_SAVE_DIR, "bundles"))
+
+# Inference backend used by ModelManager: "keras" (tensorflow load_model),
+# "numpy" (weights extracted from the .keras archive, no TensorFlow needed at serving time)
+# or "tflite" (converted flatbuffer cached next to the .keras file, served by the TFLite interpreter)
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "keras").lower()
+
+# Weight precision of the "numpy" backend: "float32" (as trained), "float16" or "int8"
+# (per-tensor symmetric scales). MODEL_PRECISION_OVERRIDES sets it per ticker, e.g.
+# "APP=int8,META=float16". Use `flask quantization-report` to check the accuracy cost first.
+MODEL_PRECISION = os.getenv("MODEL_PRECISION", "float32").lower()
+MODEL_PRECISION_OVERRIDES = {
+    ticker.strip().upper(): precision.strip().lower()
+    for ticker, _, precision in (
+        item.partition("=") for item in os.getenv("MODEL_PRECISION_OVERRIDES", "").split(",") if item.strip()
+    )
+}
+
+# Inference server mode: with INFERENCE_POOL_WORKERS > 0 the models live in that many worker
+# processes and request threads exchange windows/predictions with them through shared memory.
+# INFERENCE_POOL_SLOTS bounds the in-flight requests (callers wait for a free slot).
+INFERENCE_POOL_WORKERS = int(os.getenv("INFERENCE_POOL_WORKERS", "0"))
+INFERENCE_POOL_SLOTS = int(os.getenv("INFERENCE_POOL_SLOTS", "16"))
+INFERENCE_POOL_TIMEOUT_SECONDS = float(os.getenv("INFERENCE_POOL_TIMEOUT_SECONDS", "30"))
+
+# TensorFlow thread pools of the "keras" and "tflite" backends, sized before the first model load.
+# "auto" splits the usable CPUs (affinity mask, cgroup quota) evenly over TF_SERVING_PROCESSES,
+# by default WEB_CONCURRENCY (gunicorn's worker count) times the inference pool workers, instead
+# of every process starting pools as wide as the machine. 0 keeps TensorFlow's default.
+TF_INTRA_OP_THREADS = os.getenv("TF_INTRA_OP_THREADS", "auto")
+TF_INTER_OP_THREADS = os.getenv("TF_INTER_OP_THREADS", "auto")
+TF_SERVING_PROCESSES = int(os.getenv("TF_SERVING_PROCESSES", "0")) or \
+    int(os.getenv("WEB_CONCURRENCY", "1")) * max(1, INFERENCE_POOL_WORKERS)
+
+# Model registry: loaded models are weighed by their artifact size on disk and evicted LRU-first
+# beyond MODEL_REGISTRY_MEMORY_BUDGET_MB (0 = unbounded). Missing/broken artifacts are not retried
+# for MODEL_REGISTRY_FAILURE_TTL_SECONDS. Artifact mtimes are re-checked every
+# MODEL_REGISTRY_RELOAD_CHECK_SECONDS and updated files are swapped in without a restart (0 = off).
+MODEL_REGISTRY_MEMORY_BUDGET_MB = float(os.getenv("MODEL_REGISTRY_MEMORY_BUDGET_MB", "0"))
+MODEL_REGISTRY_FAILURE_TTL_SECONDS = float(os.getenv("MODEL_REGISTRY_FAILURE_TTL_SECONDS", "30"))
+MODEL_REGISTRY_RELOAD_CHECK_SECONDS = float(os.getenv("MODEL_REGISTRY_RELOAD_CHECK_SECONDS", "10"))
+
+# Opt-in micro-batching: concurrent single-window predictions are queued for up to
+# MICRO_BATCH_MAX_WAIT_MS (or until MICRO_BATCH_MAX_SIZE are waiting) and run as one batched
+# forward pass per ticker model; tickers are batched independently of each other. Identical
+# /predict calls are already merged upstream (one generation per ticker and bar), so batches
+# only form from different windows of the same ticker (e.g. client-supplied features).
+MICRO_BATCH_ENABLED = os.getenv("MICRO_BATCH_ENABLED", "false").lower() in ("1", "true", "yes")
+MICRO_BATCH_MAX_SIZE = int(os.getenv("MICRO_BATCH_MAX_SIZE", "32"))
+MICRO_BATCH_MAX_WAIT_MS = float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", "2"))
+
+# Cross-process coalescing of prediction generation: a worker inserts a prediction_claims row
+# before running the model, other workers wait (up to the wait timeout) for its stored result.
+# Claims older than the TTL are considered abandoned by a crashed worker.
+PREDICTION_CLAIMS_ENABLED = os.getenv("PREDICTION_CLAIMS_ENABLED", "false").lower() in ("1", "true", "yes")
+PREDICTION_CLAIM_TTL_SECONDS = float(os.getenv("PREDICTION_CLAIM_TTL_SECONDS", "30"))
+PREDICTION_CLAIM_WAIT_SECONDS = float(os.getenv("PREDICTION_CLAIM_WAIT_SECONDS", "10"))
+
+# In-process cache of served predictions. The latest bar of a ticker is re-checked against the
+# database at most every PREDICTION_CACHE_TTL_SECONDS; in between, hits need no DB round-trip.
+PREDICTION_CACHE_MAX_ENTRIES = int(os.getenv("PREDICTION_CACHE_MAX_ENTRIES", "1024"))
+PREDICTION_CACHE_TTL_SECONDS = float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", "5"))
+
+# Longest multi-step forecast (in minutes) accepted by the `horizon` parameter of /predict.
+PREDICTION_MAX_HORIZON = int(os.getenv("PREDICTION_MAX_HORIZON", "60"))
+
+# Predictive intervals (`interval=true` on /predict): PREDICTION_INTERVAL_SAMPLES forward passes with
+# dropout left active run as one batch; the interval spans the central
+# PREDICTION_INTERVAL_CONFIDENCE share of the sampled closes.
+PREDICTION_INTERVAL_SAMPLES = int(os.getenv("PREDICTION_INTERVAL_SAMPLES", "64"))
+PREDICTION_INTERVAL_CONFIDENCE = float(os.getenv("PREDICTION_INTERVAL_CONFIDENCE", "0.9"))
+
 # --- Consolidated Configuration for Model Types ---
 
 # Configuration for Model Type 1 (APP, PEP, TSLA)
@@ -7,9 +7,14 @@ class Prediction(db.Model):
     """
     Represents a stored price prediction for a given company.
     The 'timestamp' column indicates the specific time (e.g., minute) for which the price is predicted.
+    The 'source' column tells predictions served live apart from ones generated offline
+    (`flask backfill-predictions`), which live accuracy metrics must not count.
     """
     __tablename__ = 'app_data' # As per your model
 
+    SOURCE_LIVE = 'live'
+    SOURCE_BACKFILL = 'backfill'
+
     prediction_id = db.Column(db.Integer, primary_key=True)
     ticker = db.Column(db.String(10), nullable=False) # e.g., 'AAPL', 'META'
     
@@ -18,6 +23,8 @@ class Prediction(db.Model):
     
     predicted_price = db.Column(db.Float, nullable=False) 
 
+    source = db.Column(db.String(16), nullable=False, default=SOURCE_LIVE, server_default=SOURCE_LIVE)
+
     # --- FIX HERE: Changed 'company_prefix' to 'ticker' in UniqueConstraint ---
     __table_args__ = (db.UniqueConstraint('ticker', 'timestamp', name='_company_predicted_date_uc'),)
     # --- END FIX ---
@@ -0,0 +1,29 @@
+# backend/app/models/prediction_accuracy.py
+
+from src.extensions import db
+
+class PredictionAccuracy(db.Model):
+    """
+    Running error aggregates of the stored predictions (app_data) against the realized closes
+    (cleaned_dataset), one row per ticker and hour. Rolling windows (last hour, day, week, ...)
+    are sums over the buckets they cover, so they never rescan the predictions.
+    `last_scored_timestamp` is the newest predicted-for timestamp folded into the bucket (the
+    windows are measured back from it). `last_scored_prediction_id` is the highest app_data id
+    folded in; its maximum per ticker is the watermark from which the next update continues.
+    """
+    __tablename__ = 'prediction_accuracy'
+
+    accuracy_id = db.Column(db.Integer, primary_key=True)
+    ticker = db.Column(db.String(10), nullable=False)
+    bucket_start = db.Column(db.DateTime, nullable=False) # Start of the hour of the predicted-for timestamps
+    count = db.Column(db.Integer, nullable=False, default=0)
+    sum_abs_error = db.Column(db.Float, nullable=False, default=0.0)
+    sum_sq_error = db.Column(db.Float, nullable=False, default=0.0)
+    sum_abs_pct_error = db.Column(db.Float, nullable=False, default=0.0)
+    last_scored_timestamp = db.Column(db.DateTime, nullable=False)
+    last_scored_prediction_id = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (db.UniqueConstraint('ticker', 'bucket_start', name='_prediction_accuracy_bucket_uc'),)
+
+    def __repr__(self):
+        return f'<PredictionAccuracy {self.ticker} @ {self.bucket_start}: n={self.count}>'
@@ -0,0 +1,24 @@
+# backend/app/models/prediction_claim.py
+
+from src.extensions import db
+from datetime import datetime
+
+class PredictionClaim(db.Model):
+    """
+    Marks that one worker process is currently generating the prediction for (ticker, timestamp).
+    The unique constraint makes the insert an atomic claim across processes; the row is deleted
+    once the prediction is stored in app_data. Claims older than the configured TTL are treated
+    as abandoned (crashed worker) and can be taken over.
+    """
+    __tablename__ = 'prediction_claims'
+
+    claim_id = db.Column(db.Integer, primary_key=True)
+    ticker = db.Column(db.String(10), nullable=False)
+    timestamp = db.Column(db.DateTime, nullable=False) # The predicted-for timestamp being generated
+    claimed_by = db.Column(db.String(128), nullable=False) # host:pid of the owning worker
+    claimed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (db.UniqueConstraint('ticker', 'timestamp', name='_prediction_claim_uc'),)
+
+    def __repr__(self):
+        return f'<PredictionClaim {self.ticker} for {self.timestamp} by {self.claimed_by}>'
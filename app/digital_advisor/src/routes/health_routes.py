@@ -0,0 +1,29 @@
+from flask import Blueprint, jsonify, current_app
+from src.routes.prediction_routes import get_prediction_service
+
+health_bp = Blueprint('health', __name__, url_prefix='/healthz')
+
+
+@health_bp.route('/live', methods=['GET'])
+def live():
+    """Liveness probe: the process is up and serving requests."""
+    return jsonify({"status": "ok"}), 200
+
+
+@health_bp.route('/ready', methods=['GET'])
+def ready():
+    """
+    Readiness probe: reports the per-ticker artifact load status and load time.
+    Returns 503 while preloaded artifacts are still loading (or failed to load)
+    so the load balancer only routes traffic to warm workers.
+    """
+    predictor = get_prediction_service().predictor
+    preload_enabled = bool(current_app.config.get("PRELOAD_MODELS"))
+    is_ready = predictor.is_ready()
+
+    result = {
+        "ready": is_ready,
+        "preload_enabled": preload_enabled,
+        "tickers": predictor.get_load_status()
+    }
+    return jsonify(result), 200 if is_ready else 503
@@ -1,25 +1,73 @@
-from flask import Blueprint, request, jsonify
-from src.schemas.prediction_schema import PredictionResponseSchema
+import threading
+from flask import Blueprint, request, jsonify, current_app, make_response
+from src.schemas.prediction_schema import (
+    PredictionResponseSchema, BatchPredictionResponseSchema,
+    PredictionPathResponseSchema, BatchPredictionPathResponseSchema
+)
 from src.services.prediction_service import PredictionService
+from src.config import PREDICTION_INTERVAL_CONFIDENCE
+from src.services.accuracy_service import AccuracyTracker, ACCURACY_WINDOWS
+from src.utils.background_refresh import get_background_refresher
+from src.utils.metrics import metrics_snapshot
+from src.utils.stage_timing import timing_scope, stage_timings_snapshot
 
 # --- Flask Blueprint and Routes ---
 prediction_bp = Blueprint('prediction', __name__, url_prefix='/predict')
 
 response_schema = PredictionResponseSchema()
-prediction_service_instance = PredictionService()  # Initialize the service
+batch_response_schema = BatchPredictionResponseSchema()
+path_response_schema = PredictionPathResponseSchema()
+batch_path_response_schema = BatchPredictionPathResponseSchema()
+
+# The prediction stack (models, scalers, TensorFlow) is built on first use, not at import time,
+# so workers that only serve /auth, /balance or /transactions never load it.
+_prediction_service_instance = None
+_prediction_service_lock = threading.Lock()
+
+
+def get_prediction_service() -> PredictionService:
+    """Returns the shared PredictionService, creating it on first call."""
+    global _prediction_service_instance
+    if _prediction_service_instance is None:
+        with _prediction_service_lock:
+            if _prediction_service_instance is None:
+                _prediction_service_instance = PredictionService()
+    return _prediction_service_instance
 
 @prediction_bp.route('', methods=['GET'])
 def predict():
+    with timing_scope() as timings:
+        response = make_response(_predict())
+    if current_app.config.get("SERVER_TIMING_ENABLED") and timings.spans:
+        response.headers['Server-Timing'] = timings.server_timing_header()
+    return response
+
+
+def _predict():
     try:
         # Extract the ticker from the query string
         company = request.args.get('ticker')
         if not company:
             return jsonify({"error": "Missing required query parameter: 'ticker'"}), 400
 
+        horizon = _parse_horizon()
+        if horizon is not None:
+            ticker = company.strip().upper()
+            paths, errors = get_prediction_service().run_prediction_paths([ticker], horizon)
+            if ticker in errors:
+                return jsonify({"error": errors[ticker]}), 400
+            return path_response_schema.dump({"ticker": ticker, "horizon": horizon, "path": paths[ticker]}), 200
+
+        interval_confidence = _parse_interval()
+        if current_app.config.get("SWR_ENABLED"):
+            return _predict_stale_while_revalidate(company, interval_confidence)
+
         # No features_from_request passed — will default to internal feature engineering
-        predicted_value = prediction_service_instance.run_prediction(company)
+        predicted_value = get_prediction_service().run_prediction(company)
 
         result = {"predicted_close_value": predicted_value}
+        if interval_confidence is not None:
+            result["interval"] = get_prediction_service().run_prediction_interval(company, confidence=interval_confidence)
         return response_schema.dump(result), 200
 
     except FileNotFoundError as e:
@@ -30,3 +78,141 @@ def predict():
         print(f"Internal server error: {e}")  # For debugging/logging
         return jsonify({"error": "Internal server error"}), 500
 
+
+def _parse_horizon():
+    """Reads the optional `horizon` query parameter (minutes ahead). Raises ValueError if it is not an integer."""
+    horizon = request.args.get('horizon')
+    if horizon is None or horizon == '':
+        return None
+    try:
+        return int(horizon)
+    except ValueError:
+        raise ValueError(f"Query parameter 'horizon' must be an integer, got '{horizon}'.")
+
+
+def _parse_interval():
+    """
+    Reads the optional `interval` flag and `confidence` query parameters. Returns the interval
+    confidence, or None when no interval was requested. Raises ValueError on invalid values.
+    """
+    if request.args.get('interval', '').lower() not in ('1', 'true', 'yes'):
+        return None
+    confidence = request.args.get('confidence')
+    if confidence is None or confidence == '':
+        return PREDICTION_INTERVAL_CONFIDENCE
+    try:
+        return float(confidence)
+    except ValueError:
+        raise ValueError(f"Query parameter 'confidence' must be a number, got '{confidence}'.")
+
+
+def _predict_stale_while_revalidate(company: str, interval_confidence: float = None):
+    """Serves the latest stored prediction and refreshes it in the background when it is stale."""
+    service = get_prediction_service()
+    predicted_value, freshness, age_seconds = service.get_prediction_swr(
+        company, max_staleness_seconds=current_app.config.get("SWR_MAX_STALENESS_SECONDS", 120.0))
+    if freshness == "stale":
+        app = current_app._get_current_object()
+        ticker = company.upper()
+        get_background_refresher(current_app.config.get("SWR_REFRESH_WORKERS", 2)).submit(
+            app, ('predict', ticker), lambda: service.run_prediction(ticker))
+
+    result = {"predicted_close_value": predicted_value, "freshness": freshness, "age_seconds": age_seconds}
+    if interval_confidence is not None:
+        result["interval"] = service.run_prediction_interval(company, confidence=interval_confidence)
+    response = jsonify(response_schema.dump(result))
+    response.headers['X-Data-Freshness'] = freshness
+    response.headers['X-Data-Age'] = f"{age_seconds:.0f}"
+    return response, 200
+
+
+@prediction_bp.route('/batch', methods=['GET'])
+def predict_batch():
+    try:
+        # Extract the comma separated tickers from the query string
+        tickers = request.args.get('tickers')
+        if not tickers:
+            return jsonify({"error": "Missing required query parameter: 'tickers'"}), 400
+
+        ticker_list = [t.strip().upper() for t in tickers.split(',') if t.strip()]
+        if not ticker_list:
+            return jsonify({"error": "Query parameter 'tickers' contains no tickers"}), 400
+
+        try:
+            horizon = _parse_horizon()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if horizon is not None:
+            try:
+                paths, errors = get_prediction_service().run_prediction_paths(ticker_list, horizon)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            return batch_path_response_schema.dump({"horizon": horizon, "paths": paths, "errors": errors}), 200
+
+        try:
+            interval_confidence = _parse_interval()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        predictions, errors = get_prediction_service().run_predictions(ticker_list)
+
+        result = {"predictions": predictions, "errors": errors}
+        if interval_confidence is not None:
+            intervals = {}
+            for ticker in predictions:
+                try:
+                    intervals[ticker] = get_prediction_service().run_prediction_interval(ticker, confidence=interval_confidence)
+                except (FileNotFoundError, ValueError, RuntimeError) as e:
+                    errors[ticker] = f"Interval unavailable: {e}"
+            result["intervals"] = intervals
+        return batch_response_schema.dump(result), 200
+
+    except Exception as e:
+        print(f"Internal server error: {e}")  # For debugging/logging
+        return jsonify({"error": "Internal server error"}), 500
+
+
+@prediction_bp.route('/cache', methods=['GET'])
+def prediction_cache_stats():
+    """Hit/miss counters and size of this worker's in-process prediction cache."""
+    return jsonify(get_prediction_service().prediction_cache.stats()), 200
+
+
+@prediction_bp.route('/accuracy', methods=['GET'])
+def prediction_accuracy():
+    """
+    Live accuracy of the stored predictions against the realized closes, per ticker and rolling
+    window. Optional query parameter: tickers (comma-separated, default every configured ticker).
+    """
+    tickers = request.args.get('tickers')
+    ticker_list = [t.strip() for t in tickers.split(',') if t.strip()] if tickers else None
+    return jsonify({
+        "windows": list(ACCURACY_WINDOWS),
+        "accuracy": AccuracyTracker().get_accuracy(ticker_list)
+    }), 200
+
+
+@prediction_bp.route('/metrics', methods=['GET'])
+def prediction_metrics():
+    """Histograms recorded by this worker (e.g. micro-batch queue depth and batch size)."""
+    return jsonify(metrics_snapshot()), 200
+
+
+@prediction_bp.route('/timings', methods=['GET'])
+def prediction_timings():
+    """Per-ticker, per-stage latency histograms (milliseconds) of run_prediction in this worker."""
+    tickers = request.args.get('tickers')
+    ticker_list = [t.strip() for t in tickers.split(',') if t.strip()] if tickers else None
+    return jsonify({"timings": stage_timings_snapshot(ticker_list)}), 200
+
+
+@prediction_bp.route('/models', methods=['GET'])
+def model_registry_stats():
+    """Loaded models, their estimated memory use and load/reload/eviction counters for this worker."""
+    predictor = get_prediction_service().predictor
+    return jsonify({
+        "models": predictor.model_manager.models.stats(),
+        "preprocessors": predictor.preprocessors.stats(),
+        "tensorflow_threads": {"intra_op": predictor.model_manager.intra_op_threads,
+                               "inter_op": predictor.model_manager.inter_op_threads}
+    }), 200
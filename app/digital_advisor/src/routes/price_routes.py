@@ -1,6 +1,7 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required
-from src.services.price_service import get_latest_prices_for_tickers
+from src.services.price_service import get_latest_prices_for_tickers, get_latest_prices_swr, refresh_price_snapshots
+from src.utils.background_refresh import get_background_refresher
 
 price_bp = Blueprint('price', __name__)
 
@@ -11,5 +12,21 @@ def get_latest_prices():
         return jsonify({"msg": "Missing tickers query parameter"}), 400
 
     ticker_list = [t.strip().upper() for t in tickers.split(',')]
-    prices = get_latest_prices_for_tickers(ticker_list)
-    return jsonify(prices), 200
\ No newline at end of file
+    if not current_app.config.get("SWR_ENABLED"):
+        prices = get_latest_prices_for_tickers(ticker_list)
+        return jsonify(prices), 200
+
+    prices, freshness, age_seconds = get_latest_prices_swr(
+        ticker_list,
+        fresh_seconds=current_app.config.get("SWR_PRICE_FRESH_SECONDS", 5.0),
+        max_staleness_seconds=current_app.config.get("SWR_MAX_STALENESS_SECONDS", 120.0)
+    )
+    if freshness == "stale":
+        app = current_app._get_current_object()
+        get_background_refresher(current_app.config.get("SWR_REFRESH_WORKERS", 2)).submit(
+            app, ('prices', tuple(sorted(ticker_list))), lambda: refresh_price_snapshots(ticker_list))
+
+    response = jsonify(prices)
+    response.headers['X-Data-Freshness'] = freshness
+    response.headers['X-Data-Age'] = f"{age_seconds:.0f}"
+    return response, 200
\ No newline at end of file
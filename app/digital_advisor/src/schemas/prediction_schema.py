@@ -1,4 +1,38 @@
 from marshmallow import Schema, fields
 
+class PredictionIntervalSchema(Schema):
+    lower = fields.Float(required=True)
+    upper = fields.Float(required=True)
+    mean = fields.Float(required=True)
+    std = fields.Float(required=True)
+    samples = fields.Int(required=True)
+    confidence = fields.Float(required=True)
+    latency_ms = fields.Float(required=True)
+
 class PredictionResponseSchema(Schema):
-    predicted_close_value = fields.Float(required=True, allow_none=False)
\ No newline at end of file
+    predicted_close_value = fields.Float(required=True, allow_none=False)
+    # Only set in stale-while-revalidate mode: "fresh" or "stale", and how old (in seconds) a stale value is
+    freshness = fields.Str()
+    age_seconds = fields.Float()
+    # Only set with `interval=true`: Monte-Carlo dropout interval around the prediction
+    interval = fields.Nested(PredictionIntervalSchema)
+
+class BatchPredictionResponseSchema(Schema):
+    predictions = fields.Dict(keys=fields.Str(), values=fields.Float(), required=True)
+    errors = fields.Dict(keys=fields.Str(), values=fields.Str(), required=True)
+    # Only set with `interval=true`
+    intervals = fields.Dict(keys=fields.Str(), values=fields.Nested(PredictionIntervalSchema))
+
+class PredictionPointSchema(Schema):
+    timestamp = fields.DateTime(required=True)
+    predicted_close_value = fields.Float(required=True)
+
+class PredictionPathResponseSchema(Schema):
+    ticker = fields.Str(required=True)
+    horizon = fields.Int(required=True)
+    path = fields.List(fields.Nested(PredictionPointSchema), required=True)
+
+class BatchPredictionPathResponseSchema(Schema):
+    horizon = fields.Int(required=True)
+    paths = fields.Dict(keys=fields.Str(), values=fields.List(fields.Nested(PredictionPointSchema)), required=True)
+    errors = fields.Dict(keys=fields.Str(), values=fields.Str(), required=True)
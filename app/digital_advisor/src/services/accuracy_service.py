@@ -0,0 +1,175 @@
+# app/services/accuracy_service.py
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+import numpy as np
+from sqlalchemy import and_, func, or_
+
+from src.config import COMPANIES_TYPE1, COMPANIES_TYPE2
+from src.extensions import db
+from src.models.dataset import Dataset
+from src.models.prediction import Prediction
+from src.models.prediction_accuracy import PredictionAccuracy
+
+logger = logging.getLogger(__name__)
+
+# Rolling windows served by /predict/accuracy, measured back from each ticker's newest scored
+# prediction. Windows are aggregated from hourly buckets, so they are hour-granular.
+ACCURACY_WINDOWS = {
+    "1h": timedelta(hours=1),
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+    "all": None,
+}
+
+
+def _bucket_start(timestamp: datetime) -> datetime:
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def _window_metrics(count: int, sum_abs: float, sum_sq: float, sum_abs_pct: float) -> dict:
+    if not count:
+        return {"count": 0, "mae": None, "rmse": None, "mape_pct": None}
+    return {
+        "count": int(count),
+        "mae": sum_abs / count,
+        "rmse": float(np.sqrt(sum_sq / count)),
+        "mape_pct": sum_abs_pct / count * 100,
+    }
+
+
+class AccuracyTracker:
+    """
+    Scores stored predictions against the closes that arrive later, incrementally.
+
+    update() only joins the live predictions (source 'live'; backfilled rows are offline
+    estimates) inserted after each ticker's watermark that now have a matching cleaned_dataset
+    bar, and folds their errors into hourly PredictionAccuracy buckets. The watermark is the
+    highest scored app_data id, not the predicted-for timestamp, so rows written late for an
+    earlier minute are still scored. A prediction stays unscored if a later one of the same
+    ticker is scored before its own bar exists, which needs bars arriving out of order.
+    It is meant to run in a single writer (the prediction scheduler tick or
+    `flask update-accuracy`); readers only sum buckets.
+    """
+    def update(self, companies: List[str] = None) -> Dict[str, int]:
+        """
+        Scores the newly realizable predictions.
+
+        Parameters:
+        - companies: Tickers to update. Defaults to every configured ticker.
+
+        Returns:
+        - ticker -> number of predictions scored by this call.
+        """
+        if companies is None:
+            companies = list(COMPANIES_TYPE1) + list(COMPANIES_TYPE2)
+        companies = [c.upper() for c in companies]
+        watermarks = self._watermarks(companies)
+
+        # Per ticker: predictions inserted after its watermark (all of them for a ticker never scored)
+        conditions = [
+            and_(Prediction.ticker == company, Prediction.prediction_id > watermarks.get(company, 0))
+            for company in companies
+        ]
+        realized = db.session.query(Prediction.prediction_id, Prediction.ticker, Prediction.timestamp,
+                                    Prediction.predicted_price, Dataset.close_value)\
+                             .join(Dataset, and_(Dataset.company_prefix == Prediction.ticker,
+                                                 Dataset.date_value == Prediction.timestamp))\
+                             .filter(Prediction.source == Prediction.SOURCE_LIVE, or_(*conditions))\
+                             .all()
+        if not realized:
+            return {}
+
+        aggregates: Dict[Tuple[str, datetime], list] = {}
+        scored: Dict[str, int] = {}
+        for prediction_id, ticker, timestamp, predicted, actual in realized:
+            error = abs(predicted - actual)
+            bucket = aggregates.setdefault((ticker, _bucket_start(timestamp)),
+                                           [0, 0.0, 0.0, 0.0, timestamp, prediction_id])
+            bucket[0] += 1
+            bucket[1] += error
+            bucket[2] += error * error
+            bucket[3] += error / abs(actual) if actual else 0.0
+            bucket[4] = max(bucket[4], timestamp)
+            bucket[5] = max(bucket[5], prediction_id)
+            scored[ticker] = scored.get(ticker, 0) + 1
+
+        self._merge_buckets(aggregates)
+        db.session.commit()
+        logger.info(f"Accuracy tracker scored {scored} new predictions.")
+        return scored
+
+    def _watermarks(self, companies: List[str]) -> Dict[str, int]:
+        rows = db.session.query(PredictionAccuracy.ticker, func.max(PredictionAccuracy.last_scored_prediction_id))\
+                         .filter(PredictionAccuracy.ticker.in_(companies))\
+                         .group_by(PredictionAccuracy.ticker)\
+                         .all()
+        return {ticker: watermark for ticker, watermark in rows if watermark is not None}
+
+    def _merge_buckets(self, aggregates: Dict[Tuple[str, datetime], list]) -> None:
+        """Adds the new sums to existing buckets (one query to fetch them) and inserts the new ones."""
+        tickers = {ticker for ticker, _ in aggregates}
+        buckets = {bucket for _, bucket in aggregates}
+        existing = {
+            (row.ticker, row.bucket_start): row
+            for row in PredictionAccuracy.query.filter(PredictionAccuracy.ticker.in_(tickers),
+                                                       PredictionAccuracy.bucket_start.in_(buckets)).all()
+        }
+        for key, (count, sum_abs, sum_sq, sum_abs_pct, last_scored, last_id) in aggregates.items():
+            row = existing.get(key)
+            if row is None:
+                db.session.add(PredictionAccuracy(
+                    ticker=key[0], bucket_start=key[1], count=count, sum_abs_error=sum_abs,
+                    sum_sq_error=sum_sq, sum_abs_pct_error=sum_abs_pct, last_scored_timestamp=last_scored,
+                    last_scored_prediction_id=last_id
+                ))
+            else:
+                row.count += count
+                row.sum_abs_error += sum_abs
+                row.sum_sq_error += sum_sq
+                row.sum_abs_pct_error += sum_abs_pct
+                row.last_scored_timestamp = max(row.last_scored_timestamp, last_scored)
+                row.last_scored_prediction_id = max(row.last_scored_prediction_id or 0, last_id)
+
+    def get_accuracy(self, companies: List[str] = None) -> Dict[str, Dict[str, dict]]:
+        """
+        Returns ticker -> window ("1h", "24h", "7d", "30d", "all") -> {count, mae, rmse, mape_pct}.
+        Tickers without scored predictions are omitted.
+        """
+        if companies is None:
+            companies = list(COMPANIES_TYPE1) + list(COMPANIES_TYPE2)
+        companies = [c.upper() for c in companies]
+
+        totals = db.session.query(
+            PredictionAccuracy.ticker,
+            func.sum(PredictionAccuracy.count), func.sum(PredictionAccuracy.sum_abs_error),
+            func.sum(PredictionAccuracy.sum_sq_error), func.sum(PredictionAccuracy.sum_abs_pct_error),
+            func.max(PredictionAccuracy.last_scored_timestamp)
+        ).filter(PredictionAccuracy.ticker.in_(companies)).group_by(PredictionAccuracy.ticker).all()
+        if not totals:
+            return {}
+
+        latest = {row[0]: row[5] for row in totals}
+        longest = max(window for window in ACCURACY_WINDOWS.values() if window is not None)
+        recent = PredictionAccuracy.query.filter(
+            PredictionAccuracy.ticker.in_(list(latest)),
+            PredictionAccuracy.bucket_start >= _bucket_start(min(latest.values()) - longest)
+        ).all()
+
+        result: Dict[str, Dict[str, dict]] = {}
+        for ticker, count, sum_abs, sum_sq, sum_abs_pct, _ in totals:
+            windows = {}
+            for name, length in ACCURACY_WINDOWS.items():
+                if length is None:
+                    windows[name] = _window_metrics(count, sum_abs, sum_sq, sum_abs_pct)
+                    continue
+                since = _bucket_start(latest[ticker] - length)
+                # The `length / 1h` most recent hourly buckets, including the (partial) current one
+                rows = [row for row in recent if row.ticker == ticker and row.bucket_start > since]
+                windows[name] = _window_metrics(sum(r.count for r in rows), sum(r.sum_abs_error for r in rows),
+                                                sum(r.sum_sq_error for r in rows), sum(r.sum_abs_pct_error for r in rows))
+            result[ticker] = windows
+        return result
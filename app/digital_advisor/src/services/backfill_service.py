@@ -0,0 +1,108 @@
+# app/services/backfill_service.py
+
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from src.models.prediction import Prediction
+from src.services.backtest_service import fetch_rows_with_warmup, predict_windows_in_batches
+from src.services.prediction_service import build_feature_frame_from_rows, get_model_config
+from src.services.prediction_storage_service import PredictionStorageService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKFILL_BATCH_SIZE = 4096
+DEFAULT_BACKFILL_CHUNK_SIZE = 5000
+
+
+class BackfillService:
+    """
+    Fills app_data with the predictions the model would have made over a historical range.
+
+    Each window ending at bar k yields the prediction for k + 1 minute, the same target the
+    live path stores. Windows are strided views over one feature matrix, predicted in large
+    batches and written with chunked multi-row upserts instead of one row per save_prediction.
+    Rows are stored with source Prediction.SOURCE_BACKFILL, so live accuracy never counts them.
+    """
+    def __init__(self, predictor, prediction_storage: PredictionStorageService = None):
+        self.predictor = predictor
+        self.prediction_storage = prediction_storage or PredictionStorageService()
+
+    def backfill(self, companies: List[str], start: datetime = None, end: datetime = None,
+                 batch_size: int = DEFAULT_BACKFILL_BATCH_SIZE, chunk_size: int = DEFAULT_BACKFILL_CHUNK_SIZE,
+                 overwrite: bool = False) -> Tuple[Dict[str, dict], Dict[str, str]]:
+        """
+        Generates and stores the predictions for every minute in [start, end] (open-ended if None).
+
+        Parameters:
+        - companies: Tickers to backfill.
+        - start, end: Range of the predicted-for timestamps.
+        - batch_size: Windows per forward pass.
+        - chunk_size: Rows per INSERT statement.
+        - overwrite: Replace predictions already stored for the same minute (kept by default).
+
+        Returns:
+        - (results, errors): ticker -> {predicted, written, start, end, inference_ms, total_ms},
+          ticker -> error message.
+        """
+        results: Dict[str, dict] = {}
+        errors: Dict[str, str] = {}
+        for company in companies:
+            company = company.upper()
+            try:
+                results[company] = self._backfill_company(company, start, end, batch_size, chunk_size, overwrite)
+            except (FileNotFoundError, ValueError, RuntimeError) as e:
+                errors[company] = str(e)
+        return results, errors
+
+    def _backfill_company(self, company: str, start: datetime, end: datetime, batch_size: int,
+                          chunk_size: int, overwrite: bool) -> dict:
+        started = time.perf_counter()
+        model_config = get_model_config(company)
+        seq_length = model_config["SEQ_LENGTH"]
+
+        # The last window predicts `end`, so bars after end - 1 minute are not needed
+        last_bar = end - timedelta(minutes=1) if end is not None else None
+        first_bar = start - timedelta(minutes=1) if start is not None else None
+        timestamps, matrix = build_feature_frame_from_rows(
+            company, fetch_rows_with_warmup(company, model_config, first_bar, last_bar), model_config)
+        if len(matrix) < seq_length:
+            raise ValueError(f"Not enough clean historical data to backfill {company}: "
+                             f"need {seq_length} bars, got {len(matrix)}.")
+
+        # Window i covers bars i .. i + seq_length - 1 and predicts the minute after its last bar
+        windows = np.lib.stride_tricks.sliding_window_view(matrix, seq_length, axis=0).transpose(0, 2, 1)
+        target_timestamps = [ts + timedelta(minutes=1) for ts in timestamps[seq_length - 1:]]
+        selected = np.ones(len(windows), dtype=bool)
+        if start is not None:
+            selected &= np.array([ts >= start for ts in target_timestamps], dtype=bool)
+        if end is not None:
+            selected &= np.array([ts <= end for ts in target_timestamps], dtype=bool)
+        indices = np.flatnonzero(selected)
+        if len(indices) == 0:
+            raise ValueError(f"No bars of {company} to backfill in the requested range.")
+
+        inference_started = time.perf_counter()
+        predictions = predict_windows_in_batches(self.predictor, company, windows, indices, batch_size)
+        inference_ms = (time.perf_counter() - inference_started) * 1000
+
+        rows = [
+            {"ticker": company, "timestamp": target_timestamps[i], "predicted_price": float(value),
+             "source": Prediction.SOURCE_BACKFILL}
+            for i, value in zip(indices, predictions)
+        ]
+        written = self.prediction_storage.bulk_upsert_predictions(rows, overwrite=overwrite, chunk_size=chunk_size)
+        summary = {
+            "predicted": len(rows),
+            "written": written,
+            "start": rows[0]["timestamp"].isoformat(),
+            "end": rows[-1]["timestamp"].isoformat(),
+            "inference_ms": inference_ms,
+            "total_ms": (time.perf_counter() - started) * 1000,
+        }
+        logger.info(f"Backfilled {company}: {written} of {len(rows)} predictions written "
+                    f"in {summary['total_ms']:.0f} ms.")
+        return summary
@@ -0,0 +1,144 @@
+# app/services/backtest_service.py
+
+import logging
+import time
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from src.extensions import db
+from src.models.dataset import Dataset
+from src.services.prediction_service import (
+    BASE_QUERY_COLUMNS, MAX_ROLLING_WINDOW, ROLLING_WINDOW_MARGIN,
+    build_feature_frame_from_rows, get_model_config
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKTEST_BATCH_SIZE = 4096
+
+
+class BacktestService:
+    """
+    Replays a ticker's cleaned_dataset history through its model in large batches.
+
+    Every sliding SEQ_LENGTH window is a strided view over one feature matrix (no per-window
+    copies or queries); the window ending at bar k is scored against the close of bar k + 1,
+    exactly like the live next-minute prediction.
+    """
+    def __init__(self, predictor):
+        self.predictor = predictor
+
+    def run_backtest(self, companies: List[str], start: datetime = None, end: datetime = None,
+                     batch_size: int = DEFAULT_BACKTEST_BATCH_SIZE) -> Tuple[Dict[str, dict], Dict[str, str]]:
+        """
+        Backtests every company over the bars predicted for [start, end] (open-ended if None).
+
+        Parameters:
+        - companies: Tickers to evaluate.
+        - start, end: Range of the *predicted* bars' timestamps.
+        - batch_size: Windows per forward pass.
+
+        Returns:
+        - (results, errors): ticker -> metrics, ticker -> error message. Metrics: samples, mae, rmse,
+          mape_pct, directional_accuracy (sign of the predicted vs. actual move from the last close,
+          over bars whose close moved), naive_mae (persistence baseline: next close = last close),
+          range covered and inference/total time.
+        """
+        results: Dict[str, dict] = {}
+        errors: Dict[str, str] = {}
+        for company in companies:
+            company = company.upper()
+            try:
+                results[company] = self._backtest_company(company, start, end, batch_size)
+            except (FileNotFoundError, ValueError, RuntimeError) as e:
+                errors[company] = str(e)
+        return results, errors
+
+    def _backtest_company(self, company: str, start: datetime, end: datetime, batch_size: int) -> dict:
+        started = time.perf_counter()
+        model_config = get_model_config(company)
+        seq_length = model_config["SEQ_LENGTH"]
+        close_idx = model_config["FEATURES"].index('close_value')
+
+        timestamps, matrix = build_feature_frame_from_rows(
+            company, fetch_rows_with_warmup(company, model_config, start, end), model_config)
+        if len(matrix) <= seq_length:
+            raise ValueError(f"Not enough clean historical data to backtest {company}: "
+                             f"need more than {seq_length} bars, got {len(matrix)}.")
+
+        # Window i covers bars i .. i + seq_length - 1 and predicts bar i + seq_length
+        windows = np.lib.stride_tricks.sliding_window_view(matrix[:-1], seq_length, axis=0).transpose(0, 2, 1)
+        target_timestamps = timestamps[seq_length:]
+        selected = np.ones(len(windows), dtype=bool)
+        if start is not None:
+            selected &= np.array([ts >= start for ts in target_timestamps], dtype=bool)
+        if end is not None:
+            selected &= np.array([ts <= end for ts in target_timestamps], dtype=bool)
+        indices = np.flatnonzero(selected)
+        if len(indices) == 0:
+            raise ValueError(f"No bars of {company} to backtest in the requested range.")
+
+        inference_started = time.perf_counter()
+        predictions = predict_windows_in_batches(self.predictor, company, windows, indices, batch_size)
+        inference_ms = (time.perf_counter() - inference_started) * 1000
+
+        actual = matrix[seq_length:, close_idx][indices]
+        last_close = matrix[seq_length - 1:-1, close_idx][indices]
+        metrics = backtest_metrics(predictions, actual, last_close)
+        metrics.update({
+            "start": target_timestamps[indices[0]].isoformat(),
+            "end": target_timestamps[indices[-1]].isoformat(),
+            "inference_ms": inference_ms,
+            "total_ms": (time.perf_counter() - started) * 1000,
+        })
+        logger.info(f"Backtested {company} on {metrics['samples']} bars in {metrics['total_ms']:.0f} ms.")
+        return metrics
+
+
+def fetch_rows_with_warmup(company: str, model_config: dict, start: datetime = None, end: datetime = None) -> list:
+    """The bars of [start, end] plus enough earlier bars to warm up the indicators and the first window."""
+    query = db.session.query(*BASE_QUERY_COLUMNS).filter(Dataset.company_prefix == company)
+    in_range = query
+    if start is not None:
+        in_range = in_range.filter(Dataset.date_value >= start)
+    if end is not None:
+        in_range = in_range.filter(Dataset.date_value <= end)
+    rows = in_range.order_by(Dataset.date_value).all()
+    if start is None:
+        return rows
+
+    warmup = model_config["SEQ_LENGTH"] + MAX_ROLLING_WINDOW + ROLLING_WINDOW_MARGIN
+    earlier = query.filter(Dataset.date_value < start).order_by(Dataset.date_value.desc()).limit(warmup).all()
+    return list(reversed(earlier)) + rows
+
+
+def predict_windows_in_batches(predictor, company: str, windows: np.ndarray, indices: np.ndarray,
+                               batch_size: int = DEFAULT_BACKTEST_BATCH_SIZE) -> np.ndarray:
+    """Predicted closes of windows[indices], batch_size windows per forward pass."""
+    preprocessor = predictor.get_preprocessor(company)
+    model = predictor.model_manager.get_model(company)
+    predictions = np.empty(len(indices))
+    for offset in range(0, len(indices), max(1, batch_size)):
+        batch_indices = indices[offset:offset + batch_size]
+        model_input = preprocessor.prepare_input_batch(windows[batch_indices])
+        predictions[offset:offset + len(batch_indices)] = preprocessor.inverse_transform_batch(model.predict(model_input))
+    return predictions
+
+
+def backtest_metrics(predicted: np.ndarray, actual: np.ndarray, last_close: np.ndarray) -> dict:
+    """Error and direction metrics of next-close predictions (all arrays aligned per bar)."""
+    errors = predicted - actual
+    actual_move = np.sign(actual - last_close)
+    moved = actual_move != 0
+    nonzero = actual != 0
+    return {
+        "samples": int(len(actual)),
+        "mae": float(np.mean(np.abs(errors))),
+        "rmse": float(np.sqrt(np.mean(errors ** 2))),
+        "mape_pct": float(np.mean(np.abs(errors[nonzero] / actual[nonzero])) * 100) if nonzero.any() else None,
+        "directional_accuracy": float(np.mean(np.sign(predicted - last_close)[moved] == actual_move[moved]))
+                                if moved.any() else None,
+        "naive_mae": float(np.mean(np.abs(actual - last_close))),
+    }
@@ -0,0 +1,187 @@
+# app/services/prediction_scheduler.py
+
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from sqlalchemy import func
+
+from src.config import Config, COMPANIES_TYPE1, COMPANIES_TYPE2
+from src.extensions import db
+from src.models.dataset import Dataset
+from src.services.accuracy_service import AccuracyTracker
+
+try:
+    import fcntl  # POSIX only; cross-process locking is skipped where it is unavailable
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Which process runs the scheduler (PREDICTION_SCHEDULER_MODE):
+#   "off"        - nothing is precomputed (default)
+#   "embedded"   - a daemon thread inside every create_app() process; the file lock makes
+#                  sure only one of several gunicorn workers does the work per tick
+#   "standalone" - only the dedicated `flask prediction-scheduler` process runs it
+SCHEDULER_MODES = ("off", "embedded", "standalone")
+DEFAULT_LOCK_FILE = Config.PREDICTION_SCHEDULER_LOCK_FILE
+
+
+class PredictionScheduler:
+    """
+    Precomputes the next-minute prediction of every configured ticker as soon as a new
+    cleaned_dataset bar appears, so GET /predict only has to read the stored value.
+
+    Each tick finds the latest bar of every ticker in one grouped query, runs
+    PredictionService.run_predictions for the tickers that moved, scores the predictions
+    their new bars realized (AccuracyTracker) and sleeps
+    `interval_seconds` plus a random jitter. A tick never overlaps a running one, neither
+    inside this process (non-blocking lock) nor across processes (file lock).
+    """
+    def __init__(self, app, service_factory: Callable, companies: List[str] = None,
+                 interval_seconds: float = 60.0, jitter_seconds: float = 5.0,
+                 lock_file: str = DEFAULT_LOCK_FILE):
+        self.app = app
+        self.service_factory = service_factory
+        self.companies = list(companies) if companies is not None else list(COMPANIES_TYPE1) + list(COMPANIES_TYPE2)
+        self.interval_seconds = interval_seconds
+        self.jitter_seconds = jitter_seconds
+        self.lock_file = lock_file
+
+        self.last_seen: Dict[str, datetime] = {}
+        self.last_run: dict = None
+        self._run_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread = None
+
+    # --- Lifecycle ---
+    def start(self) -> None:
+        """Starts the scheduler loop in a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run_forever, name="prediction-scheduler", daemon=True)
+        self._thread.start()
+        logger.info(f"Prediction scheduler started for {self.companies} (every {self.interval_seconds}s).")
+
+    def stop(self, timeout: float = None) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run_forever(self) -> None:
+        """Runs ticks until stop() is called. Exceptions are logged, never fatal to the loop."""
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Prediction scheduler tick failed: {e}", exc_info=True)
+            self._stop_event.wait(self.next_delay())
+
+    def next_delay(self) -> float:
+        """Interval plus jitter, so several processes or deployments do not hit the DB in lockstep."""
+        return self.interval_seconds + random.uniform(0.0, self.jitter_seconds)
+
+    # --- Tick ---
+    def run_once(self) -> dict:
+        """
+        Runs one tick and returns a summary:
+        {"status": "ok" | "skipped", "updated": [...], "predicted": [...], "errors": {...}, "duration_ms": ...}
+        """
+        if not self._run_lock.acquire(blocking=False):
+            logger.info("Previous prediction scheduler tick still running. Skipping.")
+            return {"status": "skipped", "reason": "previous tick still running"}
+        try:
+            with self._file_lock() as acquired:
+                if not acquired:
+                    logger.info("Prediction scheduler tick is running in another process. Skipping.")
+                    return {"status": "skipped", "reason": "locked by another process"}
+                with self.app.app_context():
+                    try:
+                        self.last_run = self._tick()
+                    finally:
+                        db.session.remove()
+                return self.last_run
+        finally:
+            self._run_lock.release()
+
+    def _tick(self) -> dict:
+        start = time.perf_counter()
+        latest_bars = self._latest_bars()
+        updated = [company for company, latest in latest_bars.items() if self.last_seen.get(company) != latest]
+
+        predictions, errors = {}, {}
+        if updated:
+            service = self.service_factory()
+            # New bars make this process' cached "latest bar" stale for these tickers
+            service.invalidate_cache(updated)
+            predictions, errors = service.run_predictions(updated)
+            for company in updated:
+                # Failed tickers are retried on the next tick
+                if company in predictions:
+                    self.last_seen[company] = latest_bars[company]
+            if errors:
+                logger.warning(f"Prediction scheduler could not predict {errors}.")
+            self._update_accuracy(updated)
+
+        summary = {
+            "status": "ok",
+            "updated": updated,
+            "predicted": sorted(predictions),
+            "errors": errors,
+            "duration_ms": (time.perf_counter() - start) * 1000,
+        }
+        logger.info(f"Prediction scheduler tick: {len(updated)} new bars, {len(predictions)} predictions "
+                    f"in {summary['duration_ms']:.0f} ms.")
+        return summary
+
+    def _update_accuracy(self, companies: List[str]) -> None:
+        """New bars realize earlier predictions; fold them into the live accuracy aggregates."""
+        try:
+            AccuracyTracker().update(companies)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Updating prediction accuracy failed: {e}", exc_info=True)
+
+    def _latest_bars(self) -> Dict[str, datetime]:
+        """Latest cleaned_dataset timestamp of every scheduled ticker, in one grouped query."""
+        rows = db.session.query(Dataset.company_prefix, func.max(Dataset.date_value))\
+                         .filter(Dataset.company_prefix.in_(self.companies))\
+                         .group_by(Dataset.company_prefix)\
+                         .all()
+        return {company: latest for company, latest in rows if latest is not None}
+
+    @contextmanager
+    def _file_lock(self):
+        """Non-blocking exclusive flock on `lock_file`; yields whether it was acquired."""
+        if fcntl is None or not self.lock_file:
+            yield True
+            return
+        handle = open(self.lock_file, "a")
+        try:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+        finally:
+            handle.close()
+
+
+def create_scheduler(app, service_factory: Callable) -> PredictionScheduler:
+    """Builds a PredictionScheduler from the PREDICTION_SCHEDULER_* settings of `app.config`."""
+    return PredictionScheduler(
+        app,
+        service_factory,
+        interval_seconds=app.config.get("PREDICTION_SCHEDULER_INTERVAL_SECONDS", 60.0),
+        jitter_seconds=app.config.get("PREDICTION_SCHEDULER_JITTER_SECONDS", 5.0),
+        lock_file=app.config.get("PREDICTION_SCHEDULER_LOCK_FILE", DEFAULT_LOCK_FILE),
+    )
@@ -2,26 +2,143 @@
 
 from src.config import (
     MODEL_TYPE1_CONFIG, MODEL_TYPE2_CONFIG,
-    COMPANIES_TYPE1, COMPANIES_TYPE2
+    COMPANIES_TYPE1, COMPANIES_TYPE2,
+    PREDICTION_CLAIMS_ENABLED, PREDICTION_CLAIM_TTL_SECONDS, PREDICTION_CLAIM_WAIT_SECONDS,
+    PREDICTION_CACHE_MAX_ENTRIES, PREDICTION_CACHE_TTL_SECONDS,
+    PREDICTION_MAX_HORIZON,
+    INFERENCE_POOL_WORKERS, INFERENCE_POOL_SLOTS, INFERENCE_POOL_TIMEOUT_SECONDS,
+    MODEL_REGISTRY_FAILURE_TTL_SECONDS, MODEL_REGISTRY_RELOAD_CHECK_SECONDS,
+    MICRO_BATCH_ENABLED, MICRO_BATCH_MAX_SIZE, MICRO_BATCH_MAX_WAIT_MS,
+    PREDICTION_INTERVAL_SAMPLES, PREDICTION_INTERVAL_CONFIDENCE
 )
 from src.models.dataset import Dataset
 from src.extensions import db
 from src.utils.prediction_utils import ModelManager, BasePreprocessor, Type2Preprocessor
+from src.utils.feature_buffer import RollingFeatureBuffer
+from src.utils.indicators import derived_model_features
+from src.utils.single_flight import SingleFlight
+from src.utils.prediction_cache import PredictionCache
+from src.utils.inference_pool import InferencePool
+from src.utils.model_registry import ModelRegistry
+from src.utils.micro_batcher import MicroBatcher
+from src.utils.artifact_bundle import ArtifactBundle, manifest_path
+from src.utils.metrics import get_histogram
+from src.utils.stage_timing import timing_scope, stage
 from src.services.prediction_storage_service import PredictionStorageService 
-from typing import List, Dict, Union
+from src.models.prediction import Prediction
+from sqlalchemy import func
+from typing import List, Dict, Union, Tuple
 import numpy as np
-import pandas as pd
 from datetime import datetime, timedelta 
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
 import logging
+import os
+import socket
 
 logger = logging.getLogger(__name__)
 
+# Largest rolling window used by the derived features (ma30), plus a small safety margin.
+MAX_ROLLING_WINDOW = 30
+ROLLING_WINDOW_MARGIN = 5
+
+# Raw Dataset columns needed to derive every model feature.
+BASE_QUERY_COLUMNS = [
+    Dataset.date_value, Dataset.close_value, Dataset.volume,
+    Dataset.gdp_growth, Dataset.consumer_price_index_for_all_urban_consumers,
+    Dataset.retail_sales_data_excluding_food_services, Dataset.crude_oil_price,
+    Dataset.interest_rate_fed_funds, Dataset.stock_market_volatility_vix_index,
+    Dataset.ten_year_treasury_yield
+]
+
+
+def get_model_config(company: str) -> dict:
+    """
+    Returns the model configuration (MODEL_TYPE1_CONFIG or MODEL_TYPE2_CONFIG) for a company.
+    Raises ValueError if the company is not configured for prediction.
+    """
+    if company in COMPANIES_TYPE1:
+        return MODEL_TYPE1_CONFIG
+    if company in COMPANIES_TYPE2:
+        return MODEL_TYPE2_CONFIG
+    raise ValueError(f"Company '{company}' is not configured for prediction. "
+                     "Please ensure it's in COMPANIES_TYPE1 or COMPANIES_TYPE2.")
+
+
+def build_feature_matrix_from_rows(company: str, historical_data_rows: list, model_config: dict) -> np.ndarray:
+    """
+    Derives the technical indicators from raw Dataset rows and returns the clean feature matrix
+    of shape (rows, num_features), oldest -> newest, columns in the model's FEATURES order.
+    Rows with missing values (other than log_returns) are dropped.
+    """
+    return build_feature_frame_from_rows(company, historical_data_rows, model_config)[1]
+
+
+def build_feature_frame_from_rows(company: str, historical_data_rows: list, model_config: dict) -> Tuple[np.ndarray, np.ndarray]:
+    """Like build_feature_matrix_from_rows, also returning the date_value of every kept row."""
+    current_features = model_config["FEATURES"]
+
+    historical_data_rows = sorted(historical_data_rows, key=lambda row: row.date_value)
+    raw_columns = [col.key for col in BASE_QUERY_COLUMNS if col.key != 'date_value']
+    # None (missing macro values) becomes NaN
+    with stage("feature_matrix"):
+        raw_values = np.array([[getattr(row, name) for name in raw_columns] for row in historical_data_rows],
+                              dtype=np.float64).reshape(len(historical_data_rows), len(raw_columns))
+    columns = dict(zip(raw_columns, raw_values.T))
+
+    # --- Feature Engineering (shared NumPy indicators) ---
+    with stage("rolling_features"):
+        columns.update(derived_model_features(columns['close_value']))
+
+    unknown_features = [f for f in current_features if f not in columns]
+    if unknown_features:
+        raise ValueError(f"Cannot derive features {unknown_features} for {company} from the dataset columns.")
+
+    feature_matrix = np.column_stack([columns[f] for f in current_features])
+    features_to_dropna_on = [i for i, f in enumerate(current_features) if f not in ['log_returns']]
+    keep = ~np.isnan(feature_matrix[:, features_to_dropna_on]).any(axis=1)
+    timestamps = np.array([row.date_value for row in historical_data_rows], dtype=object)
+    return timestamps[keep], feature_matrix[keep]
+
+
+def build_raw_input_from_rows(company: str, historical_data_rows: list, model_config: dict) -> Dict[str, List[float]]:
+    """
+    Derives the technical indicators from raw Dataset rows (sorted oldest -> newest)
+    and returns the last SEQ_LENGTH values of every model feature.
+    """
+    current_seq_length = model_config["SEQ_LENGTH"]
+    current_features = model_config["FEATURES"]
+    feature_matrix = build_feature_matrix_from_rows(company, historical_data_rows, model_config)
+
+    if len(feature_matrix) < current_seq_length:
+        raise ValueError(f"Not enough clean historical data after feature engineering and dropping NaNs for {company}. "
+                         f"Need {current_seq_length} data points, got {len(feature_matrix)}.")
+
+    raw_input_data = {}
+    for i, feature_name in enumerate(current_features):
+        raw_input_data[feature_name] = feature_matrix[-current_seq_length:, i].tolist()
+
+    for feature in current_features:
+        if feature not in raw_input_data or len(raw_input_data[feature]) != current_seq_length:
+            raise ValueError(f"Error preparing input: Feature '{feature}' is missing or has incorrect length "
+                             f"({len(raw_input_data.get(feature, []))}) for SEQ_LENGTH {current_seq_length}.")
+    return raw_input_data
+
 
 # --- Core Prediction Service ---
 class PredictionService:
     def __init__(self):
         self.predictor = Predictor()
         self.prediction_storage = PredictionStorageService() 
+        # Per-ticker rolling feature windows, kept in sync with cleaned_dataset incrementally
+        self.feature_buffers: Dict[str, RollingFeatureBuffer] = {}
+        self._feature_buffers_lock = threading.Lock()
+        # In-flight generations keyed by (ticker, predicted_for_timestamp)
+        self._single_flight = SingleFlight()
+        # Served predictions keyed by (ticker, latest bar timestamp)
+        self.prediction_cache = PredictionCache(max_entries=PREDICTION_CACHE_MAX_ENTRIES,
+                                                ttl_seconds=PREDICTION_CACHE_TTL_SECONDS)
 
     def run_prediction(self, company: str, features_from_request: dict = None) -> float:
         """
@@ -38,145 +155,584 @@ class PredictionService:
 
         Returns:
         - predicted_close_value: The predicted closing Dataset as a float.
+
+        Every stage (latest-bar query, feature build, preprocessing, forward pass, inverse
+        transform, save) is timed into the per-ticker `prediction.stage.*` histograms.
         """
         company = company.upper()
+        # Validated before the scope: histograms are only ever created for configured tickers
+        model_config = get_model_config(company)
+        with timing_scope(company), stage("total"):
+            return self._run_prediction(company, model_config, features_from_request)
 
-        # Determine model type and relevant configs
-        model_config = None
-        if company in COMPANIES_TYPE1:
-            model_config = MODEL_TYPE1_CONFIG
-        elif company in COMPANIES_TYPE2:
-            model_config = MODEL_TYPE2_CONFIG
-        else:
-            raise ValueError(f"Company '{company}' is not configured for prediction. "
-                             "Please ensure it's in COMPANIES_TYPE1 or COMPANIES_TYPE2.")
-
-        current_seq_length = model_config["SEQ_LENGTH"]
-        current_features = model_config["FEATURES"]
+    def _run_prediction(self, company: str, model_config: dict, features_from_request: dict = None) -> float:
 
         # --- Determine the target timestamp for prediction (T+1 minute) ---
         # This is the timestamp for which we are making/checking the prediction.
         predicted_for_db_timestamp = None
+        latest_bar_timestamp = None
+        existing_prediction = None
         if features_from_request:
             # If features are provided directly, we assume it's for the next full minute from now.
             predicted_for_db_timestamp = (datetime.utcnow().replace(second=0, microsecond=0) + timedelta(minutes=1))
+            existing_prediction = self._find_existing_prediction(company, predicted_for_db_timestamp)
         else:
-            # We need to query for the last available data point to determine the predicted_for_db_timestamp.
-            # Query just the date_value for the last minute to find the timestamp.
-            last_data_point_query = db.session.query(Dataset.date_value)\
-                                          .filter(Dataset.company_prefix == company)\
-                                          .order_by(Dataset.date_value.desc())\
-                                          .limit(1)\
-                                          .first()
-            if last_data_point_query:
-                last_input_data_timestamp = last_data_point_query.date_value
-                predicted_for_db_timestamp = last_input_data_timestamp + timedelta(minutes=1)
+            # In-memory hit: the latest bar was confirmed recently and its prediction is cached.
+            cached_value = self.prediction_cache.get_fresh(company)
+            if cached_value is not None:
+                return cached_value
+
+            # One round-trip for the last available data point and the prediction stored for the minute after it.
+            with stage("latest_bar"):
+                latest_bar_timestamp, existing_prediction = self.prediction_storage.get_latest_bar_with_prediction(company)
+            if latest_bar_timestamp is not None:
+                predicted_for_db_timestamp = latest_bar_timestamp + timedelta(minutes=1)
+                cached_value = self.prediction_cache.get(company, latest_bar_timestamp)
+                if cached_value is not None:
+                    return cached_value
             else:
                 logger.warning(f"No historical data found for {company} to determine prediction timestamp. Proceeding with current time + 1min as fallback.")
                 predicted_for_db_timestamp = (datetime.utcnow().replace(second=0, microsecond=0) + timedelta(minutes=1))
+                existing_prediction = self._find_existing_prediction(company, predicted_for_db_timestamp)
 
         if not predicted_for_db_timestamp:
             raise RuntimeError(f"Could not determine a valid timestamp for prediction for {company}.")
 
+        if existing_prediction:
+            logger.info(f"Found existing prediction for {company} at {predicted_for_db_timestamp}. Returning cached value.")
+            # We don't commit here. The main request's session will handle the commit/rollback.
+            if latest_bar_timestamp is not None:
+                self.prediction_cache.put(company, latest_bar_timestamp, existing_prediction.predicted_price)
+            return float(existing_prediction.predicted_price)
+        logger.info(f"No existing prediction for {company} at {predicted_for_db_timestamp}. Generating new prediction.")
+
+        # --- Proceed with prediction if no existing one was found or lookup failed ---
+        if features_from_request:
+            # Request-specific features are never shared with other callers
+            predicted_value = self.predictor.predict(company, features_from_request)
+            self._save_generated_prediction(company, predicted_for_db_timestamp, predicted_value)
+            return float(predicted_value)
+
+        # Concurrent requests for the same (ticker, timestamp) share a single model run
+        predicted_value = self._single_flight.do(
+            (company, predicted_for_db_timestamp),
+            lambda: self._generate_with_claim(company, model_config, predicted_for_db_timestamp, latest_bar_timestamp)
+        )
+        if latest_bar_timestamp is not None:
+            self.prediction_cache.put(company, latest_bar_timestamp, predicted_value)
+        return predicted_value
+
+    def get_prediction_swr(self, company: str, max_staleness_seconds: float) -> Tuple[float, str, float]:
+        """
+        Stale-while-revalidate read for /predict: never runs the model on the request path
+        while a recent enough stored prediction exists.
 
-        # --- NEW: Check for existing prediction in DB first (without nested transaction for read) ---
+        Returns:
+        - (predicted_close_value, freshness, age_seconds): freshness is "fresh" when the value is
+          the prediction for the minute after the latest bar, "stale" when an older stored prediction
+          is served instead. age_seconds is how far (in bar time) the served prediction lags behind
+          the current target minute. A "stale" answer means the caller should refresh in the background.
+        """
+        company = company.upper()
+        get_model_config(company)
+
+        cached_value = self.prediction_cache.get_fresh(company)
+        if cached_value is not None:
+            return cached_value, "fresh", 0.0
+
+        latest_bar_timestamp, existing_prediction = self.prediction_storage.get_latest_bar_with_prediction(company)
+        if latest_bar_timestamp is not None:
+            if existing_prediction is not None:
+                self.prediction_cache.put(company, latest_bar_timestamp, existing_prediction.predicted_price)
+                return float(existing_prediction.predicted_price), "fresh", 0.0
+
+            target_timestamp = latest_bar_timestamp + timedelta(minutes=1)
+            latest_prediction = self.prediction_storage.get_latest_prediction(company)
+            if latest_prediction is not None and latest_prediction.timestamp < target_timestamp:
+                age_seconds = (target_timestamp - latest_prediction.timestamp).total_seconds()
+                if age_seconds <= max_staleness_seconds:
+                    return float(latest_prediction.predicted_price), "stale", age_seconds
+
+        # Nothing servable (no stored prediction, or older than the allowed staleness): compute now
+        return self.run_prediction(company), "fresh", 0.0
+
+    def _find_existing_prediction(self, company: str, predicted_for_db_timestamp: datetime) -> Union[Prediction, None]:
+        """Looks up a stored prediction; a failed lookup is logged and treated as a miss."""
         try:
-            existing_prediction = self.prediction_storage.get_prediction_for_timestamp(
-                company_ticker=company, 
-                target_timestamp=predicted_for_db_timestamp
-            )
-            if existing_prediction:
-                logger.info(f"Found existing prediction for {company} at {predicted_for_db_timestamp}. Returning cached value.")
-                # We don't commit here. The main request's session will handle the commit/rollback.
-                return float(existing_prediction.predicted_price)
-            else:
-                logger.info(f"No existing prediction for {company} at {predicted_for_db_timestamp}. Generating new prediction.")
+            with stage("existing_lookup"):
+                return self.prediction_storage.get_prediction_for_timestamp(
+                    company_ticker=company, 
+                    target_timestamp=predicted_for_db_timestamp
+                )
         except Exception as e:
             # No rollback needed here for a simple read lookup that isn't part of a nested transaction.
             logger.error(f"Error checking for existing prediction for {company} at {predicted_for_db_timestamp}: {e}", exc_info=True)
-            # Decide if prediction failure should block the API response:
-            # For now, we'll continue to try generating a new one if lookup fails.
+            # We'll continue to try generating a new one if lookup fails.
+            return None
 
-        # --- Proceed with prediction if no existing one was found or lookup failed ---
-        raw_input_data = {} # Initialize raw_input_data
-        if features_from_request:
-            raw_input_data = features_from_request
-            # Validation for `features_from_request` path already exists above and is fine.
-        else:
+    def invalidate_cache(self, companies: List[str] = None) -> None:
+        """
+        Call when new cleaned_dataset bars were ingested: the next /predict for these tickers
+        re-reads the latest bar from the database. Without companies, every ticker is invalidated.
+        """
+        if companies is None:
+            self.prediction_cache.invalidate()
+            return
+        for company in companies:
+            self.prediction_cache.invalidate(company.upper())
+
+    def _generate_with_claim(self, company: str, model_config: dict, predicted_for_db_timestamp: datetime,
+                             latest_bar_timestamp: datetime) -> float:
+        """
+        Cross-process coalescing (PREDICTION_CLAIMS_ENABLED): the worker that wins the
+        prediction_claims row generates and stores the prediction, the others wait for it
+        in app_data. If the owner does not deliver in time the prediction is generated anyway.
+        """
+        if not PREDICTION_CLAIMS_ENABLED:
+            return self._generate_from_dataset(company, model_config, predicted_for_db_timestamp, latest_bar_timestamp)
+
+        owner = f"{socket.gethostname()}:{os.getpid()}"
+        if self.prediction_storage.try_claim(company, predicted_for_db_timestamp, owner, PREDICTION_CLAIM_TTL_SECONDS):
+            try:
+                return self._generate_from_dataset(company, model_config, predicted_for_db_timestamp, latest_bar_timestamp)
+            finally:
+                self.prediction_storage.release_claim(company, predicted_for_db_timestamp, owner)
+
+        logger.info(f"Prediction for {company} at {predicted_for_db_timestamp} is being generated by another worker. Waiting.")
+        existing_prediction = self.prediction_storage.wait_for_prediction(
+            company, predicted_for_db_timestamp, timeout_seconds=PREDICTION_CLAIM_WAIT_SECONDS)
+        if existing_prediction is not None:
+            return float(existing_prediction.predicted_price)
+        logger.warning(f"Timed out waiting for the claimed prediction for {company} at {predicted_for_db_timestamp}. Generating it here.")
+        return self._generate_from_dataset(company, model_config, predicted_for_db_timestamp, latest_bar_timestamp)
+
+    def _generate_from_dataset(self, company: str, model_config: dict, predicted_for_db_timestamp: datetime,
+                               latest_bar_timestamp: datetime) -> float:
+        """Derives the input window from cleaned_dataset, runs the model and stores the prediction."""
+        predicted_value = None
+        if latest_bar_timestamp is not None:
+            # Fast path: the in-memory rolling window only needs the bars added since the last call
+            predicted_value = self._predict_from_buffer(company, model_config, latest_bar_timestamp)
+
+        if predicted_value is None:
             # Re-query historical data for prediction generation (might be slightly different if time passed)
-            # Fetch full required data points for feature engineering if not from request
-            max_rolling_window = 30 
-            required_raw_data_points = current_seq_length + max_rolling_window + 5 
-
-            base_query_columns = [
-                Dataset.date_value, Dataset.close_value, Dataset.volume,
-                Dataset.gdp_growth, Dataset.consumer_price_index_for_all_urban_consumers,
-                Dataset.retail_sales_data_excluding_food_services, Dataset.crude_oil_price,
-                Dataset.interest_rate_fed_funds, Dataset.stock_market_volatility_vix_index,
-                Dataset.ten_year_treasury_yield
-            ]
-
-            historical_data_rows = db.session.query(*base_query_columns)\
-                                          .filter(Dataset.company_prefix == company)\
-                                          .order_by(Dataset.date_value.desc())\
-                                          .limit(required_raw_data_points)\
-                                          .all()
+            required_raw_data_points = model_config["SEQ_LENGTH"] + MAX_ROLLING_WINDOW + ROLLING_WINDOW_MARGIN
+
+            with stage("history_query"):
+                historical_data_rows = db.session.query(*BASE_QUERY_COLUMNS)\
+                                              .filter(Dataset.company_prefix == company)\
+                                              .order_by(Dataset.date_value.desc())\
+                                              .limit(required_raw_data_points)\
+                                              .all()
             historical_data_rows.sort(key=lambda x: x.date_value)
 
             if len(historical_data_rows) < required_raw_data_points:
                 raise ValueError(f"Not enough historical data for {company} after lookup. Need at least {required_raw_data_points} data points (for features and lookback), got {len(historical_data_rows)}.")
 
-            historical_df = pd.DataFrame([row._asdict() for row in historical_data_rows], columns=[col.key for col in base_query_columns])
-            historical_df = historical_df.set_index('date_value').sort_index()
+            raw_input_data = build_raw_input_from_rows(company, historical_data_rows, model_config)
+            predicted_value = self.predictor.predict(company, raw_input_data)
 
-            # --- Feature Engineering (Unified Pandas Approach) ---
-            historical_df['ma10'] = historical_df['close_value'].rolling(window=10).mean()
-            historical_df['ma30'] = historical_df['close_value'].rolling(window=30).mean()
-            historical_df['volatility'] = historical_df['close_value'].rolling(window=10).std()
+        self._save_generated_prediction(company, predicted_for_db_timestamp, predicted_value)
+        return float(predicted_value)
 
-            features_to_dropna_on = [f for f in current_features if f not in ['log_returns']] 
-            historical_df = historical_df[current_features].dropna(subset=features_to_dropna_on)
+    def _save_generated_prediction(self, company: str, predicted_for_db_timestamp: datetime, predicted_value: float) -> None:
+        """Stores a newly generated prediction. A failed save is logged; the value is still returned to the caller."""
+        try:
+            with stage("save"):
+                # Use begin_nested here for the write operation for atomicity
+                with db.session.begin_nested(): 
+                    self.prediction_storage.save_prediction(
+                        company_ticker=company, 
+                        predicted_for_timestamp=predicted_for_db_timestamp, 
+                        predicted_value=predicted_value 
+                    )
+                db.session.commit() # Commit the nested transaction for the save
+            logger.info(f"Successfully saved new prediction for {company} for {predicted_for_db_timestamp}.")
+        except Exception as e:
+            db.session.rollback() # Rollback in case of save error
+            logger.error(f"Failed to save newly generated prediction for {company} for {predicted_for_db_timestamp}: {e}", exc_info=True)
 
-            if len(historical_df) < current_seq_length:
-                raise ValueError(f"Not enough clean historical data after feature engineering and dropping NaNs for {company}. "
-                                 f"Need {current_seq_length} data points, got {len(historical_df)}.")
+    def run_prediction_paths(self, companies: List[str], horizon: int) -> Tuple[Dict[str, List[dict]], Dict[str, str]]:
+        """
+        Forecasts T+1..T+horizon for several tickers by autoregressive rollout.
+
+        Each ticker's rolling feature buffer is copied and rolled forward one synthetic bar per
+        step: the predicted close becomes the next bar's close (volume and macro columns are
+        carried forward) and ma10/ma30/volatility are updated incrementally. Every step predicts
+        all tickers together through Predictor.predict_windows. Paths are not stored in app_data.
+
+        Parameters:
+        - companies: The company tickers (e.g., ['APP', 'TSLA']).
+        - horizon: Number of minutes to forecast (1..PREDICTION_MAX_HORIZON).
 
-            for feature_name in current_features:
-                raw_input_data[feature_name] = historical_df[feature_name].iloc[-current_seq_length:].tolist()
-            
-            for feature in current_features:
-                if feature not in raw_input_data or len(raw_input_data[feature]) != current_seq_length:
-                    raise ValueError(f"Error preparing input: Feature '{feature}' is missing or has incorrect length "
-                                     f"({len(raw_input_data.get(feature, []))}) for SEQ_LENGTH {current_seq_length}.")
+        Returns:
+        - (paths, errors): paths maps ticker -> [{"timestamp": ..., "predicted_close_value": ...}, ...],
+                           errors maps ticker -> error message.
+        """
+        if not 1 <= horizon <= PREDICTION_MAX_HORIZON:
+            raise ValueError(f"horizon must be between 1 and {PREDICTION_MAX_HORIZON}, got {horizon}.")
+
+        paths: Dict[str, List[dict]] = {}
+        errors: Dict[str, str] = {}
+
+        model_configs = {}
+        for company in dict.fromkeys(c.strip().upper() for c in companies if c and c.strip()):
+            try:
+                model_configs[company] = get_model_config(company)
+            except ValueError as e:
+                errors[company] = str(e)
+        if not model_configs:
+            return paths, errors
+
+        latest_bars = dict(db.session.query(Dataset.company_prefix, func.max(Dataset.date_value))
+                                     .filter(Dataset.company_prefix.in_(list(model_configs)))
+                                     .group_by(Dataset.company_prefix)
+                                     .all())
+
+        # --- Start every rollout from a private copy of the live buffer ---
+        rollouts: Dict[str, RollingFeatureBuffer] = {}
+        for company, model_config in model_configs.items():
+            if latest_bars.get(company) is None:
+                errors[company] = f"No historical data found for {company}."
+                continue
+            buffer = self._get_feature_buffer(company, model_config)
+            with buffer.lock:
+                self._sync_feature_buffer(company, buffer, latest_bars[company])
+                if not buffer.is_ready():
+                    errors[company] = (f"Not enough clean historical data for {company} to build a "
+                                       f"{model_config['SEQ_LENGTH']}-bar feature window.")
+                    continue
+                rollouts[company] = buffer.copy()
+
+        for step in range(horizon):
+            if not rollouts:
+                break
+            step_predictions, step_errors = self.predictor.predict_windows(
+                {company: rollout.window() for company, rollout in rollouts.items()})
+            for company, error in step_errors.items():
+                errors[company] = error
+                paths.pop(company, None)
+                del rollouts[company]
+            for company, predicted_value in step_predictions.items():
+                rollout = rollouts[company]
+                step_timestamp = rollout.last_timestamp + timedelta(minutes=1)
+                paths.setdefault(company, []).append(
+                    {"timestamp": step_timestamp, "predicted_close_value": predicted_value})
+                rollout.append_synthetic(step_timestamp, predicted_value)
+
+        return paths, errors
+
+    def run_prediction_interval(self, company: str, samples: int = PREDICTION_INTERVAL_SAMPLES,
+                                confidence: float = PREDICTION_INTERVAL_CONFIDENCE) -> dict:
+        """
+        Predictive interval for the next minute of `company`, from the same input window as
+        run_prediction (see Predictor.predict_interval). Intervals are not stored.
+        """
+        company = company.upper()
+        model_config = get_model_config(company)
+
+        latest_bar_timestamp, _ = self.prediction_storage.get_latest_bar_with_prediction(company)
+        if latest_bar_timestamp is not None:
+            buffer = self._get_feature_buffer(company, model_config)
+            with buffer.lock:
+                self._sync_feature_buffer(company, buffer, latest_bar_timestamp)
+                if buffer.is_ready():
+                    return self.predictor.predict_interval(company, buffer.window(), samples, confidence)
+
+        required_raw_data_points = model_config["SEQ_LENGTH"] + MAX_ROLLING_WINDOW + ROLLING_WINDOW_MARGIN
+        historical_data_rows = db.session.query(*BASE_QUERY_COLUMNS)\
+                                         .filter(Dataset.company_prefix == company)\
+                                         .order_by(Dataset.date_value.desc())\
+                                         .limit(required_raw_data_points)\
+                                         .all()
+        historical_data_rows.sort(key=lambda x: x.date_value)
+        if len(historical_data_rows) < required_raw_data_points:
+            raise ValueError(f"Not enough historical data for {company}. Need at least {required_raw_data_points} "
+                             f"data points (for features and lookback), got {len(historical_data_rows)}.")
+        raw_input_data = build_raw_input_from_rows(company, historical_data_rows, model_config)
+        window = self.predictor.raw_input_to_window(raw_input_data, model_config)
+        return self.predictor.predict_interval(company, window, samples, confidence)
+
+    def _get_feature_buffer(self, company: str, model_config: dict) -> RollingFeatureBuffer:
+        with self._feature_buffers_lock:
+            buffer = self.feature_buffers.get(company)
+            if buffer is None:
+                buffer = RollingFeatureBuffer(model_config["FEATURES"], model_config["SEQ_LENGTH"])
+                self.feature_buffers[company] = buffer
+            return buffer
+
+    def _sync_feature_buffer(self, company: str, buffer: RollingFeatureBuffer, latest_timestamp: datetime) -> None:
+        """
+        Brings the buffer up to `latest_timestamp` (the newest cleaned_dataset bar).
+        Only the rows newer than the buffer are read; after a gap longer than a full window,
+        or if the table moved backwards, the buffer is rebuilt from a single window query.
+        Must be called with buffer.lock held.
+        """
+        if buffer.last_timestamp == latest_timestamp:
+            return
+
+        required_raw_data_points = buffer.seq_length + MAX_ROLLING_WINDOW + ROLLING_WINDOW_MARGIN
+        if buffer.last_timestamp is not None and buffer.last_timestamp < latest_timestamp:
+            new_rows = db.session.query(*BASE_QUERY_COLUMNS)\
+                                 .filter(Dataset.company_prefix == company, Dataset.date_value > buffer.last_timestamp)\
+                                 .order_by(Dataset.date_value.asc())\
+                                 .limit(required_raw_data_points + 1)\
+                                 .all()
+            if len(new_rows) <= required_raw_data_points:
+                buffer.extend(new_rows)
+                return
+            logger.info(f"Feature buffer for {company} is more than {required_raw_data_points} bars behind. Resyncing.")
+
+        rows = db.session.query(*BASE_QUERY_COLUMNS)\
+                         .filter(Dataset.company_prefix == company)\
+                         .order_by(Dataset.date_value.desc())\
+                         .limit(required_raw_data_points)\
+                         .all()
+        rows.reverse()
+        buffer.reset()
+        buffer.extend(rows)
+
+    def _predict_from_buffer(self, company: str, model_config: dict, latest_timestamp: datetime) -> Union[float, None]:
+        """
+        Predicts from the ticker's rolling feature buffer. Returns None when the buffer cannot
+        provide a complete window (too little history, missing macro values), in which case
+        the caller falls back to build_feature_frame_from_rows over a single window query.
+        """
+        buffer = self._get_feature_buffer(company, model_config)
+        with buffer.lock:
+            with stage("buffer_sync"):
+                self._sync_feature_buffer(company, buffer, latest_timestamp)
+                if not buffer.is_ready():
+                    return None
+                window = buffer.window()
+            return self.predictor.predict_window(company, window)
+
+    def run_predictions(self, companies: List[str]) -> Tuple[Dict[str, float], Dict[str, str]]:
+        """
+        Batch variant of run_prediction for several tickers at once.
 
+        The feature windows of every requested ticker are fetched in a single DB round-trip,
+        existing predictions are looked up in one query, the missing ones are generated
+        through Predictor.predict_batch and all new predictions are saved in one commit.
 
-        predicted_value = self.predictor.predict(company, raw_input_data)
+        Parameters:
+        - companies: The company tickers (e.g., ['APP', 'TSLA']).
 
-        # --- Save the newly generated prediction to the database ---
-        # predicted_for_db_timestamp is already determined and validated.
+        Returns:
+        - (predictions, errors): predictions maps ticker -> predicted close value,
+                                 errors maps ticker -> error message for tickers that could not be predicted.
+        """
+        predictions: Dict[str, float] = {}
+        errors: Dict[str, str] = {}
+
+        # Normalise, de-duplicate (keeping order) and drop tickers that are not configured
+        model_configs = {}
+        for company in dict.fromkeys(c.strip().upper() for c in companies if c and c.strip()):
+            try:
+                model_configs[company] = get_model_config(company)
+            except ValueError as e:
+                errors[company] = str(e)
+
+        if not model_configs:
+            return predictions, errors
+
+        # --- Fetch the feature windows of all tickers in one round-trip ---
+        required_raw_data_points = max(cfg["SEQ_LENGTH"] for cfg in model_configs.values()) \
+            + MAX_ROLLING_WINDOW + ROLLING_WINDOW_MARGIN
+        rows_by_company = self.fetch_recent_rows(list(model_configs), required_raw_data_points)
+
+        target_timestamps = {}
+        for company in model_configs:
+            company_rows = rows_by_company.get(company)
+            if not company_rows:
+                errors[company] = f"No historical data found for {company}."
+                continue
+            target_timestamps[company] = company_rows[-1].date_value + timedelta(minutes=1)
+
+        # --- Look up already stored predictions for every target timestamp in one query ---
         try:
-            # Use begin_nested here for the write operation for atomicity
-            with db.session.begin_nested(): 
-                self.prediction_storage.save_prediction(
-                    company_ticker=company, 
-                    predicted_for_timestamp=predicted_for_db_timestamp, 
-                    predicted_value=predicted_value 
-                )
-            db.session.commit() # Commit the nested transaction for the save
-            logger.info(f"Successfully saved new prediction for {company} for {predicted_for_db_timestamp}.")
+            existing = self.prediction_storage.get_predictions_for_timestamps(target_timestamps)
         except Exception as e:
-            db.session.rollback() # Rollback in case of save error
-            logger.error(f"Failed to save newly generated prediction for {company} for {predicted_for_db_timestamp}: {e}", exc_info=True)
-            # The API call will still return the predicted_value, but the save operation failed.
+            logger.error(f"Error checking for existing predictions for {list(target_timestamps)}: {e}", exc_info=True)
+            existing = {}
+
+        raw_inputs: Dict[str, Dict[str, List[float]]] = {}
+        for company, target_timestamp in target_timestamps.items():
+            if company in existing:
+                predictions[company] = float(existing[company].predicted_price)
+                continue
+
+            model_config = model_configs[company]
+            company_rows = rows_by_company[company]
+            needed = model_config["SEQ_LENGTH"] + MAX_ROLLING_WINDOW + ROLLING_WINDOW_MARGIN
+            if len(company_rows) < needed:
+                errors[company] = (f"Not enough historical data for {company} after lookup. Need at least {needed} "
+                                   f"data points (for features and lookback), got {len(company_rows)}.")
+                continue
+            try:
+                raw_inputs[company] = build_raw_input_from_rows(company, company_rows[-needed:], model_config)
+            except ValueError as e:
+                errors[company] = str(e)
+
+        if not raw_inputs:
+            self._cache_batch_results(predictions, target_timestamps)
+            return predictions, errors
+
+        generated, predict_errors = self.predictor.predict_batch(raw_inputs)
+        errors.update(predict_errors)
+        predictions.update(generated)
+
+        # --- Save all newly generated predictions in a single transaction ---
+        try:
+            with db.session.begin_nested():
+                for company, predicted_value in generated.items():
+                    self.prediction_storage.save_prediction(
+                        company_ticker=company,
+                        predicted_for_timestamp=target_timestamps[company],
+                        predicted_value=predicted_value
+                    )
+            db.session.commit()
+            logger.info(f"Successfully saved {len(generated)} new batch predictions.")
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to save batch predictions for {list(generated)}: {e}", exc_info=True)
 
-        return float(predicted_value)
+        self._cache_batch_results(predictions, target_timestamps)
+        return predictions, errors
+
+    def _cache_batch_results(self, predictions: Dict[str, float], target_timestamps: Dict[str, datetime]) -> None:
+        """Makes batch results (e.g. precomputed by the scheduler) servable from the prediction cache."""
+        for company, predicted_value in predictions.items():
+            self.prediction_cache.put(company, target_timestamps[company] - timedelta(minutes=1), predicted_value)
+
+    def fetch_recent_rows(self, companies: List[str], limit: int) -> Dict[str, list]:
+        """
+        Fetches the most recent `limit` Dataset rows of every company in a single query
+        (ROW_NUMBER() window partitioned by company). Rows are returned oldest -> newest.
+        """
+        row_rank = func.row_number().over(
+            partition_by=Dataset.company_prefix,
+            order_by=Dataset.date_value.desc()
+        ).label('row_rank')
+
+        ranked = db.session.query(
+            Dataset.company_prefix,
+            *[col.label(col.key) for col in BASE_QUERY_COLUMNS],
+            row_rank
+        ).filter(Dataset.company_prefix.in_(companies)).subquery()
+
+        selected_columns = [ranked.c[col.key] for col in BASE_QUERY_COLUMNS]
+        rows = db.session.query(ranked.c.company_prefix, *selected_columns)\
+                         .filter(ranked.c.row_rank <= limit)\
+                         .order_by(ranked.c.company_prefix, ranked.c.date_value)\
+                         .all()
+
+        rows_by_company: Dict[str, list] = {}
+        for row in rows:
+            rows_by_company.setdefault(row.company_prefix, []).append(row)
+        return rows_by_company
 
 # --- Predictor Class (Orchestrates Preprocessing and Model Prediction) ---
-# This class remains unchanged as it only predicts, not saves.
+# Loads the artifacts (preload, registry, hot reload) and runs the forward passes in-process,
+# through the inference pool or the micro-batcher, including intervals; it never saves.
 class Predictor:
-    def __init__(self):
-        self.model_manager = ModelManager()
-        self.preprocessors: Dict[str, Union[BasePreprocessor, Type2Preprocessor]] = {}
+    def __init__(self, backend: str = None, use_inference_pool: bool = True, micro_batching: bool = None):
+        self.model_manager = ModelManager(backend)
+        # Scalers/PCAs are small, so they get the failure cache and hot reload but no memory budget
+        self.preprocessors = ModelRegistry(failure_ttl_seconds=MODEL_REGISTRY_FAILURE_TTL_SECONDS,
+                                           reload_check_seconds=MODEL_REGISTRY_RELOAD_CHECK_SECONDS)
+        self.load_status: Dict[str, dict] = {}
+        self._load_status_lock = threading.Lock()
+
+        # Inference server mode: forward passes run in worker processes (started on first use)
+        self.inference_pool = None
+        if use_inference_pool and INFERENCE_POOL_WORKERS > 0:
+            self.inference_pool = InferencePool(
+                num_workers=INFERENCE_POOL_WORKERS,
+                seq_length=max(MODEL_TYPE1_CONFIG["SEQ_LENGTH"], MODEL_TYPE2_CONFIG["SEQ_LENGTH"]),
+                num_features=max(len(MODEL_TYPE1_CONFIG["FEATURES"]), len(MODEL_TYPE2_CONFIG["FEATURES"])),
+                slots=INFERENCE_POOL_SLOTS,
+                backend=self.model_manager.backend,
+                timeout_seconds=INFERENCE_POOL_TIMEOUT_SECONDS
+            )
+
+        # Micro-batching: concurrent predict_window calls for the same model share a forward pass.
+        # Not used with the inference pool, whose workers already serve requests concurrently.
+        if micro_batching is None:
+            micro_batching = MICRO_BATCH_ENABLED
+        self.micro_batcher = None
+        if micro_batching and self.inference_pool is None:
+            self.micro_batcher = MicroBatcher(self._run_window_batch, max_batch_size=MICRO_BATCH_MAX_SIZE,
+                                              max_wait_ms=MICRO_BATCH_MAX_WAIT_MS, name="predictor.micro_batch")
+
+    def preload(self, companies: List[str] = None, max_workers: int = 4, wait: bool = True) -> None:
+        """
+        Loads the model and preprocessor (scaler/PCA) artifacts of every company concurrently
+        so no request pays the cold-start cost. Progress is recorded in `load_status`.
+
+        Parameters:
+        - companies: Tickers to load. Defaults to every ticker in COMPANIES_TYPE1 and COMPANIES_TYPE2.
+        - max_workers: Size of the loader thread pool.
+        - wait: Block until every artifact is loaded. With wait=False the loading continues in the background.
+        """
+        if companies is None:
+            companies = list(COMPANIES_TYPE1) + list(COMPANIES_TYPE2)
+
+        with self._load_status_lock:
+            for company in companies:
+                self.load_status[company] = {"status": "pending", "load_time_ms": None, "error": None}
+
+        executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="model-preload")
+        for company in companies:
+            executor.submit(self._preload_company, company)
+        executor.shutdown(wait=wait)
+
+    def load_artifacts(self, company: str) -> None:
+        """Loads the preprocessor (scaler/PCA) and model of one company in this process."""
+        get_model_config(company)
+        self.get_preprocessor(company)
+        self.model_manager.get_model(company)
+
+    def _preload_company(self, company: str) -> None:
+        """
+        Loads all artifacts of one company and records the outcome in `load_status`. In inference
+        server mode the models live in the pool's worker processes, so the company is only
+        "ready" once every worker confirmed loading it.
+        """
+        self._set_load_status(company, status="loading")
+        start = time.perf_counter()
+        try:
+            if self.inference_pool is not None:
+                for future in self.inference_pool.load(company):
+                    try:
+                        future.result(timeout=self.inference_pool.timeout_seconds)
+                    except TimeoutError:
+                        raise RuntimeError(f"Inference pool workers did not load {company} within "
+                                           f"{self.inference_pool.timeout_seconds}s.")
+            else:
+                self.load_artifacts(company)
+        except Exception as e:
+            logger.error(f"Failed to preload artifacts for {company}: {e}", exc_info=True)
+            self._set_load_status(company, status="failed", error=str(e),
+                                  load_time_ms=(time.perf_counter() - start) * 1000)
+            return
+        load_time_ms = (time.perf_counter() - start) * 1000
+        self._set_load_status(company, status="ready", load_time_ms=load_time_ms)
+        logger.info(f"Preloaded artifacts for {company} in {load_time_ms:.0f} ms.")
+
+    def _set_load_status(self, company: str, **fields) -> None:
+        with self._load_status_lock:
+            self.load_status.setdefault(company, {"status": "pending", "load_time_ms": None, "error": None}).update(fields)
+
+    def get_load_status(self) -> Dict[str, dict]:
+        """Returns a snapshot of the per-ticker preload status."""
+        with self._load_status_lock:
+            return {company: dict(status) for company, status in self.load_status.items()}
+
+    def is_ready(self) -> bool:
+        """True once every preloaded ticker finished loading successfully."""
+        with self._load_status_lock:
+            return all(status["status"] == "ready" for status in self.load_status.values())
 
     def predict(self, company: str, raw_input_data: Dict[str, List[float]]) -> float:
         model_config = None
@@ -188,15 +744,168 @@ class Predictor:
             raise ValueError(f"Company '{company}' not recognized for prediction in any model type. "
                              "This should have been caught earlier.")
 
-        preprocessor_class = BasePreprocessor if company in COMPANIES_TYPE1 else Type2Preprocessor
+        if self.inference_pool is not None or self.micro_batcher is not None:
+            return self.predict_window(company, self.raw_input_to_window(raw_input_data, model_config))
 
-        if company not in self.preprocessors:
-            self.preprocessors[company] = preprocessor_class(company)
-        preprocessor = self.preprocessors[company]
+        preprocessor = self.get_preprocessor(company)
 
-        model_input = preprocessor.prepare_input_sequence(raw_input_data)
+        with stage("preprocess"):
+            model_input = preprocessor.prepare_input_sequence(raw_input_data)
         model = self.model_manager.get_model(company)
-        prediction_scaled = model.predict(model_input)
-        predicted_price = preprocessor.inverse_transform_prediction(prediction_scaled)
+        with stage("model_predict"):
+            prediction_scaled = model.predict(model_input)
+        with stage("inverse_transform"):
+            predicted_price = preprocessor.inverse_transform_prediction(prediction_scaled)
 
         return float(predicted_price)
+
+    def get_preprocessor(self, company: str) -> Union[BasePreprocessor, Type2Preprocessor]:
+        """The company's scaler/PCA preprocessor, loaded once and shared (hot-reloaded on artifact changes)."""
+        preprocessor_class = BasePreprocessor if company in COMPANIES_TYPE1 else Type2Preprocessor
+        if self.model_manager.artifact_format == "bundle":
+            return self.preprocessors.get(company, lambda: preprocessor_class.from_bundle(ArtifactBundle.open(company)),
+                                          [manifest_path(company)])
+        return self.preprocessors.get(company, lambda: preprocessor_class(company),
+                                      preprocessor_class.artifact_paths(company))
+
+    @staticmethod
+    def raw_input_to_window(raw_input_data: Dict[str, List[float]], model_config: dict) -> np.ndarray:
+        """Stacks a feature -> values dict into a (SEQ_LENGTH, num_features) window in FEATURES order."""
+        for feature in model_config["FEATURES"]:
+            if feature not in raw_input_data or len(raw_input_data[feature]) != model_config["SEQ_LENGTH"]:
+                raise ValueError(f"Feature '{feature}' length {len(raw_input_data.get(feature, []))} "
+                                 f"does not match SEQ_LENGTH {model_config['SEQ_LENGTH']}.")
+        return np.array([raw_input_data[f] for f in model_config["FEATURES"]], dtype=np.float64).T
+
+    def predict_window(self, company: str, window: np.ndarray) -> float:
+        """
+        Predicts from an already assembled raw feature window of shape (SEQ_LENGTH, num_features),
+        columns in the model's FEATURES order (e.g. RollingFeatureBuffer.window()).
+        """
+        get_model_config(company)
+        # Pool workers and the batcher's dispatcher run the model outside of the caller's timing
+        # scope, so their round-trip (queueing included) is timed as a single stage
+        if self.inference_pool is not None:
+            with stage("inference_pool"):
+                return self.inference_pool.predict(company, window)
+        if self.micro_batcher is not None:
+            window = np.asarray(window, dtype=np.float64)
+            # Loaded in the caller's thread, so a cold load never runs on (and stalls) a dispatcher
+            self.load_artifacts(company)
+            with stage("micro_batch"):
+                return self.micro_batcher.submit((company, window.shape), window)
+        return self._run_window_batch((company, window.shape), [window])[0]
+
+    def _run_window_batch(self, key: Tuple[str, tuple], windows: List[np.ndarray]) -> List[float]:
+        """One forward pass of a company's model over stacked windows of the same shape."""
+        company, _ = key
+        preprocessor = self.get_preprocessor(company)
+        with stage("preprocess"):
+            model_input = preprocessor.prepare_input_batch(np.stack(windows))
+        model = self.model_manager.get_model(company)
+        with stage("model_predict"):
+            prediction_scaled = model.predict(model_input)
+        with stage("inverse_transform"):
+            return [float(value) for value in preprocessor.inverse_transform_batch(prediction_scaled)]
+
+    def predict_interval(self, company: str, window: np.ndarray, samples: int = PREDICTION_INTERVAL_SAMPLES,
+                         confidence: float = PREDICTION_INTERVAL_CONFIDENCE) -> dict:
+        """
+        Monte-Carlo dropout interval for one raw feature window (same layout as predict_window).
+
+        The window is preprocessed once and sampled as a single batch with dropout active (the
+        NumPy backend runs the layers before the dropout once and repeats only their output),
+        then inverse-transformed (scaler and, for Type 2, PCA) in one call. Runs in-process even
+        in inference server mode.
+
+        Returns:
+        - {"lower", "upper", "mean", "std", "samples", "confidence", "latency_ms"} in price units.
+        """
+        get_model_config(company)
+        if samples < 2:
+            raise ValueError(f"An interval needs at least 2 samples, got {samples}.")
+        if not 0.0 < confidence < 1.0:
+            raise ValueError(f"Interval confidence must be between 0 and 1, got {confidence}.")
+        if self.model_manager.backend == "tflite":
+            raise ValueError("Predictive intervals are not supported by the 'tflite' inference backend "
+                             "(dropout is removed when the model is converted).")
+
+        started = time.perf_counter()
+        preprocessor = self.get_preprocessor(company)
+        model_input = preprocessor.prepare_input_batch(np.asarray(window, dtype=np.float64)[np.newaxis])
+        model = self.model_manager.get_model(company)
+        if self.model_manager.backend == "keras":
+            sampled = np.asarray(model(np.repeat(model_input, samples, axis=0), training=True))
+        else:
+            sampled = model.sample(model_input, samples)
+        values = np.asarray(preprocessor.inverse_transform_batch(sampled), dtype=np.float64)
+
+        tail = (1.0 - confidence) / 2 * 100
+        lower, upper = np.percentile(values, [tail, 100 - tail])
+        latency_ms = (time.perf_counter() - started) * 1000
+        get_histogram("predictor.interval_ms").observe(latency_ms)
+        return {
+            "lower": float(lower),
+            "upper": float(upper),
+            "mean": float(values.mean()),
+            "std": float(values.std(ddof=1)),
+            "samples": int(samples),
+            "confidence": float(confidence),
+            "latency_ms": latency_ms,
+        }
+
+    def predict_windows(self, windows: Dict[str, np.ndarray]) -> Tuple[Dict[str, float], Dict[str, str]]:
+        """
+        Predicts one step for several companies from ready feature windows
+        (ticker -> (SEQ_LENGTH, num_features) array in FEATURES order).
+
+        Returns:
+        - (predictions, errors): ticker -> predicted price, ticker -> error message.
+        """
+        predictions: Dict[str, float] = {}
+        errors: Dict[str, str] = {}
+        if self.inference_pool is not None:
+            # Hand every window to the pool first so the workers run them in parallel
+            futures = {}
+            for company, window in windows.items():
+                try:
+                    get_model_config(company)
+                    futures[company] = self.inference_pool.submit(company, window)
+                except (ValueError, RuntimeError) as e:
+                    errors[company] = str(e)
+            for company, future in futures.items():
+                try:
+                    predictions[company] = future.result(timeout=self.inference_pool.timeout_seconds)
+                except TimeoutError:
+                    errors[company] = f"Inference pool did not answer for {company} in time."
+                except (FileNotFoundError, ValueError, RuntimeError) as e:
+                    errors[company] = str(e)
+            return predictions, errors
+
+        for company, window in windows.items():
+            try:
+                predictions[company] = self.predict_window(company, window)
+            except (FileNotFoundError, ValueError, RuntimeError) as e:
+                errors[company] = str(e)
+        return predictions, errors
+
+    def predict_batch(self, raw_inputs: Dict[str, Dict[str, List[float]]]) -> Tuple[Dict[str, float], Dict[str, str]]:
+        """
+        Predicts several companies in one call.
+
+        Every company has its own model weights, so each company still gets its own forward
+        pass; the batch saves the per-request overhead (HTTP, DB round-trips, commits) around it.
+
+        Returns:
+        - (predictions, errors): ticker -> predicted price, ticker -> error message.
+        """
+        predictions: Dict[str, float] = {}
+        errors: Dict[str, str] = {}
+
+        for company, raw_input_data in raw_inputs.items():
+            try:
+                predictions[company] = self.predict(company, raw_input_data)
+            except (FileNotFoundError, ValueError, RuntimeError) as e:
+                errors[company] = str(e)
+
+        return predictions, errors
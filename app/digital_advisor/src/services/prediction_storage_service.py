@@ -2,8 +2,13 @@
 
 from src.extensions import db
 from src.models.prediction import Prediction 
-from datetime import datetime
+from src.models.prediction_claim import PredictionClaim
+from src.models.dataset import Dataset
+from sqlalchemy import and_, func
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timedelta
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +56,69 @@ class PredictionStorageService:
             logger.error(f"Error saving prediction for {company_ticker} for {predicted_for_timestamp}: {e}", exc_info=True)
             raise 
 
+    def bulk_upsert_predictions(self, rows: list[dict], overwrite: bool = False, chunk_size: int = 5000) -> int:
+        """
+        Writes many predictions with one multi-row INSERT per chunk, honouring _company_predicted_date_uc.
+
+        Args:
+            rows (list[dict]): {"ticker", "timestamp", "predicted_price"} dicts, optionally with
+                               "source" (Prediction.SOURCE_LIVE when omitted).
+            overwrite (bool): Replace the predicted_price (and source) of existing (ticker, timestamp) rows.
+                              By default existing predictions (e.g. the ones served live) are kept.
+            chunk_size (int): Rows per statement.
+
+        Returns:
+            int: Number of rows inserted or updated.
+        """
+        dialect = db.engine.dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            insert = None
+
+        written = 0
+        for offset in range(0, len(rows), max(1, chunk_size)):
+            chunk = rows[offset:offset + chunk_size]
+            if insert is None:
+                written += self._insert_missing(chunk, overwrite)
+                continue
+            statement = insert(Prediction.__table__).values(chunk)
+            if overwrite:
+                statement = statement.on_conflict_do_update(
+                    index_elements=['ticker', 'timestamp'],
+                    set_={column: statement.excluded[column] for column in chunk[0]
+                          if column not in ('ticker', 'timestamp')}
+                )
+            else:
+                statement = statement.on_conflict_do_nothing(index_elements=['ticker', 'timestamp'])
+            written += db.session.execute(statement).rowcount
+        db.session.commit()
+        return written
+
+    def _insert_missing(self, chunk: list[dict], overwrite: bool) -> int:
+        """Fallback for dialects without ON CONFLICT: one lookup of the existing keys per chunk."""
+        existing = {
+            (p.ticker, p.timestamp): p for p in Prediction.query.filter(
+                Prediction.ticker.in_({row['ticker'] for row in chunk}),
+                Prediction.timestamp.in_({row['timestamp'] for row in chunk})
+            ).all()
+        }
+        written = 0
+        new_rows = []
+        for row in chunk:
+            prediction = existing.get((row['ticker'], row['timestamp']))
+            if prediction is None:
+                new_rows.append(row)
+            elif overwrite:
+                prediction.predicted_price = row['predicted_price']
+                prediction.source = row.get('source', Prediction.SOURCE_LIVE)
+                written += 1
+        if new_rows:
+            db.session.execute(Prediction.__table__.insert(), new_rows)
+        return written + len(new_rows)
+
     def get_latest_prediction(self, company_ticker: str) -> Prediction:
         """
         Retrieves the most recent prediction for a given company based on its predicted timestamp.
@@ -69,6 +137,46 @@ class PredictionStorageService:
             timestamp=target_timestamp
         ).first()
 
+    def get_latest_bar_with_prediction(self, company_ticker: str) -> tuple[datetime, Prediction]:
+        """
+        Retrieves, in a single query, the company's latest cleaned_dataset bar and the prediction
+        stored for the minute after it.
+
+        The latest bar is LEFT JOINed with the first prediction whose timestamp lies after it; since
+        bars and predictions are on whole minutes, that row is the T+1 prediction if it exists.
+
+        Returns:
+            tuple: (latest bar timestamp or None if the company has no data, Prediction or None)
+        """
+        latest_bar = db.session.query(func.max(Dataset.date_value).label('latest_bar'))\
+                               .filter(Dataset.company_prefix == company_ticker)\
+                               .subquery()
+        row = db.session.query(latest_bar.c.latest_bar, Prediction)\
+                        .select_from(latest_bar)\
+                        .outerjoin(Prediction, and_(Prediction.ticker == company_ticker,
+                                                    Prediction.timestamp > latest_bar.c.latest_bar))\
+                        .order_by(Prediction.timestamp.asc())\
+                        .first()
+        if row is None or row[0] is None:
+            return None, None
+        latest_timestamp, prediction = row
+        if prediction is not None and prediction.timestamp != latest_timestamp + timedelta(minutes=1):
+            prediction = None
+        return latest_timestamp, prediction
+
+    def get_predictions_for_timestamps(self, targets: dict[str, datetime]) -> dict[str, Prediction]:
+        """
+        Retrieves the predictions for several (company, target timestamp) pairs in a single query.
+        `targets` maps ticker -> target timestamp. Tickers without a stored prediction are omitted.
+        """
+        if not targets:
+            return {}
+        candidates = Prediction.query.filter(
+            Prediction.ticker.in_(list(targets.keys())),
+            Prediction.timestamp.in_(list(set(targets.values())))
+        ).all()
+        return {p.ticker: p for p in candidates if targets.get(p.ticker) == p.timestamp}
+
     def get_predictions_by_company(self, company_ticker: str, limit: int = 10) -> list[Prediction]:
         """
         Retrieves recent predictions for a given company.
@@ -79,3 +187,62 @@ class PredictionStorageService:
                        .limit(limit)\
                        .all()
 
+    # --- Cross-process generation claims ---
+    def try_claim(self, company_ticker: str, target_timestamp: datetime, owner: str, ttl_seconds: float) -> bool:
+        """
+        Atomically claims the generation of the prediction for (company, timestamp).
+
+        Args:
+            company_ticker (str): The ticker symbol of the company.
+            target_timestamp (datetime): The timestamp the prediction is for.
+            owner (str): Identifier of the claiming worker (e.g. host:pid).
+            ttl_seconds (float): Age after which another worker's claim counts as abandoned and is taken over.
+
+        Returns:
+            bool: True if this worker now owns the claim, False if another live worker holds it.
+        """
+        now = datetime.utcnow()
+        try:
+            with db.session.begin_nested():
+                db.session.add(PredictionClaim(ticker=company_ticker, timestamp=target_timestamp,
+                                               claimed_by=owner, claimed_at=now))
+            db.session.commit()
+            return True
+        except IntegrityError:
+            db.session.rollback()
+
+        # Compare-and-set on claimed_at: only one worker can take over an expired claim
+        taken_over = PredictionClaim.query.filter(
+            PredictionClaim.ticker == company_ticker,
+            PredictionClaim.timestamp == target_timestamp,
+            PredictionClaim.claimed_at < now - timedelta(seconds=ttl_seconds)
+        ).update({PredictionClaim.claimed_by: owner, PredictionClaim.claimed_at: now}, synchronize_session=False)
+        db.session.commit()
+        if taken_over:
+            logger.warning(f"Took over abandoned prediction claim for {company_ticker} at {target_timestamp}.")
+        return taken_over == 1
+
+    def release_claim(self, company_ticker: str, target_timestamp: datetime, owner: str) -> None:
+        """Deletes this worker's claim for (company, timestamp), if it still holds it."""
+        try:
+            PredictionClaim.query.filter_by(ticker=company_ticker, timestamp=target_timestamp, claimed_by=owner)\
+                                 .delete(synchronize_session=False)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to release prediction claim for {company_ticker} at {target_timestamp}: {e}", exc_info=True)
+
+    def wait_for_prediction(self, company_ticker: str, target_timestamp: datetime,
+                            timeout_seconds: float, poll_interval: float = 0.1) -> Prediction:
+        """
+        Polls app_data until the prediction for (company, timestamp) appears or the timeout expires.
+        Returns None on timeout.
+        """
+        deadline = time.monotonic() + timeout_seconds
+        while True:
+            prediction = self.get_prediction_for_timestamp(company_ticker, target_timestamp)
+            if prediction is not None or time.monotonic() >= deadline:
+                return prediction
+            # End the read transaction so the next poll sees rows committed by other workers
+            db.session.rollback()
+            time.sleep(poll_interval)
@@ -1,6 +1,13 @@
 from src.models.dataset import Dataset
 from src.extensions import db
 from sqlalchemy import func
+import threading
+import time
+
+# Last prices read from the database, per ticker: ticker -> (close_value, monotonic read time).
+# Used by the stale-while-revalidate mode of /prices.
+_price_snapshots = {}
+_price_snapshots_lock = threading.Lock()
 
 def get_latest_prices_for_tickers(tickers):
     """
@@ -24,3 +31,39 @@ def get_latest_prices_for_tickers(tickers):
 
     result = query.all()
     return {row.company_prefix: row.close_value for row in result}
+
+def refresh_price_snapshots(tickers):
+    """
+    Reads the latest prices from the database and stores them as the current snapshots.
+    Returns the prices like get_latest_prices_for_tickers.
+    """
+    prices = get_latest_prices_for_tickers(tickers)
+    now = time.monotonic()
+    with _price_snapshots_lock:
+        for ticker, price in prices.items():
+            _price_snapshots[ticker] = (price, now)
+    return prices
+
+def get_latest_prices_swr(tickers, fresh_seconds, max_staleness_seconds):
+    """
+    Stale-while-revalidate variant of get_latest_prices_for_tickers.
+
+    Returns (prices, freshness, age_seconds):
+    - "fresh": every ticker has a snapshot younger than fresh_seconds (or was just read from the DB).
+    - "stale": served from snapshots no older than max_staleness_seconds; the caller should
+      refresh them in the background (refresh_price_snapshots).
+    If any ticker has no usable snapshot the prices are read synchronously.
+    """
+    now = time.monotonic()
+    with _price_snapshots_lock:
+        snapshots = {t: _price_snapshots.get(t) for t in tickers}
+
+    if all(snapshot is not None for snapshot in snapshots.values()):
+        age_seconds = max((now - read_at for _, read_at in snapshots.values()), default=0.0)
+        prices = {t: price for t, (price, _) in snapshots.items()}
+        if age_seconds <= fresh_seconds:
+            return prices, "fresh", age_seconds
+        if age_seconds <= max_staleness_seconds:
+            return prices, "stale", age_seconds
+
+    return refresh_price_snapshots(tickers), "fresh", 0.0
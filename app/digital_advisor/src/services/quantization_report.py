@@ -0,0 +1,96 @@
+# app/services/quantization_report.py
+
+import statistics
+import time
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from src.services.prediction_service import (
+    MAX_ROLLING_WINDOW, ROLLING_WINDOW_MARGIN,
+    build_feature_matrix_from_rows, get_model_config
+)
+from src.utils.numpy_inference import NumpyModel
+from src.utils.prediction_utils import ModelManager
+
+
+def _recent_windows(service, company: str, model_config: dict, num_windows: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the last `num_windows` sliding (SEQ_LENGTH, num_features) windows of the company's
+    cleaned_dataset, together with the clean feature matrix they were cut from.
+    """
+    seq_length = model_config["SEQ_LENGTH"]
+    limit = num_windows + seq_length + MAX_ROLLING_WINDOW + ROLLING_WINDOW_MARGIN
+    rows = service.fetch_recent_rows([company], limit).get(company, [])
+    matrix = build_feature_matrix_from_rows(company, rows, model_config)
+    if len(matrix) < seq_length:
+        raise ValueError(f"Not enough clean historical data for {company}: need {seq_length} rows, got {len(matrix)}.")
+    # (windows, num_features, seq_length) -> (windows, seq_length, num_features)
+    windows = np.lib.stride_tricks.sliding_window_view(matrix, seq_length, axis=0).transpose(0, 2, 1)
+    return np.ascontiguousarray(windows[-num_windows:]), matrix
+
+
+def _median_latency_ms(model: NumpyModel, model_input: np.ndarray, repeats: int) -> float:
+    timings = []
+    for _ in range(max(1, repeats)):
+        start = time.perf_counter()
+        model.predict(model_input)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def build_quantization_report(service, companies: List[str], num_windows: int = 200,
+                              precisions: Sequence[str] = ("float16", "int8"),
+                              latency_repeats: int = 50) -> Dict[str, dict]:
+    """
+    Compares reduced-precision NumPy models with the float32 model of every company over its
+    most recent cleaned_dataset windows.
+
+    Parameters:
+    - service: The PredictionService (its DB access and preprocessors are reused).
+    - companies: Tickers to evaluate.
+    - num_windows: Number of most recent windows to predict.
+    - precisions: Reduced precisions to compare against float32.
+    - latency_repeats: Single-window forward passes timed per precision (median reported).
+
+    Returns:
+    - {"companies": ticker -> per-precision metrics, "errors": ticker -> message}. Per precision:
+      weight_bytes, latency_ms and mae_vs_actual (next close); reduced precisions also get the
+      deviation from float32: mae, max_abs_error and mean_relative_error_pct.
+    """
+    report = {"companies": {}, "errors": {}}
+    for company in companies:
+        company = company.upper()
+        try:
+            model_config = get_model_config(company)
+            windows, matrix = _recent_windows(service, company, model_config, num_windows)
+            preprocessor = service.predictor.get_preprocessor(company)
+            model_input = preprocessor.prepare_input_batch(windows)
+            close_idx = model_config["FEATURES"].index('close_value')
+            # The window ending at row k predicts the close of row k + 1 (unknown for the last window)
+            actual_next = matrix[len(matrix) - len(windows) + 1:, close_idx]
+
+            full_model = NumpyModel.from_keras_file(ModelManager.model_path(company))
+            baseline = preprocessor.inverse_transform_batch(full_model.predict(model_input))
+
+            entry = {"windows": int(len(windows))}
+            for precision in ("float32", *precisions):
+                model = full_model.quantized(precision)
+                predicted = baseline if model is full_model else preprocessor.inverse_transform_batch(model.predict(model_input))
+                metrics = {
+                    "weight_bytes": model.nbytes,
+                    "latency_ms": _median_latency_ms(model, model_input[:1], latency_repeats),
+                    "mae_vs_actual": float(np.mean(np.abs(predicted[:-1] - actual_next))) if len(actual_next) else None,
+                }
+                if model is not full_model:
+                    deviation = np.abs(predicted - baseline)
+                    metrics.update({
+                        "mae": float(deviation.mean()),
+                        "max_abs_error": float(deviation.max()),
+                        "mean_relative_error_pct": float(deviation.mean() / np.mean(np.abs(baseline)) * 100),
+                    })
+                entry[precision] = metrics
+            report["companies"][company] = entry
+        except (FileNotFoundError, ValueError, RuntimeError) as e:
+            report["errors"][company] = str(e)
+    return report
@@ -33,6 +33,16 @@ document.addEventListener('DOMContentLoaded', async () => {
         });
     }
 
+    // Predictive ranges cost an extra sampled forward pass per ticker, so they are opt-in
+    const showPredictionIntervals = document.getElementById('showPredictionIntervals');
+    if (showPredictionIntervals) {
+        showPredictionIntervals.checked = localStorage.getItem('showPredictionIntervals') === 'true';
+        showPredictionIntervals.addEventListener('change', () => {
+            localStorage.setItem('showPredictionIntervals', String(showPredictionIntervals.checked));
+            loadAIPredictions();
+        });
+    }
+
     // Load market data with REAL prices
     await loadLiveMarketData();
     
@@ -443,6 +453,23 @@ function calculatePortfolioValue() {
     updateUserProfileDisplay();
 }
 
+/**
+ * Returns the MAE of the shortest live accuracy window with at least minSamples scored predictions.
+ * @param {Object} windows Window name -> {count, mae, ...} from /predict/accuracy
+ * @param {number} minSamples Minimum number of scored predictions
+ * @returns {number|null}
+ */
+function getLiveMAE(windows, minSamples) {
+    if (!windows) return null;
+    for (const windowName of ['1h', '24h', '7d', '30d', 'all']) {
+        const metrics = windows[windowName];
+        if (metrics && metrics.count >= minSamples && typeof metrics.mae === 'number') {
+            return metrics.mae;
+        }
+    }
+    return null;
+}
+
 /**
  * Loads AI predictions using real API with MAE-based confidence.
  */
@@ -452,9 +479,11 @@ async function loadAIPredictions() {
 
     displayLoading(aiPredictionsList, 'Loading AI predictions...');
 
+    // Offline MAE per model, used until enough live predictions have been scored
     const modelMAE = {
         'APP': 24.175, 'PEP': 1.678, 'TSLA': 1.041, 'NVDA': 1.690, 'BKNG': 28.569, 'META': 4.389, 'PLTR': 0.935
     };
+    const MIN_LIVE_SAMPLES = 30;
 
     try {
         const predictionTickers = [
@@ -463,60 +492,71 @@ async function loadAIPredictions() {
         const predictions = [];
         const currentPrices = await loadPricesForTickers(predictionTickers);
 
+        // One batched request for every ticker instead of one /predict call per ticker
+        const showIntervals = document.getElementById('showPredictionIntervals')?.checked === true;
+        const batchResponse = await apiGet(
+            `/predict/batch?tickers=${predictionTickers.join(',')}${showIntervals ? '&interval=true' : ''}`
+        );
+        const predictedPrices = batchResponse.predictions || {};
+        // Monte-Carlo dropout interval around each prediction, when requested and the model could sample one
+        const intervals = batchResponse.intervals || {};
+        for (const [ticker, message] of Object.entries(batchResponse.errors || {})) {
+            console.error(`Error getting prediction for ${ticker}:`, message);
+        }
+
+        // Live MAE of the stored predictions against the realized closes
+        let liveAccuracy = {};
+        try {
+            const accuracyResponse = await apiGet(`/predict/accuracy?tickers=${predictionTickers.join(',')}`);
+            liveAccuracy = accuracyResponse.accuracy || {};
+        } catch (error) {
+            console.warn('Live prediction accuracy unavailable, using offline MAE:', error);
+        }
+
         for (const ticker of predictionTickers) {
             const currentPrice = currentPrices[ticker];
             if (!currentPrice) {
                 console.warn(`Skipping prediction for ${ticker}: current price not available.`);
                 continue;
             }
-            try {
-                const predictionResponse = await apiGet(`/predict?ticker=${ticker}`);
-                let predictedPrice;
-                if (typeof predictionResponse === 'number') {
-                    predictedPrice = predictionResponse;
-                } else if ('predicted_close_value' in predictionResponse) {
-                    predictedPrice = predictionResponse.predicted_close_value;
-                } else if ('price' in predictionResponse) {
-                    predictedPrice = predictionResponse.price;
-                } else {
-                    console.warn(`Prediction for ${ticker} is not a number. Skipping.`);
-                    continue;
-                }
-
-                const mae = modelMAE[ticker] || 5.0;
-                const priceChange = predictedPrice - currentPrice;
-                const percentChange = (priceChange / currentPrice) * 100;
-                const direction = priceChange >= 0 ? 'Up' : 'Down';
-                const maePercentage = (mae / currentPrice) * 100;
-                let confidence;
-                if (maePercentage <= 2) {
-                    confidence = 'Very High';
-                } else if (maePercentage <= 4) {
-                    confidence = 'High';
-                } else if (maePercentage <= 8) {
-                    confidence = 'Medium';
-                } else if (maePercentage <= 15) {
-                    confidence = 'Low';
-                } else {
-                    confidence = 'Very Low';
-                }
+            const predictedPrice = predictedPrices[ticker];
+            if (typeof predictedPrice !== 'number') {
+                console.warn(`Prediction for ${ticker} is not a number. Skipping.`);
+                continue;
+            }
 
-                predictions.push({
-                    symbol: ticker,
-                    company: getCompanyName(ticker),
-                    direction: direction,
-                    confidence: confidence,
-                    timeframe: '1 week',
-                    predictedPrice: predictedPrice,
-                    currentPrice: currentPrice,
-                    priceChange: priceChange,
-                    percentChange: percentChange,
-                    mae: mae,
-                    maePercentage: maePercentage
-                });
-            } catch (error) {
-                console.error(`Error getting prediction for ${ticker}:`, error);
+            const mae = getLiveMAE(liveAccuracy[ticker], MIN_LIVE_SAMPLES) ?? modelMAE[ticker] ?? 5.0;
+            const priceChange = predictedPrice - currentPrice;
+            const percentChange = (priceChange / currentPrice) * 100;
+            const direction = priceChange >= 0 ? 'Up' : 'Down';
+            const maePercentage = (mae / currentPrice) * 100;
+            let confidence;
+            if (maePercentage <= 2) {
+                confidence = 'Very High';
+            } else if (maePercentage <= 4) {
+                confidence = 'High';
+            } else if (maePercentage <= 8) {
+                confidence = 'Medium';
+            } else if (maePercentage <= 15) {
+                confidence = 'Low';
+            } else {
+                confidence = 'Very Low';
             }
+
+            predictions.push({
+                symbol: ticker,
+                company: getCompanyName(ticker),
+                direction: direction,
+                confidence: confidence,
+                timeframe: '1 week',
+                predictedPrice: predictedPrice,
+                currentPrice: currentPrice,
+                priceChange: priceChange,
+                percentChange: percentChange,
+                mae: mae,
+                maePercentage: maePercentage,
+                interval: intervals[ticker] || null
+            });
         }
 
         predictions.sort((a, b) => {
@@ -589,7 +629,7 @@ async function loadAIPredictions() {
                         Real: $${item.currentPrice.toFixed(2)} | Δ: ${changeSign}$${Math.abs(item.priceChange).toFixed(2)}
                     </div>
                     <div style="font-size:0.9em; color:#6b7280;">
-                        MAE: ${item.mae.toFixed(2)} (${item.maePercentage.toFixed(2)}%)
+                        MAE: ${item.mae.toFixed(2)} (${item.maePercentage.toFixed(2)}%)${item.interval ? ` | ${Math.round(item.interval.confidence * 100)}% range: $${item.interval.lower.toFixed(2)} – $${item.interval.upper.toFixed(2)}` : ''}
                     </div>
                 </div>
                 <span style="padding: 6px 16px; border-radius: 999px; font-size:0.95em; font-weight:600; ${confidenceColors[item.confidence] || ''}"
@@ -0,0 +1,194 @@
+# app/utils/artifact_bundle.py
+
+import json
+import os
+import shutil
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, List
+
+import numpy as np
+
+from src.config import (
+    MODEL_TYPE1_CONFIG, MODEL_TYPE2_CONFIG,
+    COMPANIES_TYPE1, COMPANIES_TYPE2,
+    BUNDLE_DIR
+)
+from src.utils.numpy_inference import NumpyModel, read_keras_archive
+
+# --- Per-company artifact bundles ---
+# A bundle is a directory `<BUNDLE_DIR>/<TICKER>/` holding one `.npy` file per array (scaler
+# scale/min, PCA components/mean, every model weight) and a `manifest.json` with the feature
+# order and the Keras layer configs. Arrays are opened with np.load(mmap_mode='r'): loading a
+# bundle is an mmap per file, no sklearn unpickling and no TensorFlow, and forked workers share
+# the pages. (.npz archives cannot be memory-mapped, hence the directory of .npy files.)
+
+BUNDLE_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+
+def bundle_dir_for(company: str, bundle_dir: str = None) -> str:
+    return os.path.join(bundle_dir or BUNDLE_DIR, company)
+
+
+def manifest_path(company: str, bundle_dir: str = None) -> str:
+    """The bundle file watched for hot reload (written last by build_bundle)."""
+    return os.path.join(bundle_dir_for(company, bundle_dir), MANIFEST_FILE)
+
+
+def _model_config(company: str) -> dict:
+    if company in COMPANIES_TYPE1:
+        return MODEL_TYPE1_CONFIG
+    if company in COMPANIES_TYPE2:
+        return MODEL_TYPE2_CONFIG
+    raise ValueError(f"Company '{company}' is not configured for prediction.")
+
+
+class ArtifactBundle:
+    """An opened bundle: memory-mapped arrays plus the manifest."""
+    def __init__(self, company: str, manifest: dict, arrays: Dict[str, np.ndarray]):
+        self.company = company
+        self.manifest = manifest
+        self.arrays = arrays
+
+    @classmethod
+    def open(cls, company: str, bundle_dir: str = None) -> "ArtifactBundle":
+        path = bundle_dir_for(company, bundle_dir)
+        manifest_file = os.path.join(path, MANIFEST_FILE)
+        if not os.path.exists(manifest_file):
+            raise FileNotFoundError(f"Artifact bundle not found for company '{company}' at {path}. "
+                                    f"Build it with `flask build-artifact-bundles`.")
+        with open(manifest_file) as f:
+            manifest = json.load(f)
+
+        if manifest.get("format_version") != BUNDLE_FORMAT_VERSION:
+            raise ValueError(f"Artifact bundle for {company} has format version {manifest.get('format_version')}, "
+                             f"expected {BUNDLE_FORMAT_VERSION}. Rebuild it.")
+        if manifest["features"] != _model_config(company)["FEATURES"]:
+            raise ValueError(f"Artifact bundle for {company} was built for features {manifest['features']}, "
+                             f"which do not match the configured FEATURES. Rebuild it.")
+
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r') for name in manifest["arrays"]}
+        return cls(company, manifest, arrays)
+
+    @property
+    def scaler(self) -> SimpleNamespace:
+        """The fitted MinMaxScaler attributes the preprocessors use (scale_, min_)."""
+        return SimpleNamespace(scale_=self.arrays["scaler_scale"], min_=self.arrays["scaler_min"], clip=False)
+
+    @property
+    def pca(self) -> SimpleNamespace:
+        """The fitted PCA attributes (components_, mean_, whitening), or None for Type 1 bundles."""
+        if self.manifest["pca"] is None:
+            return None
+        return SimpleNamespace(
+            components_=self.arrays["pca_components"],
+            mean_=self.arrays["pca_mean"],
+            whiten=self.manifest["pca"]["whiten"],
+            explained_variance_=self.arrays.get("pca_explained_variance")
+        )
+
+    def load_model(self) -> NumpyModel:
+        """A NumpyModel whose weights are the memory-mapped arrays of the bundle."""
+        weights = {
+            name: [self.arrays[f"weights.{name}.{i}"] for i in range(count)]
+            for name, count in self.manifest["weights"].items()
+        }
+        return NumpyModel.from_config(self.manifest["layers"], weights)
+
+
+def _fitted(obj, attribute: str, company: str, what: str) -> np.ndarray:
+    value = getattr(obj, attribute, None)
+    if not isinstance(value, np.ndarray):
+        raise ValueError(f"The {what} of {company} has no fitted '{attribute}' and cannot be bundled.")
+    return value
+
+
+def build_bundle(company: str, bundle_dir: str = None) -> str:
+    """
+    Converts the legacy artifacts of one company (.keras model, joblib scaler and PCA) from the
+    saved_artifacts tree into a bundle and returns its directory.
+
+    The bundle is written to a temporary directory and moved into place at the end, so serving
+    processes never open a half-written bundle; already mapped files of the previous version
+    stay valid until those processes reload.
+    """
+    import joblib
+
+    company = company.upper()
+    model_config = _model_config(company)
+    is_type2 = company in COMPANIES_TYPE2
+
+    model_path = os.path.join(model_config["MODEL_DIR"], f"{company}_model.keras")
+    scaler_path = os.path.join(model_config["SCALER_DIR"], f"{company}_scaler.pkl")
+    pca_path = os.path.join(model_config["PCA_DIR"], f"{company}_pca.pkl") if is_type2 else None
+    for path in filter(None, (model_path, scaler_path, pca_path)):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Artifact not found for company '{company}' at {path}")
+
+    arrays: Dict[str, np.ndarray] = {}
+    scaler = joblib.load(scaler_path)
+    if getattr(scaler, 'clip', False):
+        raise ValueError(f"The scaler of {company} clips its output, which bundles do not support.")
+    arrays["scaler_scale"] = _fitted(scaler, 'scale_', company, "scaler")
+    arrays["scaler_min"] = _fitted(scaler, 'min_', company, "scaler")
+
+    pca_manifest = None
+    if is_type2:
+        pca = joblib.load(pca_path)
+        arrays["pca_components"] = _fitted(pca, 'components_', company, "PCA")
+        arrays["pca_mean"] = _fitted(pca, 'mean_', company, "PCA")
+        whiten = bool(getattr(pca, 'whiten', False))
+        if whiten:
+            arrays["pca_explained_variance"] = _fitted(pca, 'explained_variance_', company, "PCA")
+        pca_manifest = {"whiten": whiten}
+
+    layer_configs, weights = read_keras_archive(model_path)
+    NumpyModel.from_config(layer_configs, weights) # Fails early on layers the NumPy backend cannot replay
+    for name, values in weights.items():
+        for i, value in enumerate(values):
+            arrays[f"weights.{name}.{i}"] = value
+
+    manifest = {
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "company": company,
+        "model_type": 2 if is_type2 else 1,
+        "features": list(model_config["FEATURES"]),
+        "seq_length": model_config["SEQ_LENGTH"],
+        "layers": layer_configs,
+        "weights": {name: len(values) for name, values in weights.items()},
+        "pca": pca_manifest,
+        "arrays": sorted(arrays),
+        "sources": [p for p in (model_path, scaler_path, pca_path) if p],
+        "created_at": datetime.utcnow().isoformat(),
+    }
+
+    target = bundle_dir_for(company, bundle_dir)
+    staging = f"{target}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    for name, value in arrays.items():
+        np.save(os.path.join(staging, f"{name}.npy"), np.ascontiguousarray(value))
+    with open(os.path.join(staging, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    previous = f"{target}.old"
+    shutil.rmtree(previous, ignore_errors=True)
+    if os.path.exists(target):
+        os.rename(target, previous)
+    os.rename(staging, target)
+    shutil.rmtree(previous, ignore_errors=True)
+    return target
+
+
+def build_bundles(companies: List[str] = None, bundle_dir: str = None) -> Dict[str, dict]:
+    """Builds the bundle of every company. Returns {"built": ticker -> directory, "errors": ticker -> message}."""
+    if companies is None:
+        companies = list(COMPANIES_TYPE1) + list(COMPANIES_TYPE2)
+    result = {"built": {}, "errors": {}}
+    for company in companies:
+        try:
+            result["built"][company.upper()] = build_bundle(company, bundle_dir)
+        except (FileNotFoundError, ValueError) as e:
+            result["errors"][company.upper()] = str(e)
+    return result
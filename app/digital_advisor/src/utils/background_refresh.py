@@ -0,0 +1,65 @@
+# app/utils/background_refresh.py
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundRefresher:
+    """
+    Runs stale-while-revalidate refreshes off the request path.
+
+    Each refresh runs inside an app context of the given Flask app (so it has its own DB
+    session) and is de-duplicated by key: while a refresh for a key is queued or running,
+    further submissions for the same key are ignored.
+    """
+    def __init__(self, max_workers: int = 2):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="swr-refresh")
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def submit(self, app, key: Hashable, fn: Callable[[], object]) -> bool:
+        """Schedules fn() for key. Returns False if a refresh for key is already pending."""
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+        try:
+            self._executor.submit(self._run, app, key, fn)
+        except RuntimeError:
+            # Executor shut down (interpreter exit)
+            with self._lock:
+                self._pending.discard(key)
+            return False
+        return True
+
+    def _run(self, app, key: Hashable, fn: Callable[[], object]) -> None:
+        try:
+            with app.app_context():
+                fn()
+        except Exception as e:
+            logger.error(f"Background refresh for {key} failed: {e}", exc_info=True)
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def pending(self) -> set:
+        with self._lock:
+            return set(self._pending)
+
+
+_refresher_instance = None
+_refresher_lock = threading.Lock()
+
+
+def get_background_refresher(max_workers: int = 2) -> BackgroundRefresher:
+    """Returns the process-wide refresher, creating it on first call."""
+    global _refresher_instance
+    if _refresher_instance is None:
+        with _refresher_lock:
+            if _refresher_instance is None:
+                _refresher_instance = BackgroundRefresher(max_workers=max_workers)
+    return _refresher_instance
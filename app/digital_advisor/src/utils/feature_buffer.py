@@ -0,0 +1,155 @@
+# app/utils/feature_buffer.py
+
+import math
+import threading
+import numpy as np
+from datetime import datetime
+from typing import Dict, List, Sequence
+
+# Raw cleaned_dataset columns the model features are derived from (in query order).
+RAW_FEATURE_COLUMNS = [
+    'close_value', 'volume',
+    'gdp_growth', 'consumer_price_index_for_all_urban_consumers',
+    'retail_sales_data_excluding_food_services', 'crude_oil_price',
+    'interest_rate_fed_funds', 'stock_market_volatility_vix_index',
+    'ten_year_treasury_yield'
+]
+
+# Derived indicators maintained incrementally by the buffer.
+MA_SHORT_WINDOW = 10
+MA_LONG_WINDOW = 30
+VOLATILITY_WINDOW = 10
+
+# Running sums are recomputed exactly from the stored closes every N appends to stop float drift.
+RESYNC_SUMS_EVERY = 1024
+
+
+class RollingFeatureBuffer:
+    """
+    Per-ticker ring buffer holding the last `seq_length` feature rows (in model FEATURES order).
+
+    ma10, ma30 and volatility (10-bar rolling std, ddof=1, like pandas) are updated in O(1)
+    per appended bar from running sums / sums of squares over a small ring of recent closes,
+    so a new minute row never triggers a recomputation of the whole window.
+
+    Rows are written twice into a (2 * seq_length, n_features) array, which keeps the most
+    recent `seq_length` rows contiguous: `window()` is a zero-copy view in chronological order.
+    """
+    def __init__(self, features: List[str], seq_length: int):
+        self.features = list(features)
+        self.seq_length = seq_length
+        self._feature_positions = {name: i for i, name in enumerate(self.features)}
+
+        self._rows = np.full((2 * seq_length, len(self.features)), np.nan)
+        self._pos = 0
+        self.count = 0
+        self.last_timestamp: datetime = None
+
+        self._close_history_len = max(MA_SHORT_WINDOW, MA_LONG_WINDOW, VOLATILITY_WINDOW)
+        self._closes = np.zeros(self._close_history_len)
+        self._short_sum = 0.0
+        self._long_sum = 0.0
+        self._vol_sum = 0.0
+        self._vol_sum_sq = 0.0
+
+        # Guards appends/reads when several request threads sync the same ticker
+        self.lock = threading.RLock()
+
+    def reset(self) -> None:
+        """Drops every stored bar (used before a full resync from the database)."""
+        self._rows.fill(np.nan)
+        self._closes.fill(0.0)
+        self._pos = 0
+        self.count = 0
+        self.last_timestamp = None
+        self._short_sum = self._long_sum = self._vol_sum = self._vol_sum_sq = 0.0
+
+    def _close_ago(self, n: int) -> float:
+        """Close value appended `n` bars ago (n=0 is the latest)."""
+        return self._closes[(self.count - 1 - n) % self._close_history_len]
+
+    def _recompute_sums(self) -> None:
+        available = min(self.count, self._close_history_len)
+        recent = np.array([self._close_ago(n) for n in range(available)])
+        self._short_sum = recent[:MA_SHORT_WINDOW].sum()
+        self._long_sum = recent[:MA_LONG_WINDOW].sum()
+        self._vol_sum = recent[:VOLATILITY_WINDOW].sum()
+        self._vol_sum_sq = (recent[:VOLATILITY_WINDOW] ** 2).sum()
+
+    def append(self, timestamp: datetime, raw_values: Dict[str, float]) -> None:
+        """
+        Appends one bar. `raw_values` maps every RAW_FEATURE_COLUMNS name to its value
+        (None for missing macro values). O(1): only the running sums and one row are touched.
+        """
+        close = float(raw_values['close_value'])
+
+        # Values leaving each rolling window once the new close is added
+        leaving_short = self._close_ago(MA_SHORT_WINDOW - 1) if self.count >= MA_SHORT_WINDOW else 0.0
+        leaving_long = self._close_ago(MA_LONG_WINDOW - 1) if self.count >= MA_LONG_WINDOW else 0.0
+        leaving_vol = self._close_ago(VOLATILITY_WINDOW - 1) if self.count >= VOLATILITY_WINDOW else 0.0
+
+        self._closes[self.count % self._close_history_len] = close
+        self.count += 1
+        if self.count % RESYNC_SUMS_EVERY == 0:
+            self._recompute_sums()
+        else:
+            self._short_sum += close - leaving_short
+            self._long_sum += close - leaving_long
+            self._vol_sum += close - leaving_vol
+            self._vol_sum_sq += close * close - leaving_vol * leaving_vol
+
+        row = np.full(len(self.features), np.nan)
+        for name, value in raw_values.items():
+            position = self._feature_positions.get(name)
+            if position is not None and value is not None:
+                row[position] = float(value)
+        self._set_indicator(row, 'ma10', self._short_sum / MA_SHORT_WINDOW if self.count >= MA_SHORT_WINDOW else np.nan)
+        self._set_indicator(row, 'ma30', self._long_sum / MA_LONG_WINDOW if self.count >= MA_LONG_WINDOW else np.nan)
+        if self.count >= VOLATILITY_WINDOW:
+            n = VOLATILITY_WINDOW
+            variance = max((self._vol_sum_sq - self._vol_sum * self._vol_sum / n) / (n - 1), 0.0)
+            self._set_indicator(row, 'volatility', math.sqrt(variance))
+
+        self._rows[self._pos] = row
+        self._rows[self._pos + self.seq_length] = row
+        self._pos = (self._pos + 1) % self.seq_length
+        self.last_timestamp = timestamp
+
+    def _set_indicator(self, row: np.ndarray, name: str, value: float) -> None:
+        position = self._feature_positions.get(name)
+        if position is not None:
+            row[position] = value
+
+    def extend(self, rows: Sequence) -> None:
+        """Appends rows (objects with date_value + RAW_FEATURE_COLUMNS attributes), oldest first."""
+        for row in rows:
+            self.append(row.date_value, {name: getattr(row, name) for name in RAW_FEATURE_COLUMNS})
+
+    def append_synthetic(self, timestamp: datetime, close_value: float) -> None:
+        """
+        Appends a forecast bar for autoregressive rollouts: the predicted close replaces the
+        close, every other raw column (volume, macro data) is carried forward from the last bar.
+        """
+        last_row = self._rows[self._pos + self.seq_length - 1]
+        raw_values = {name: last_row[self._feature_positions[name]]
+                      for name in RAW_FEATURE_COLUMNS if name in self._feature_positions}
+        raw_values['close_value'] = close_value
+        self.append(timestamp, raw_values)
+
+    def window(self) -> np.ndarray:
+        """Zero-copy (seq_length, n_features) view of the latest rows, oldest first."""
+        return self._rows[self._pos:self._pos + self.seq_length]
+
+    def is_ready(self) -> bool:
+        """True when the window is full and every feature (including ma30) is defined."""
+        return self.count >= self.seq_length and not np.isnan(self.window()).any()
+
+    def copy(self) -> "RollingFeatureBuffer":
+        """Independent copy (e.g. for synthetic what-if rollouts that must not touch the live buffer)."""
+        clone = RollingFeatureBuffer(self.features, self.seq_length)
+        clone._rows = self._rows.copy()
+        clone._closes = self._closes.copy()
+        clone._pos, clone.count, clone.last_timestamp = self._pos, self.count, self.last_timestamp
+        clone._short_sum, clone._long_sum = self._short_sum, self._long_sum
+        clone._vol_sum, clone._vol_sum_sq = self._vol_sum, self._vol_sum_sq
+        return clone
@@ -0,0 +1,144 @@
+# app/utils/indicators.py
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict
+
+# --- Vectorized technical indicators ---
+# Every function takes either a single series of shape (time,) or a batch of shape
+# (tickers, time) and works along the last axis, returning an array of the same shape.
+# Positions without a full window are NaN, mirroring pandas' rolling()/ewm() defaults,
+# so serving, backtests and offline jobs all derive identical features without pandas.
+
+
+def _as_float_array(values) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim not in (1, 2):
+        raise ValueError(f"Expected a (time,) or (tickers, time) array, got shape {values.shape}.")
+    return values
+
+
+def _check_window(window: int) -> None:
+    if window < 1:
+        raise ValueError(f"Window must be a positive integer, got {window}.")
+
+
+def sma(values, window: int) -> np.ndarray:
+    """
+    Simple moving average from cumulative sums (O(n) regardless of the window).
+    A window containing a NaN yields NaN, like pandas' rolling(window).mean().
+    """
+    _check_window(window)
+    values = _as_float_array(values)
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] < window:
+        return out
+
+    missing = np.isnan(values)
+    pad = np.zeros(values.shape[:-1] + (1,))
+    sums = np.concatenate([pad, np.cumsum(np.where(missing, 0.0, values), axis=-1)], axis=-1)
+    nan_counts = np.concatenate([pad, np.cumsum(missing, axis=-1)], axis=-1)
+
+    window_sums = sums[..., window:] - sums[..., :-window]
+    window_nans = nan_counts[..., window:] - nan_counts[..., :-window]
+    out[..., window - 1:] = np.where(window_nans > 0, np.nan, window_sums / window)
+    return out
+
+
+def rolling_std(values, window: int, ddof: int = 1) -> np.ndarray:
+    """
+    Rolling standard deviation over a strided window view (no copies of the input).
+    ddof=1 matches pandas' rolling(window).std(); ddof=0 matches np.std.
+    """
+    _check_window(window)
+    values = _as_float_array(values)
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] < window or window - ddof <= 0:
+        return out
+    windows = sliding_window_view(values, window, axis=-1)
+    out[..., window - 1:] = windows.std(axis=-1, ddof=ddof)
+    return out
+
+
+def ema(values, span: int = None, alpha: float = None) -> np.ndarray:
+    """
+    Exponential moving average, y[0] = x[0], y[t] = (1 - alpha) * y[t-1] + alpha * x[t]
+    (pandas' ewm(adjust=False)). Pass either `span` (alpha = 2 / (span + 1)) or `alpha`.
+    The recursion runs over time once, vectorized across tickers.
+    """
+    if (span is None) == (alpha is None):
+        raise ValueError("Pass exactly one of 'span' or 'alpha'.")
+    if alpha is None:
+        _check_window(span)
+        alpha = 2.0 / (span + 1.0)
+    if not 0.0 < alpha <= 1.0:
+        raise ValueError(f"alpha must be in (0, 1], got {alpha}.")
+
+    values = _as_float_array(values)
+    out = np.empty(values.shape)
+    if values.shape[-1] == 0:
+        return out
+    out[..., 0] = values[..., 0]
+    for t in range(1, values.shape[-1]):
+        out[..., t] = (1.0 - alpha) * out[..., t - 1] + alpha * values[..., t]
+    return out
+
+
+def log_returns(values) -> np.ndarray:
+    """log(x[t] / x[t-1]); the first position is NaN."""
+    values = _as_float_array(values)
+    out = np.full(values.shape, np.nan)
+    out[..., 1:] = np.diff(np.log(values), axis=-1)
+    return out
+
+
+def log_return_volatility(values, window: int, ddof: int = 1) -> np.ndarray:
+    """Rolling standard deviation of log returns (NaN until `window` returns are available)."""
+    return rolling_std(log_returns(values), window, ddof=ddof)
+
+
+def rsi(values, window: int = 14) -> np.ndarray:
+    """
+    Relative Strength Index with Wilder's smoothing: the average gain/loss is seeded with
+    the mean of the first `window` price changes, then updated with alpha = 1 / window.
+    The first `window` positions are NaN.
+    """
+    _check_window(window)
+    values = _as_float_array(values)
+    out = np.full(values.shape, np.nan)
+    n = values.shape[-1]
+    if n <= window:
+        return out
+
+    deltas = np.diff(values, axis=-1)
+    gains = np.clip(deltas, 0.0, None)
+    losses = np.clip(-deltas, 0.0, None)
+
+    avg_gain = np.empty(deltas.shape)
+    avg_loss = np.empty(deltas.shape)
+    avg_gain[..., window - 1] = gains[..., :window].mean(axis=-1)
+    avg_loss[..., window - 1] = losses[..., :window].mean(axis=-1)
+    for t in range(window, n - 1):
+        avg_gain[..., t] = (avg_gain[..., t - 1] * (window - 1) + gains[..., t]) / window
+        avg_loss[..., t] = (avg_loss[..., t - 1] * (window - 1) + losses[..., t]) / window
+
+    avg_gain, avg_loss = avg_gain[..., window - 1:], avg_loss[..., window - 1:]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        values_rsi = 100.0 - 100.0 / (1.0 + rs)
+    # No losses in the window: RSI is 100 (or 50 for a completely flat series)
+    values_rsi = np.where(avg_loss == 0.0, np.where(avg_gain == 0.0, 50.0, 100.0), values_rsi)
+    out[..., window:] = values_rsi
+    return out
+
+
+# --- Model features ---
+# Derived columns the LSTM models were trained on, computed from close_value.
+def derived_model_features(close_values) -> Dict[str, np.ndarray]:
+    """Returns ma10, ma30, volatility (10-bar std, ddof=1) and log_returns for a close series or batch."""
+    return {
+        'ma10': sma(close_values, 10),
+        'ma30': sma(close_values, 30),
+        'volatility': rolling_std(close_values, 10),
+        'log_returns': log_returns(close_values),
+    }
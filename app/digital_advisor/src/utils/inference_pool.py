@@ -0,0 +1,267 @@
+# app/utils/inference_pool.py
+
+import atexit
+import itertools
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# --- Inference server mode ---
+# A fixed pool of worker processes owns the models. Request threads copy their raw feature
+# window into a slot of a shared-memory input block, send only (request id, slot, company,
+# shape) through a queue and wait for the worker to write the predicted price into the same
+# slot of the shared-memory output block. Model forward passes therefore never hold the GIL
+# of the web process, and model memory scales with the pool size, not with request threads.
+# Load tasks (slot None) make a worker load a company's artifacts without predicting.
+
+# Errors that keep their type across the process boundary (the routes map them to 4xx/5xx)
+_ERROR_TYPES = {cls.__name__: cls for cls in (FileNotFoundError, ValueError, RuntimeError)}
+
+# How often the result listener checks for dead workers, also while results keep arriving
+_LIVENESS_CHECK_SECONDS = 1.0
+
+
+def _worker_main(input_name: str, output_name: str, input_shape: Tuple[int, int, int],
+                 tasks, results, backend: str) -> None:
+    """Worker process loop: loads models through its own Predictor and serves slots and load tasks."""
+    from src.services.prediction_service import Predictor  # Imported in the child only
+
+    input_shm = shared_memory.SharedMemory(name=input_name)
+    output_shm = shared_memory.SharedMemory(name=output_name)
+    inputs = np.ndarray(input_shape, dtype=np.float64, buffer=input_shm.buf)
+    outputs = np.ndarray((input_shape[0],), dtype=np.float64, buffer=output_shm.buf)
+    predictor = Predictor(backend=backend, use_inference_pool=False)
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            request_id, slot, company, rows, cols = task
+            try:
+                if slot is None:
+                    predictor.load_artifacts(company)
+                else:
+                    outputs[slot] = predictor.predict_window(company, inputs[slot, :rows, :cols])
+                results.put((request_id, slot, None))
+            except Exception as e:
+                results.put((request_id, slot, (type(e).__name__, str(e))))
+    finally:
+        del inputs, outputs
+        input_shm.close()
+        output_shm.close()
+
+
+class InferencePool:
+    """
+    Process pool serving Predictor.predict_window over shared-memory slots.
+
+    `slots` bounds the number of in-flight requests: callers block (backpressure) while
+    every slot is busy. Every worker has its own task queue and a request goes to the worker
+    with the fewest requests in flight, so the pool knows which requests a worker holds.
+    Workers are started on first use; a worker that dies is restarted and the requests it
+    held fail right away (their slots are handed back) instead of running into the timeout.
+    Companies warmed up through load() are loaded again by a restarted worker.
+    """
+    def __init__(self, num_workers: int, seq_length: int, num_features: int, slots: int = 16,
+                 backend: str = None, timeout_seconds: float = 30.0):
+        self.num_workers = num_workers
+        self.seq_length = seq_length
+        self.num_features = num_features
+        self.slots = slots
+        self.backend = backend
+        self.timeout_seconds = timeout_seconds
+
+        self._started = False
+        self._start_lock = threading.Lock()
+        # request id -> (future, slot, worker index); the worker's request ids in _assigned
+        self._pending: Dict[int, Tuple[Future, Optional[int], int]] = {}
+        self._assigned: Dict[int, Set[int]] = {}
+        self._pending_lock = threading.Lock()
+        self._request_ids = itertools.count()
+        self._free_slots: "queue.Queue[int]" = queue.Queue()
+        self._processes = []
+        self._task_queues = []
+        self._loaded_companies: Set[str] = set()
+
+    # --- Lifecycle ---
+    def start(self) -> None:
+        with self._start_lock:
+            if self._started:
+                return
+            # spawn: forking a process that already initialised TensorFlow threads can deadlock
+            self._context = multiprocessing.get_context("spawn")
+            input_shape = (self.slots, self.seq_length, self.num_features)
+            self._input_shm = shared_memory.SharedMemory(create=True, size=int(np.prod(input_shape)) * 8)
+            self._output_shm = shared_memory.SharedMemory(create=True, size=self.slots * 8)
+            self._inputs = np.ndarray(input_shape, dtype=np.float64, buffer=self._input_shm.buf)
+            self._outputs = np.ndarray((self.slots,), dtype=np.float64, buffer=self._output_shm.buf)
+            self._results = self._context.Queue()
+            for slot in range(self.slots):
+                self._free_slots.put(slot)
+            self._task_queues = [self._context.Queue() for _ in range(self.num_workers)]
+            self._assigned = {i: set() for i in range(self.num_workers)}
+            self._processes = [self._spawn_worker(i) for i in range(self.num_workers)]
+
+            self._stopping = threading.Event()
+            self._listener = threading.Thread(target=self._listen, name="inference-pool-results", daemon=True)
+            self._listener.start()
+            self._started = True
+            atexit.register(self.shutdown)
+            logger.info(f"Inference pool started with {self.num_workers} workers and {self.slots} slots.")
+
+    def _spawn_worker(self, index: int):
+        process = self._context.Process(
+            target=_worker_main,
+            args=(self._input_shm.name, self._output_shm.name,
+                  (self.slots, self.seq_length, self.num_features), self._task_queues[index], self._results,
+                  self.backend),
+            name=f"inference-worker-{index}",
+            daemon=True
+        )
+        process.start()
+        return process
+
+    def shutdown(self) -> None:
+        with self._start_lock:
+            if not self._started:
+                return
+            self._started = False
+            self._stopping.set()
+            for task_queue in self._task_queues:
+                task_queue.put(None)
+            for process in self._processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+            self._listener.join(timeout=2)
+            with self._pending_lock:
+                for future, _, _ in self._pending.values():
+                    future.set_exception(RuntimeError("Inference pool shut down."))
+                self._pending.clear()
+                for request_ids in self._assigned.values():
+                    request_ids.clear()
+            del self._inputs, self._outputs
+            for shm in (self._input_shm, self._output_shm):
+                shm.close()
+                shm.unlink()
+
+    # --- Requests ---
+    def predict(self, company: str, window: np.ndarray) -> float:
+        """Predicts the next close from a raw (SEQ_LENGTH, num_features) window in a worker process."""
+        future = self.submit(company, window)
+        try:
+            return future.result(timeout=self.timeout_seconds)
+        except TimeoutError:
+            raise RuntimeError(f"Inference pool did not answer for {company} within {self.timeout_seconds}s.")
+
+    def submit(self, company: str, window: np.ndarray) -> Future:
+        """Queues a window and returns a Future of the predicted close (blocks while every slot is busy)."""
+        window = np.asarray(window, dtype=np.float64)
+        rows, cols = window.shape
+        if rows > self.seq_length or cols > self.num_features:
+            raise ValueError(f"Window shape {window.shape} exceeds the inference pool slot shape "
+                             f"({self.seq_length}, {self.num_features}).")
+        self.start()
+
+        try:
+            slot = self._free_slots.get(timeout=self.timeout_seconds)
+        except queue.Empty:
+            raise RuntimeError("Inference pool is saturated: no free slot within the timeout.")
+
+        self._inputs[slot, :rows, :cols] = window
+        future, request_id, task_queue = self._register(slot)
+        task_queue.put((request_id, slot, company, rows, cols))
+        return future
+
+    def load(self, company: str) -> list:
+        """
+        Has every worker load `company`'s artifacts; returns one Future per worker that completes
+        once that worker holds them (or fails with the load error).
+        """
+        self.start()
+        with self._pending_lock:
+            self._loaded_companies.add(company)
+        return [self._send_load(company, worker) for worker in range(self.num_workers)]
+
+    def _send_load(self, company: str, worker: int) -> Future:
+        future, request_id, task_queue = self._register(None, worker)
+        task_queue.put((request_id, None, company, 0, 0))
+        return future
+
+    def _register(self, slot: Optional[int], worker: int = None) -> Tuple[Future, int, "multiprocessing.Queue"]:
+        """Records a new request on `worker` (default: the least busy one); returns its future, id and queue."""
+        future = Future()
+        request_id = next(self._request_ids)
+        with self._pending_lock:
+            if worker is None:
+                worker = min(self._assigned, key=lambda i: len(self._assigned[i]))
+            self._pending[request_id] = (future, slot, worker)
+            self._assigned[worker].add(request_id)
+            return future, request_id, self._task_queues[worker]
+
+    def _complete(self, request_id: int) -> Optional[Tuple[Future, Optional[int]]]:
+        """Forgets a request; returns (future, slot) unless it was already failed (e.g. its worker died)."""
+        with self._pending_lock:
+            entry = self._pending.pop(request_id, None)
+            if entry is None:
+                return None
+            future, slot, worker = entry
+            self._assigned[worker].discard(request_id)
+            return future, slot
+
+    def _listen(self) -> None:
+        """Completes futures from worker results and hands slots back; restarts dead workers."""
+        next_liveness_check = time.monotonic() + _LIVENESS_CHECK_SECONDS
+        while not self._stopping.is_set():
+            if time.monotonic() >= next_liveness_check:
+                self._restart_dead_workers()
+                next_liveness_check = time.monotonic() + _LIVENESS_CHECK_SECONDS
+            try:
+                request_id, slot, error = self._results.get(timeout=_LIVENESS_CHECK_SECONDS)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+            completed = self._complete(request_id)
+            if completed is None:
+                continue  # Already failed when its worker died; the slot was handed back then
+            future, _ = completed
+            # Read the output before the slot can be reused by another request
+            value = float(self._outputs[slot]) if slot is not None else None
+            if slot is not None:
+                self._free_slots.put(slot)
+            if error is None:
+                future.set_result(value)
+            else:
+                error_type, message = error
+                future.set_exception(_ERROR_TYPES.get(error_type, RuntimeError)(message))
+
+    def _restart_dead_workers(self) -> None:
+        for i, process in enumerate(self._processes):
+            if process.is_alive() or self._stopping.is_set():
+                continue
+            logger.error(f"Inference worker {process.name} exited with code {process.exitcode}. Restarting it.")
+            with self._pending_lock:
+                # The dead worker's queue may still hold tasks nobody will read: give it a fresh one
+                self._task_queues[i].cancel_join_thread()
+                self._task_queues[i] = self._context.Queue()
+                lost = [(request_id, self._pending.pop(request_id)) for request_id in self._assigned[i]]
+                self._assigned[i] = set()
+                warm_companies = sorted(self._loaded_companies)
+            for request_id, (future, slot, _) in lost:
+                if slot is not None:
+                    self._free_slots.put(slot)
+                future.set_exception(RuntimeError(
+                    f"Inference worker {process.name} exited (code {process.exitcode}) before answering."))
+            self._processes[i] = self._spawn_worker(i)
+            for company in warm_companies:
+                self._send_load(company, i)
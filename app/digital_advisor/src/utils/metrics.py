@@ -0,0 +1,65 @@
+# app/utils/metrics.py
+
+import bisect
+import threading
+from typing import Dict, Sequence
+
+DEFAULT_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+class Histogram:
+    """
+    Thread-safe fixed-bucket histogram (Prometheus style: each bucket counts the observations
+    <= its upper bound, plus an implicit +Inf bucket).
+    """
+    def __init__(self, name: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            cumulative, buckets = 0, {}
+            for bound, count in zip(list(self.buckets) + ["+Inf"], self._counts):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            return {
+                "count": self._count,
+                "sum": self._sum,
+                "mean": self._sum / self._count if self._count else None,
+                "buckets": buckets,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self._sum = 0.0
+            self._count = 0
+
+
+_histograms: Dict[str, Histogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def get_histogram(name: str, buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    """Returns the process-wide histogram registered under name, creating it on first use."""
+    with _histograms_lock:
+        if name not in _histograms:
+            _histograms[name] = Histogram(name, buckets)
+        return _histograms[name]
+
+
+def metrics_snapshot() -> Dict[str, dict]:
+    with _histograms_lock:
+        histograms = list(_histograms.values())
+    return {histogram.name: histogram.snapshot() for histogram in histograms}
@@ -0,0 +1,85 @@
+# app/utils/micro_batcher.py
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, List, Tuple
+
+from src.utils.metrics import get_histogram
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Merges concurrent single-item requests into batched calls.
+
+    Callers block in submit(key, item). Every key has its own queue and dispatcher thread
+    (started on the key's first request): it takes the first queued request, keeps collecting
+    for up to `max_wait_ms` or until `max_batch_size` requests are queued and calls
+    run_batch(key, items) once. Keys never wait for each other, so a slow batch (e.g. a cold
+    model load) only delays requests of its own key. The i-th result of the returned sequence
+    goes back to the caller of the i-th item; an exception from run_batch is raised in every
+    caller of that batch.
+
+    Queue depth (at submit time, per key) and batch size are recorded in the
+    "<name>.queue_depth" and "<name>.batch_size" histograms of src.utils.metrics.
+    """
+    def __init__(self, run_batch: Callable[[Hashable, List[object]], List[object]],
+                 max_batch_size: int = 32, max_wait_ms: float = 2.0, name: str = "micro_batcher"):
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0.0, max_wait_ms) / 1000.0
+        self.name = name
+        self.queue_depth = get_histogram(f"{name}.queue_depth")
+        self.batch_size = get_histogram(f"{name}.batch_size")
+
+        self._queues: Dict[Hashable, "queue.Queue[Tuple[object, Future]]"] = {}
+        self._queues_lock = threading.Lock()
+
+    def submit(self, key: Hashable, item: object) -> object:
+        """Queues item under key and blocks until its batch has run."""
+        future = Future()
+        key_queue = self._queue_for(key)
+        self.queue_depth.observe(key_queue.qsize() + 1)
+        key_queue.put((item, future))
+        return future.result()
+
+    def _queue_for(self, key: Hashable) -> "queue.Queue[Tuple[object, Future]]":
+        with self._queues_lock:
+            key_queue = self._queues.get(key)
+            if key_queue is None:
+                key_queue = self._queues[key] = queue.Queue()
+                threading.Thread(target=self._dispatch_forever, args=(key, key_queue),
+                                 name=f"{self.name}-dispatcher-{len(self._queues)}", daemon=True).start()
+            return key_queue
+
+    def _collect(self, key_queue: "queue.Queue[Tuple[object, Future]]") -> List[Tuple[object, Future]]:
+        requests = [key_queue.get()]
+        deadline = time.monotonic() + self.max_wait_seconds
+        while len(requests) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                requests.append(key_queue.get(timeout=remaining) if remaining > 0 else key_queue.get_nowait())
+            except queue.Empty:
+                break
+        return requests
+
+    def _dispatch_forever(self, key: Hashable, key_queue: "queue.Queue[Tuple[object, Future]]") -> None:
+        while True:
+            self._run_group(key, self._collect(key_queue))
+
+    def _run_group(self, key: Hashable, group: List[Tuple[object, Future]]) -> None:
+        self.batch_size.observe(len(group))
+        try:
+            results = self.run_batch(key, [item for item, _ in group])
+            if len(results) != len(group):
+                raise RuntimeError(f"Batch for {key} returned {len(results)} results for {len(group)} requests.")
+        except Exception as e:
+            for _, future in group:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(group, results):
+            future.set_result(result)
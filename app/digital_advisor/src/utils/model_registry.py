@@ -0,0 +1,224 @@
+# app/utils/model_registry.py
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry:
+    def __init__(self, value, paths: List[str], mtimes: Tuple, size_bytes: int):
+        self.value = value
+        self.paths = paths
+        self.mtimes = mtimes
+        self.size_bytes = size_bytes
+        self.checked_at = time.monotonic()
+
+
+def _artifact_mtimes(paths: List[str]) -> Tuple:
+    mtimes = []
+    for path in paths:
+        try:
+            mtimes.append(os.path.getmtime(path))
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+def _entry_size(value, paths: List[str]) -> int:
+    """In-memory size of values that report it (NumpyModel.nbytes), else the artifacts' size on disk."""
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return _artifact_size(paths)
+
+
+def _artifact_size(paths: List[str]) -> int:
+    size = 0
+    for path in paths:
+        try:
+            size += os.path.getsize(path)
+        except OSError:
+            pass
+    return size
+
+
+class ModelRegistry:
+    """
+    Thread-safe cache of loaded artifacts (models, preprocessors) keyed by ticker.
+
+    - Memory budget: entries are weighed by their `nbytes` if they report it (NumpyModel), else
+      by the on-disk size of their artifact files. The least recently used ones are evicted
+      once the total exceeds `memory_budget_bytes` (0 = unbounded). The entry being returned
+      is never evicted.
+    - Per-key load locks: concurrent misses for the same key load the artifacts once; misses
+      for different keys load in parallel.
+    - Failure cache: FileNotFoundError/RuntimeError from a loader are remembered for
+      `failure_ttl_seconds` and re-raised without touching the disk again.
+    - Hot reload: every `reload_check_seconds` (0 = never) the artifact mtimes are compared with
+      the loaded ones. A changed artifact is loaded by one request while the others keep being
+      served the current version, and the new version replaces it in a single swap.
+    """
+    def __init__(self, memory_budget_bytes: int = 0, failure_ttl_seconds: float = 30.0,
+                 reload_check_seconds: float = 0.0):
+        self.memory_budget_bytes = memory_budget_bytes
+        self.failure_ttl_seconds = failure_ttl_seconds
+        self.reload_check_seconds = reload_check_seconds
+
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._failures: Dict[Hashable, Tuple[BaseException, float]] = {}
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.reloads = 0
+        self.evictions = 0
+
+    # --- Mapping-style access (kept so `company in manager.models` still works) ---
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def keys(self) -> List[Hashable]:
+        with self._lock:
+            return list(self._entries.keys())
+
+    def peek(self, key: Hashable):
+        """Returns the loaded value for key, or None, without loading or touching the LRU order."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.value if entry is not None else None
+
+    # --- Loading ---
+    def get(self, key: Hashable, loader: Callable[[], object], paths: List[str]):
+        """
+        Returns the cached value for key, loading it with loader() on a miss.
+
+        Args:
+            key: Cache key (the ticker).
+            loader: Loads the artifacts and returns the value to cache. Called at most once
+                    at a time per key.
+            paths: Artifact files behind the value, used for the memory estimate and hot reload.
+        """
+        entry = self._get_entry(key)
+        if entry is not None:
+            if self._reload_due(entry):
+                return self._reload(key, entry, loader, paths)
+            return entry.value
+
+        self._raise_cached_failure(key)
+        with self._key_lock(key):
+            # Another thread may have loaded (or failed to load) it while we waited for the lock
+            entry = self._get_entry(key)
+            if entry is not None:
+                return entry.value
+            self._raise_cached_failure(key)
+            try:
+                value = loader()
+            except (FileNotFoundError, RuntimeError) as e:
+                with self._lock:
+                    self._failures[key] = (e, time.monotonic())
+                raise
+            self._store(key, _Entry(value, list(paths), _artifact_mtimes(paths), _entry_size(value, paths)))
+            with self._lock:
+                self.loads += 1
+            return value
+
+    def _get_entry(self, key: Hashable) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _key_lock(self, key: Hashable) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _raise_cached_failure(self, key: Hashable) -> None:
+        with self._lock:
+            failure = self._failures.get(key)
+            if failure is None:
+                return
+            error, failed_at = failure
+            if time.monotonic() - failed_at > self.failure_ttl_seconds:
+                del self._failures[key]
+                return
+        raise error
+
+    def _store(self, key: Hashable, entry: _Entry) -> None:
+        with self._lock:
+            self._failures.pop(key, None)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if self.memory_budget_bytes <= 0:
+                return
+            total = sum(e.size_bytes for e in self._entries.values())
+            while total > self.memory_budget_bytes and len(self._entries) > 1:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                total -= evicted.size_bytes
+                self.evictions += 1
+                logger.info(f"Evicted {evicted_key} from the model registry to stay within the memory budget.")
+
+    # --- Hot reload ---
+    def _reload_due(self, entry: _Entry) -> bool:
+        if self.reload_check_seconds <= 0:
+            return False
+        now = time.monotonic()
+        if now - entry.checked_at < self.reload_check_seconds:
+            return False
+        entry.checked_at = now
+        mtimes = _artifact_mtimes(entry.paths)
+        # A missing artifact (mid-copy or deleted) keeps the loaded version
+        return None not in mtimes and mtimes != entry.mtimes
+
+    def _reload(self, key: Hashable, entry: _Entry, loader: Callable[[], object], paths: List[str]):
+        key_lock = self._key_lock(key)
+        if not key_lock.acquire(blocking=False):
+            return entry.value # Another request is already loading the new version
+        try:
+            mtimes = _artifact_mtimes(paths)
+            try:
+                value = loader()
+            except Exception as e:
+                logger.error(f"Reloading artifacts for {key} failed, keeping the loaded version: {e}")
+                entry.mtimes = mtimes # Do not retry until the files change again
+                return entry.value
+            self._store(key, _Entry(value, list(paths), mtimes, _entry_size(value, paths)))
+            with self._lock:
+                self.reloads += 1
+            logger.info(f"Reloaded updated artifacts for {key}.")
+            return value
+        finally:
+            key_lock.release()
+
+    # --- Maintenance ---
+    def invalidate(self, key: Hashable = None) -> None:
+        """Drops one entry (or all) together with any cached load failure."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._failures.clear()
+            else:
+                self._entries.pop(key, None)
+                self._failures.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "keys": list(self._entries.keys()),
+                "size_bytes": sum(e.size_bytes for e in self._entries.values()),
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "loads": self.loads,
+                "reloads": self.reloads,
+                "evictions": self.evictions,
+                "cached_failures": len(self._failures),
+            }
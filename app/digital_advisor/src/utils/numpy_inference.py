@@ -0,0 +1,335 @@
+# app/utils/numpy_inference.py
+
+import copy
+import io
+import json
+import re
+import zipfile
+import numpy as np
+from typing import Dict, List, Tuple
+
+# --- Pure-NumPy inference engine for the saved Keras models ---
+# The per-company models are small Sequential stacks (LSTM -> Dropout -> Dense -> Dense).
+# Running them through TensorFlow for single-sample forward passes costs hundreds of MB of
+# RSS and seconds of import time, so this module reads the weights straight out of the
+# `.keras` archive (config.json + model.weights.h5) and replays the layers with NumPy.
+
+def _softmax(x: np.ndarray) -> np.ndarray:
+    e = np.exp(x - x.max(axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+_ACTIVATIONS = {
+    'linear': lambda x: x,
+    None: lambda x: x,
+    'tanh': np.tanh,
+    'sigmoid': lambda x: 1.0 / (1.0 + np.exp(-x)),
+    'relu': lambda x: np.maximum(x, 0.0),
+    'hard_sigmoid': lambda x: np.clip(0.2 * x + 0.5, 0.0, 1.0),
+    'softmax': _softmax,
+}
+
+
+def _activation(name: str):
+    if name not in _ACTIVATIONS:
+        raise ValueError(f"Unsupported activation '{name}' for the NumPy inference backend.")
+    return _ACTIVATIONS[name]
+
+
+def _snake_case(name: str) -> str:
+    """Keras' object naming: 'SimpleRNN' -> 'simple_rnn', 'Dense' -> 'dense'."""
+    name = re.sub(r'(.)([A-Z][a-z]+)', r'\1_\2', name)
+    return re.sub(r'([a-z])([A-Z])', r'\1_\2', name).lower()
+
+
+# --- Reduced-precision weights ---
+PRECISIONS = ("float32", "float16", "int8")
+
+# Layer attributes holding the weight matrices that get quantized (biases stay float32)
+_QUANTIZED_ATTRIBUTES = ("kernel", "recurrent_kernel")
+
+
+class QuantizedTensor:
+    """
+    A weight matrix stored in float16, or in int8 with one symmetric per-tensor scale
+    (w ~= q * scale, q in [-127, 127]). Only the compact form is kept in memory; `x @ tensor`
+    upcasts it to float32 for the duration of the matmul.
+    """
+    __array_ufunc__ = None # Makes `ndarray @ QuantizedTensor` defer to __rmatmul__
+
+    def __init__(self, values: np.ndarray, scale: float = None):
+        self.values = values
+        self.scale = scale
+
+    @classmethod
+    def quantize(cls, array: np.ndarray, precision: str) -> "QuantizedTensor":
+        if precision == "float16":
+            return cls(np.asarray(array, dtype=np.float16))
+        if precision == "int8":
+            max_abs = float(np.max(np.abs(array))) if array.size else 0.0
+            scale = max_abs / 127.0 if max_abs > 0 else 1.0
+            values = np.clip(np.round(array / scale), -127, 127).astype(np.int8)
+            return cls(values, np.float32(scale))
+        raise ValueError(f"Unsupported precision '{precision}'. Expected one of {PRECISIONS[1:]}.")
+
+    def dequantize(self) -> np.ndarray:
+        values = self.values.astype(np.float32)
+        return values * self.scale if self.scale is not None else values
+
+    def __rmatmul__(self, x: np.ndarray) -> np.ndarray:
+        out = x @ self.values.astype(np.float32)
+        return out * self.scale if self.scale is not None else out
+
+    def __getitem__(self, index) -> "QuantizedTensor":
+        return QuantizedTensor(self.values[index], self.scale)
+
+    @property
+    def shape(self) -> tuple:
+        return self.values.shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(np.float32) # The dtype it computes in
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + (4 if self.scale is not None else 0)
+
+
+# --- Layers ---
+class DenseLayer:
+    def __init__(self, config: dict, weights: List[np.ndarray]):
+        self.kernel = weights[0]
+        self.bias = weights[1] if config.get('use_bias', True) else None
+        self.activation = _activation(config.get('activation'))
+
+    def __call__(self, x: np.ndarray, training: bool = False) -> np.ndarray:
+        out = x @ self.kernel
+        if self.bias is not None:
+            out = out + self.bias
+        return self.activation(out)
+
+
+class DropoutLayer:
+    def __init__(self, config: dict, weights: List[np.ndarray]):
+        self.rate = float(config.get('rate', 0.0))
+        self.rng = np.random.default_rng()
+
+    def __call__(self, x: np.ndarray, training: bool = False) -> np.ndarray:
+        if not training or self.rate <= 0.0:
+            return x
+        keep = self.rng.random(x.shape) >= self.rate
+        return np.where(keep, x / (1.0 - self.rate), 0.0).astype(x.dtype)
+
+
+class LSTMLayer:
+    """Keras LSTM (gate order i, f, c, o) with the input projection vectorized over all timesteps."""
+    def __init__(self, config: dict, weights: List[np.ndarray]):
+        self.units = int(config['units'])
+        self.kernel, self.recurrent_kernel = weights[0], weights[1]
+        self.bias = weights[2] if config.get('use_bias', True) else np.zeros(4 * self.units, dtype=self.kernel.dtype)
+        self.activation = _activation(config.get('activation', 'tanh'))
+        self.recurrent_activation = _activation(config.get('recurrent_activation', 'sigmoid'))
+        self.return_sequences = bool(config.get('return_sequences', False))
+        self.go_backwards = bool(config.get('go_backwards', False))
+
+    def __call__(self, x: np.ndarray, training: bool = False) -> np.ndarray:
+        if self.go_backwards:
+            x = x[:, ::-1, :]
+        batch, steps, _ = x.shape
+        u = self.units
+        # One matmul for the input contribution of every timestep: (batch, steps, 4 * units)
+        x_proj = x @ self.kernel + self.bias
+        h = np.zeros((batch, u), dtype=x_proj.dtype)
+        c = np.zeros((batch, u), dtype=x_proj.dtype)
+        outputs = np.empty((batch, steps, u), dtype=x_proj.dtype) if self.return_sequences else None
+        for t in range(steps):
+            z = x_proj[:, t, :] + h @ self.recurrent_kernel
+            i = self.recurrent_activation(z[:, :u])
+            f = self.recurrent_activation(z[:, u:2 * u])
+            g = self.activation(z[:, 2 * u:3 * u])
+            o = self.recurrent_activation(z[:, 3 * u:])
+            c = f * c + i * g
+            h = o * self.activation(c)
+            if outputs is not None:
+                outputs[:, t, :] = h
+        return outputs if outputs is not None else h
+
+
+class GRULayer:
+    """Keras GRU (gate order z, r, h), supporting both reset_after modes."""
+    def __init__(self, config: dict, weights: List[np.ndarray]):
+        self.units = int(config['units'])
+        self.kernel, self.recurrent_kernel = weights[0], weights[1]
+        self.reset_after = bool(config.get('reset_after', True))
+        if config.get('use_bias', True):
+            bias = weights[2]
+        else:
+            bias = np.zeros((2, 3 * self.units) if self.reset_after else 3 * self.units, dtype=self.kernel.dtype)
+        if self.reset_after:
+            self.input_bias, self.recurrent_bias = bias[0], bias[1]
+        else:
+            self.input_bias, self.recurrent_bias = bias, np.zeros_like(bias)
+        self.activation = _activation(config.get('activation', 'tanh'))
+        self.recurrent_activation = _activation(config.get('recurrent_activation', 'sigmoid'))
+        self.return_sequences = bool(config.get('return_sequences', False))
+        self.go_backwards = bool(config.get('go_backwards', False))
+
+    def __call__(self, x: np.ndarray, training: bool = False) -> np.ndarray:
+        if self.go_backwards:
+            x = x[:, ::-1, :]
+        batch, steps, _ = x.shape
+        u = self.units
+        x_proj = x @ self.kernel + self.input_bias
+        h = np.zeros((batch, u), dtype=x_proj.dtype)
+        outputs = np.empty((batch, steps, u), dtype=x_proj.dtype) if self.return_sequences else None
+        for t in range(steps):
+            xz, xr, xh = x_proj[:, t, :u], x_proj[:, t, u:2 * u], x_proj[:, t, 2 * u:]
+            if self.reset_after:
+                rec = h @ self.recurrent_kernel + self.recurrent_bias
+                z = self.recurrent_activation(xz + rec[:, :u])
+                r = self.recurrent_activation(xr + rec[:, u:2 * u])
+                hh = self.activation(xh + r * rec[:, 2 * u:])
+            else:
+                z = self.recurrent_activation(xz + h @ self.recurrent_kernel[:, :u])
+                r = self.recurrent_activation(xr + h @ self.recurrent_kernel[:, u:2 * u])
+                hh = self.activation(xh + (r * h) @ self.recurrent_kernel[:, 2 * u:])
+            h = z * h + (1.0 - z) * hh
+            if outputs is not None:
+                outputs[:, t, :] = h
+        return outputs if outputs is not None else h
+
+
+_LAYER_TYPES = {
+    'Dense': DenseLayer,
+    'Dropout': DropoutLayer,
+    'LSTM': LSTMLayer,
+    'GRU': GRULayer,
+}
+
+
+def read_keras_archive(model_path: str) -> Tuple[List[dict], Dict[str, List[np.ndarray]]]:
+    """
+    Reads a Sequential `.keras` archive and returns (layer configs, weights), where weights maps
+    the Keras object name ('lstm', 'dense', 'dense_1', ...) to the layer's float32 arrays.
+    """
+    import h5py  # Only needed when converting from the Keras archive
+
+    with zipfile.ZipFile(model_path) as archive:
+        config = json.loads(archive.read('config.json'))
+        weights_bytes = archive.read('model.weights.h5')
+
+    if config.get('class_name') != 'Sequential':
+        raise ValueError(f"Only Sequential models are supported by the NumPy backend, got '{config.get('class_name')}' in {model_path}.")
+
+    weights = {}
+    with h5py.File(io.BytesIO(weights_bytes), 'r') as h5:
+        weights_root = h5['layers']
+        for key in weights_root:
+            group = weights_root[key]
+            # Recurrent layers keep their variables on the cell
+            vars_group = group['cell']['vars'] if 'cell' in group else group['vars']
+            weights[key] = [np.asarray(vars_group[str(i)], dtype=np.float32) for i in range(len(vars_group))]
+    return config['config']['layers'], weights
+
+
+# --- Model ---
+class NumpyModel:
+    """
+    Drop-in replacement for a loaded Keras Sequential model: `predict(x)` takes an input of
+    shape (batch, SEQ_LENGTH, n_features) and returns the same (batch, n_outputs) array.
+    """
+    def __init__(self, layers: list, input_shape: tuple = None, precision: str = "float32"):
+        self.layers = layers
+        self.input_shape = input_shape
+        self.precision = precision
+
+    def quantized(self, precision: str) -> "NumpyModel":
+        """
+        Returns a copy of the model whose kernel/recurrent_kernel matrices are stored in
+        `precision` ("float16" or "int8"; "float32" returns the model itself).
+        """
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unsupported precision '{precision}'. Expected one of {PRECISIONS}.")
+        if precision == self.precision:
+            return self
+        if self.precision != "float32":
+            raise ValueError(f"Cannot re-quantize a {self.precision} model to {precision}; start from float32.")
+        layers = []
+        for layer in self.layers:
+            layer = copy.copy(layer)
+            for attribute in _QUANTIZED_ATTRIBUTES:
+                weight = getattr(layer, attribute, None)
+                if isinstance(weight, np.ndarray) and weight.ndim == 2:
+                    setattr(layer, attribute, QuantizedTensor.quantize(weight, precision))
+            layers.append(layer)
+        return NumpyModel(layers, self.input_shape, precision)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the weights of every layer."""
+        total = 0
+        for layer in self.layers:
+            for value in vars(layer).values():
+                if isinstance(value, (np.ndarray, QuantizedTensor)):
+                    total += value.nbytes
+        return total
+
+    @classmethod
+    def from_keras_file(cls, model_path: str) -> "NumpyModel":
+        """Extracts the layer configs and weights from a `.keras` archive."""
+        return cls.from_config(*read_keras_archive(model_path))
+
+    @classmethod
+    def from_config(cls, layer_configs: List[dict], weights: Dict[str, List[np.ndarray]]) -> "NumpyModel":
+        """
+        Builds the model from Keras layer configs and a mapping of Keras object name
+        ('lstm', 'dense', 'dense_1', ...) to the layer's weight arrays.
+        """
+        layers = []
+        input_shape = None
+        name_counts: Dict[str, int] = {}
+        for layer in layer_configs:
+            class_name = layer['class_name']
+            layer_config = layer['config']
+            if class_name == 'InputLayer':
+                batch_shape = layer_config.get('batch_shape') or layer_config.get('batch_input_shape')
+                input_shape = tuple(batch_shape[1:]) if batch_shape else None
+                continue
+            if class_name not in _LAYER_TYPES:
+                raise ValueError(f"Layer type '{class_name}' is not supported by the NumPy inference backend.")
+
+            base_name = _snake_case(class_name)
+            count = name_counts.get(base_name, 0)
+            name_counts[base_name] = count + 1
+            object_name = base_name if count == 0 else f"{base_name}_{count}"
+
+            layers.append(_LAYER_TYPES[class_name](layer_config, weights.get(object_name, [])))
+        return cls(layers, input_shape)
+
+    def predict(self, x: np.ndarray, training: bool = False) -> np.ndarray:
+        """Forward pass. `training=True` keeps dropout active (Monte-Carlo sampling)."""
+        out = np.asarray(x, dtype=np.float32)
+        for layer in self.layers:
+            out = layer(out, training=training)
+        return out
+
+    __call__ = predict
+
+    def sample(self, x: np.ndarray, samples: int) -> np.ndarray:
+        """
+        Monte-Carlo dropout: `samples` stochastic forward passes of a single input (1, ...),
+        returned as (samples, n_outputs). The layers before the first Dropout are deterministic,
+        so they run once and only their output is repeated into the sampled batch.
+        """
+        out = np.asarray(x, dtype=np.float32)
+        for index, layer in enumerate(self.layers):
+            if isinstance(layer, DropoutLayer):
+                break
+            out = layer(out)
+        else:
+            return np.repeat(out, samples, axis=0)
+        out = np.repeat(out, samples, axis=0)
+        for layer in self.layers[index:]:
+            out = layer(out, training=True)
+        return out
@@ -0,0 +1,88 @@
+# app/utils/prediction_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+
+class PredictionCache:
+    """
+    Bounded in-memory LRU of predictions keyed by (ticker, latest_bar_timestamp).
+
+    A prediction for a given bar never changes once stored, so cached values cannot go stale;
+    only the knowledge of which bar is the latest can. That knowledge is trusted for
+    `ttl_seconds` after it was last confirmed against the database (or until invalidate()
+    is called for the ticker when new bars are ingested). Within that window a /predict
+    hit needs no database round-trip at all.
+    """
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 5.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, datetime], float]" = OrderedDict()
+        self._latest_bars: Dict[str, Tuple[datetime, float]] = {} # ticker -> (latest bar, confirmed at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get_fresh(self, ticker: str) -> Optional[float]:
+        """Returns the cached prediction for the ticker's latest bar if that bar was confirmed within the TTL."""
+        with self._lock:
+            latest = self._latest_bars.get(ticker)
+            if latest is not None and time.monotonic() - latest[1] <= self.ttl_seconds:
+                key = (ticker, latest[0])
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key]
+            return None
+
+    def get(self, ticker: str, latest_bar: datetime) -> Optional[float]:
+        """Looks up the prediction for a known latest bar and records that bar as confirmed."""
+        with self._lock:
+            self._latest_bars[ticker] = (latest_bar, time.monotonic())
+            key = (ticker, latest_bar)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, ticker: str, latest_bar: datetime, predicted_value: float) -> None:
+        with self._lock:
+            key = (ticker, latest_bar)
+            self._entries[key] = float(predicted_value)
+            self._entries.move_to_end(key)
+            current = self._latest_bars.get(ticker)
+            if current is None or current[0] <= latest_bar:
+                self._latest_bars[ticker] = (latest_bar, time.monotonic())
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, ticker: str = None) -> None:
+        """
+        Forgets which bar is the latest (for one ticker, or all) so the next lookup goes to
+        the database. Call it when new bars are ingested.
+        """
+        with self._lock:
+            if ticker is None:
+                self._latest_bars.clear()
+            else:
+                self._latest_bars.pop(ticker, None)
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else None,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
@@ -2,18 +2,36 @@
 
 from src.config import (
     MODEL_TYPE1_CONFIG, MODEL_TYPE2_CONFIG,
-    COMPANIES_TYPE1, COMPANIES_TYPE2
+    COMPANIES_TYPE1, COMPANIES_TYPE2,
+    INFERENCE_BACKEND, MODEL_PRECISION, MODEL_PRECISION_OVERRIDES, ARTIFACT_FORMAT,
+    MODEL_REGISTRY_MEMORY_BUDGET_MB, MODEL_REGISTRY_FAILURE_TTL_SECONDS, MODEL_REGISTRY_RELOAD_CHECK_SECONDS,
+    TF_INTRA_OP_THREADS, TF_INTER_OP_THREADS, TF_SERVING_PROCESSES
 )
 import numpy as np
 import os
 import joblib
 from typing import List, Dict, Union
-from tensorflow.keras.models import load_model
+from src.utils.numpy_inference import NumpyModel, PRECISIONS
+from src.utils.tflite_inference import TFLiteModel
+from src.utils.model_registry import ModelRegistry
+from src.utils.artifact_bundle import ArtifactBundle, manifest_path
+from src.utils.indicators import sma, rolling_std
+from src.utils.tf_threading import derive_thread_counts, apply_tensorflow_threads
+
+
+def load_model(model_path: str):
+    """
+    Loads a Keras model from disk.
+    TensorFlow is imported here, on the first model load, instead of at module import
+    so workers that never serve predictions do not pay for it.
+    """
+    from tensorflow.keras.models import load_model as keras_load_model
+    return keras_load_model(model_path)
 
 # --- Feature Engineering Functions ---
-# These functions are retained as they were in your previously working code,
-# but will *not* be used directly for feature engineering in PredictionService.
-# They are kept here in case they are used elsewhere or for legacy reasons.
+# Legacy list-based helpers, kept for backwards compatibility. They are thin wrappers
+# around the vectorized implementations in src.utils.indicators and keep their
+# original zero-padded output format.
 def _calculate_moving_average(data: list[float], window: int) -> list[float]:
     """
     Calculates a simple moving average for a list of data points.
@@ -21,15 +39,7 @@ def _calculate_moving_average(data: list[float], window: int) -> list[float]:
     """
     if not data:
         return []
-    ma_values = []
-    padded_data = [np.nan] * (window - 1) + data
-    for i in range(len(data)):
-        current_window = padded_data[i : i + window]
-        if not any(np.isnan(x) for x in current_window):
-            ma_values.append(np.mean(current_window))
-        else:
-            ma_values.append(0.0)
-    return ma_values
+    return np.nan_to_num(sma(data, window), nan=0.0).tolist()
 
 def _calculate_volatility(data: list[float], window: int = 20) -> list[float]:
     """
@@ -39,16 +49,9 @@ def _calculate_volatility(data: list[float], window: int = 20) -> list[float]:
     if len(data) < 2:
         return [0.0] * len(data)
     returns = np.diff(np.log(data))
-    padded_returns = [0.0] * (window - 1) + returns.tolist()
-    volatility_values = []
-    for i in range(len(returns)):
-        current_window = padded_returns[i : i + window]
-        if len(current_window) == window:
-            volatility_values.append(np.std(current_window))
-        else:
-            volatility_values.append(0.0)
-    final_volatility = [0.0] * (len(data) - len(volatility_values)) + volatility_values
-    return final_volatility
+    padded_returns = np.concatenate([np.zeros(window - 1), returns])
+    volatility_values = rolling_std(padded_returns, window, ddof=0)[window - 1:]
+    return [0.0] + volatility_values.tolist()
 
 # --- Base Preprocessor Class (for Type 1 Models) ---
 class BasePreprocessor:
@@ -56,15 +59,18 @@ class BasePreprocessor:
     Handles preprocessing (scaling, sequence preparation, inverse transformation)
     for models that do not use PCA (i.e., Type 1 models).
     """
-    def __init__(self, company: str):
+    def __init__(self, company: str, scaler=None):
+        """`scaler` skips the pickle and uses an already loaded scaler (e.g. from an artifact bundle)."""
         self.company = company
         self.seq_length = MODEL_TYPE1_CONFIG["SEQ_LENGTH"]
         self.features = MODEL_TYPE1_CONFIG["FEATURES"]
 
-        scaler_path = os.path.join(MODEL_TYPE1_CONFIG["SCALER_DIR"], f"{company}_scaler.pkl")
-        if not os.path.exists(scaler_path):
-            raise FileNotFoundError(f"Scaler file not found for company '{company}' at {scaler_path}")
-        self.scaler = joblib.load(scaler_path)
+        if scaler is None:
+            scaler_path, = self.artifact_paths(company)
+            if not os.path.exists(scaler_path):
+                raise FileNotFoundError(f"Scaler file not found for company '{company}' at {scaler_path}")
+            scaler = joblib.load(scaler_path)
+        self.scaler = scaler
 
         # Determine the index of 'close_value' in the features list for inverse transformation
         try:
@@ -72,6 +78,65 @@ class BasePreprocessor:
         except ValueError:
             raise ValueError(f"'close_value' not found in features list for {company} (Type 1).")
 
+        self._build_affine_maps()
+
+    @staticmethod
+    def artifact_paths(company: str) -> List[str]:
+        """Files this preprocessor is loaded from (watched by the model registry for hot reload)."""
+        return [os.path.join(MODEL_TYPE1_CONFIG["SCALER_DIR"], f"{company}_scaler.pkl")]
+
+    @classmethod
+    def from_bundle(cls, bundle: ArtifactBundle) -> "BasePreprocessor":
+        """Builds the preprocessor from a memory-mapped artifact bundle instead of the pickles."""
+        return cls(bundle.company, scaler=bundle.scaler)
+
+    @staticmethod
+    def _fitted_array(obj, attribute: str):
+        """Returns a fitted sklearn attribute as an ndarray, or None if the object does not expose it."""
+        value = getattr(obj, attribute, None)
+        return value if isinstance(value, np.ndarray) else None
+
+    def _build_affine_maps(self):
+        """
+        MinMaxScaler is the affine map x * scale_ + min_, so both directions are precomputed
+        as vectors once instead of going through the sklearn object (and a full dummy
+        feature matrix for the inverse) on every call.
+        Scalers that do not expose scale_/min_ (or clip their output) keep using their own methods.
+        """
+        self.forward_scale = self.forward_offset = None
+        self.inverse_close_scale = self.inverse_close_offset = None
+
+        scale = self._fitted_array(self.scaler, 'scale_')
+        offset = self._fitted_array(self.scaler, 'min_')
+        if scale is None or offset is None or getattr(self.scaler, 'clip', False):
+            return
+
+        self.forward_scale = scale
+        self.forward_offset = offset
+        self.inverse_close_scale = 1.0 / scale[self.close_value_idx]
+        self.inverse_close_offset = -offset[self.close_value_idx] / scale[self.close_value_idx]
+
+    def prepare_input_batch(self, data: np.ndarray) -> np.ndarray:
+        """
+        Scales a whole batch of raw windows in one call.
+        data shape: (batch, SEQ_LENGTH, num_features) -> model input of the same shape.
+        """
+        data = np.asarray(data, dtype=np.float64)
+        if self.forward_scale is not None:
+            return data * self.forward_scale + self.forward_offset
+        batch, steps, n_features = data.shape
+        return self.transform(data.reshape(batch * steps, n_features)).reshape(batch, steps, -1)
+
+    def inverse_transform_batch(self, scaled_pred: np.ndarray) -> np.ndarray:
+        """
+        Inverse transforms a batch of scaled close_value predictions.
+        scaled_pred shape: (batch, 1) or (batch,) -> returns shape (batch,).
+        """
+        scaled = np.asarray(scaled_pred, dtype=np.float64).reshape(-1)
+        if self.inverse_close_scale is not None:
+            return scaled * self.inverse_close_scale + self.inverse_close_offset
+        return self.inverse_transform_close_value(scaled.reshape(-1, 1))
+
     def transform(self, data: np.ndarray) -> np.ndarray:
         """Scale data using the loaded scaler."""
         return self.scaler.transform(data)
@@ -108,20 +173,15 @@ class BasePreprocessor:
         # Stack features into a 2D array (SEQ_LENGTH, num_features)
         data = np.array([raw_input_data[feature] for feature in self.features]).T
 
-        # Scale the data
-        scaled = self.transform(data)
-
-        # Reshape for model input (1, SEQ_LENGTH, num_features)
-        return scaled[np.newaxis, :, :]
+        # Scale the data and add the batch axis: (1, SEQ_LENGTH, num_features)
+        return self.prepare_input_batch(data[np.newaxis, :, :])
 
     def inverse_transform_prediction(self, scaled_pred: np.ndarray) -> float:
         """
         Given the scaled predicted close_value(s), inverse transform to original scale.
         scaled_pred shape expected to be (1, 1) or (1,).
         """
-        scaled_array = scaled_pred.reshape(-1, 1) # Ensure it's 2D for inverse_transform_close_value
-        original_values = self.inverse_transform_close_value(scaled_array)
-        return float(original_values[0])
+        return float(self.inverse_transform_batch(scaled_pred)[0])
 
 
 # --- Preprocessor Class for Type 2 Models (with PCA) ---
@@ -132,23 +192,26 @@ class Type2Preprocessor(BasePreprocessor): # Inherit BasePreprocessor for common
     Crucially, it also handles inverse transformation of the *full PCA vector prediction*
     back to original features, then extracts the close_value.
     """
-    def __init__(self, company: str):
+    def __init__(self, company: str, scaler=None, pca=None):
         self.company = company
         self.seq_length = MODEL_TYPE2_CONFIG["SEQ_LENGTH"]
         self.features = MODEL_TYPE2_CONFIG["FEATURES"] # Use Type 2 specific features
 
         # Load MinMaxScaler (fitted before PCA)
-        scaler_path = os.path.join(MODEL_TYPE2_CONFIG["SCALER_DIR"], f"{company}_scaler.pkl")
-        if not os.path.exists(scaler_path):
-            raise FileNotFoundError(f"Scaler file not found for company '{company}' at {scaler_path}")
-        self.scaler = joblib.load(scaler_path)
+        scaler_path, pca_path = self.artifact_paths(company)
+        if scaler is None:
+            if not os.path.exists(scaler_path):
+                raise FileNotFoundError(f"Scaler file not found for company '{company}' at {scaler_path}")
+            scaler = joblib.load(scaler_path)
+        self.scaler = scaler
 
         # Load PCA object
-        pca_path = os.path.join(MODEL_TYPE2_CONFIG["PCA_DIR"], f"{company}_pca.pkl")
-        if not os.path.exists(pca_path):
-            raise FileNotFoundError(f"PCA object not found for company '{company}' at {pca_path}. "
-                                    f"Ensure it was saved during training!")
-        self.pca = joblib.load(pca_path)
+        if pca is None:
+            if not os.path.exists(pca_path):
+                raise FileNotFoundError(f"PCA object not found for company '{company}' at {pca_path}. "
+                                        f"Ensure it was saved during training!")
+            pca = joblib.load(pca_path)
+        self.pca = pca
 
         # Determine the index of 'close_value' in the features list for inverse transformation
         try:
@@ -156,6 +219,72 @@ class Type2Preprocessor(BasePreprocessor): # Inherit BasePreprocessor for common
         except ValueError:
             raise ValueError(f"'close_value' not found in features list for {company} (Type 2).")
 
+        self._build_affine_maps()
+
+    @staticmethod
+    def artifact_paths(company: str) -> List[str]:
+        return [os.path.join(MODEL_TYPE2_CONFIG["SCALER_DIR"], f"{company}_scaler.pkl"),
+                os.path.join(MODEL_TYPE2_CONFIG["PCA_DIR"], f"{company}_pca.pkl")]
+
+    @classmethod
+    def from_bundle(cls, bundle: ArtifactBundle) -> "Type2Preprocessor":
+        if bundle.pca is None:
+            raise ValueError(f"Artifact bundle for {bundle.company} has no PCA, but the company is a Type 2 model.")
+        return cls(bundle.company, scaler=bundle.scaler, pca=bundle.pca)
+
+    def _build_affine_maps(self):
+        """
+        Scaler followed by PCA is one affine map, so it is fused into a single matrix:
+            z = ((x * scale + min) - mean) @ C.T  ==  x @ (scale[:, None] * C.T) + (min - mean) @ C.T
+        and the inverse (PCA -> scaler -> close_value column) collapses into one vector:
+            close = (z @ C[:, idx] + mean[idx] - min[idx]) / scale[idx]
+        Whitened PCAs additionally divide/multiply by sqrt(explained_variance_).
+        """
+        self.forward_matrix = self.forward_offset = None
+        self.inverse_close_vector = self.inverse_close_offset = None
+
+        scale = self._fitted_array(self.scaler, 'scale_')
+        offset = self._fitted_array(self.scaler, 'min_')
+        components = self._fitted_array(self.pca, 'components_')
+        mean = self._fitted_array(self.pca, 'mean_')
+        if any(v is None for v in (scale, offset, components, mean)) or getattr(self.scaler, 'clip', False):
+            return
+
+        components = components.astype(np.float64)
+        if getattr(self.pca, 'whiten', False):
+            whitening = np.sqrt(self._fitted_array(self.pca, 'explained_variance_'))
+        else:
+            whitening = np.ones(components.shape[0])
+
+        idx = self.close_value_idx
+        self.forward_matrix = (scale[:, np.newaxis] * components.T) / whitening
+        self.forward_offset = ((offset - mean) @ components.T) / whitening
+        self.inverse_close_vector = whitening * components[:, idx] / scale[idx]
+        self.inverse_close_offset = (mean[idx] - offset[idx]) / scale[idx]
+
+    def prepare_input_batch(self, data: np.ndarray) -> np.ndarray:
+        """
+        Scales and PCA-transforms a whole batch of raw windows with one matrix multiply.
+        data shape: (batch, SEQ_LENGTH, num_features) -> (batch, SEQ_LENGTH, num_pca_components).
+        """
+        data = np.asarray(data, dtype=np.float64)
+        if self.forward_matrix is not None:
+            return data @ self.forward_matrix + self.forward_offset
+        batch, steps, n_features = data.shape
+        flat = data.reshape(batch * steps, n_features)
+        return self.pca.transform(self.scaler.transform(flat)).reshape(batch, steps, -1)
+
+    def inverse_transform_batch(self, predicted_pca_vectors: np.ndarray) -> np.ndarray:
+        """
+        Inverse transforms a batch of predicted PCA vectors straight to close values.
+        predicted_pca_vectors shape: (batch, num_pca_components) -> returns shape (batch,).
+        """
+        predicted = np.asarray(predicted_pca_vectors, dtype=np.float64)
+        if self.inverse_close_vector is not None:
+            return predicted @ self.inverse_close_vector + self.inverse_close_offset
+        reconstructed_original = self.scaler.inverse_transform(self.pca.inverse_transform(predicted))
+        return reconstructed_original[:, self.close_value_idx]
+
     def prepare_input_sequence(self, raw_input_data: Dict[str, List[float]]) -> np.ndarray:
         """
         Converts raw input features (dict) into a scaled, PCA-transformed 3D numpy array
@@ -174,14 +303,8 @@ class Type2Preprocessor(BasePreprocessor): # Inherit BasePreprocessor for common
         # Stack features into a 2D array (SEQ_LENGTH_TYPE2, num_features)
         data = np.array([raw_input_data[feature] for feature in self.features]).T
 
-        # Step 1: Scale the data using MinMaxScaler
-        scaled = self.scaler.transform(data)
-
-        # Step 2: Apply PCA transformation
-        pca_transformed = self.pca.transform(scaled)
-
-        # Reshape for model input (1, SEQ_LENGTH_TYPE2, num_pca_components)
-        return pca_transformed[np.newaxis, :, :]
+        # Scale + PCA transform, shape (1, SEQ_LENGTH_TYPE2, num_pca_components)
+        return self.prepare_input_batch(data[np.newaxis, :, :])
 
     def inverse_transform_prediction(self, predicted_pca_vector: np.ndarray) -> float:
         """
@@ -190,50 +313,110 @@ class Type2Preprocessor(BasePreprocessor): # Inherit BasePreprocessor for common
 
         predicted_pca_vector shape expected to be (1, num_pca_components).
         """
-        # Step 1: Inverse transform from PCA space back to scaled feature space
-        # Expected shape of predicted_pca_vector: (1, num_pca_components)
-        reconstructed_scaled = self.pca.inverse_transform(predicted_pca_vector)
-
-        # Step 2: Inverse transform from scaled feature space back to original feature space
-        # reconstructed_scaled shape: (1, num_original_features)
-        reconstructed_original = self.scaler.inverse_transform(reconstructed_scaled)
+        return float(self.inverse_transform_batch(predicted_pca_vector)[0])
 
-        # Step 3: Extract the close_value from the reconstructed original features
-        predicted_close_value = reconstructed_original[0, self.close_value_idx]
 
-        return float(predicted_close_value)
+ARTIFACT_FORMATS = ("legacy", "bundle")
 
 
 # --- Model Manager Class (handles loading models for both types) ---
 class ModelManager:
     """
     Loads and caches models for each company, handling different model directories.
+
+    The inference backend is selected per deployment (INFERENCE_BACKEND):
+    - "keras": the full Keras model from tensorflow's load_model.
+    - "numpy": a NumpyModel replaying the same layers/weights with NumPy.
+    - "tflite": a TFLiteModel, converted on first load and cached next to the .keras file.
+    All of them expose the same `predict(model_input)` interface.
+
+    With the "numpy" backend the weights can be served in reduced precision (MODEL_PRECISION,
+    per ticker via MODEL_PRECISION_OVERRIDES): "float16" halves and "int8" quarters their memory.
+
+    Loaded models are kept in a ModelRegistry (`self.models`): bounded by the configured
+    memory budget, loaded once per company under a per-company lock, with missing artifacts
+    cached for a while and updated .keras files hot-reloaded.
+
+    The "keras" and "tflite" backends size TensorFlow's thread pools (TF_INTRA_OP_THREADS,
+    TF_INTER_OP_THREADS) before the first model load, so several workers on one machine do
+    not each start pools as wide as the machine.
     """
-    def __init__(self):
-        self.models = {}
+    SUPPORTED_BACKENDS = ("keras", "numpy", "tflite")
+
+    def __init__(self, backend: str = None, registry: ModelRegistry = None,
+                 precision: str = None, precision_overrides: Dict[str, str] = None,
+                 artifact_format: str = None, intra_op_threads: str = None, inter_op_threads: str = None,
+                 serving_processes: int = None):
+        self.backend = (backend or INFERENCE_BACKEND).lower()
+        if self.backend not in self.SUPPORTED_BACKENDS:
+            raise ValueError(f"Unsupported inference backend '{self.backend}'. "
+                             f"Expected one of {self.SUPPORTED_BACKENDS}.")
+        self.artifact_format = (artifact_format or ARTIFACT_FORMAT).lower()
+        if self.artifact_format not in ARTIFACT_FORMATS:
+            raise ValueError(f"Unsupported artifact format '{self.artifact_format}'. Expected one of {ARTIFACT_FORMATS}.")
+        self.precision = (precision or MODEL_PRECISION).lower()
+        self.precision_overrides = dict(MODEL_PRECISION_OVERRIDES if precision_overrides is None else precision_overrides)
+        for value in [self.precision, *self.precision_overrides.values()]:
+            if value not in PRECISIONS:
+                raise ValueError(f"Unsupported model precision '{value}'. Expected one of {PRECISIONS}.")
+            if value != "float32" and self.backend != "numpy":
+                raise ValueError(f"Model precision '{value}' is only supported by the 'numpy' inference backend.")
+        self.intra_op_threads, self.inter_op_threads = derive_thread_counts(
+            TF_INTRA_OP_THREADS if intra_op_threads is None else intra_op_threads,
+            TF_INTER_OP_THREADS if inter_op_threads is None else inter_op_threads,
+            serving_processes or TF_SERVING_PROCESSES
+        )
+        self.models = registry if registry is not None else ModelRegistry(
+            memory_budget_bytes=int(MODEL_REGISTRY_MEMORY_BUDGET_MB * 1024 * 1024),
+            failure_ttl_seconds=MODEL_REGISTRY_FAILURE_TTL_SECONDS,
+            reload_check_seconds=MODEL_REGISTRY_RELOAD_CHECK_SECONDS
+        )
+
+    @staticmethod
+    def model_path(company: str) -> str:
+        if company in COMPANIES_TYPE1:
+            return os.path.join(MODEL_TYPE1_CONFIG["MODEL_DIR"], f"{company}_model.keras")
+        if company in COMPANIES_TYPE2:
+            return os.path.join(MODEL_TYPE2_CONFIG["MODEL_DIR"], f"{company}_model.keras")
+        raise ValueError(f"Company '{company}' is not configured for prediction.")
+
+    def precision_for(self, company: str) -> str:
+        return self.precision_overrides.get(company, self.precision)
 
     def get_model(self, company: str):
         """
         Returns the model instance for the given company.
         Loads it from disk if not already cached.
         """
-        if company not in COMPANIES_TYPE1 and company not in COMPANIES_TYPE2:
-            raise ValueError(f"Company '{company}' is not configured for prediction.")
-
-        if company not in self.models:
-            model_path = None
-            if company in COMPANIES_TYPE1:
-                model_path = os.path.join(MODEL_TYPE1_CONFIG["MODEL_DIR"], f"{company}_model.keras")
-            elif company in COMPANIES_TYPE2:
-                # Assuming saved_models_pca is the correct directory for Type 2 models
-                model_path = os.path.join(MODEL_TYPE2_CONFIG["MODEL_DIR"], f"{company}_model.keras")
-
-            if not os.path.exists(model_path):
-                raise FileNotFoundError(f"Model file not found for company '{company}' at {model_path}")
-
-            try:
-                self.models[company] = load_model(model_path)
-            except Exception as e:
-                raise RuntimeError(f"Failed to load model from {model_path}: {e}")
-        return self.models[company]
+        if self.uses_bundle_model:
+            self.model_path(company) # Validates the company
+            return self.models.get(company, lambda: self._load_bundle_model(company), [manifest_path(company)])
+        model_path = self.model_path(company)
+        return self.models.get(company, lambda: self._load_model(company, model_path), [model_path])
+
+    @property
+    def uses_bundle_model(self) -> bool:
+        """Bundles hold NumPy weights, so only the numpy backend loads its models from them."""
+        return self.artifact_format == "bundle" and self.backend == "numpy"
+
+    def _load_bundle_model(self, company: str):
+        model = ArtifactBundle.open(company).load_model()
+        precision = self.precision_for(company)
+        return model if precision == "float32" else model.quantized(precision)
+
+    def _load_model(self, company: str, model_path: str):
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Model file not found for company '{company}' at {model_path}")
 
+        try:
+            if self.backend == "numpy":
+                model = NumpyModel.from_keras_file(model_path)
+                precision = self.precision_for(company)
+                return model if precision == "float32" else model.quantized(precision)
+            # Must precede the first TensorFlow op (tflite converts the model with TensorFlow)
+            apply_tensorflow_threads(self.intra_op_threads, self.inter_op_threads)
+            if self.backend == "tflite":
+                return TFLiteModel.from_keras_file(model_path, num_threads=self.intra_op_threads or None)
+            return load_model(model_path)
+        except Exception as e:
+            raise RuntimeError(f"Failed to load model from {model_path}: {e}")
@@ -0,0 +1,85 @@
+# app/utils/stage_timing.py
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Tuple
+
+from src.utils.metrics import get_histogram, metrics_snapshot
+
+# Stage latencies are sub-millisecond (cache hits, NumPy forward passes) up to seconds (cold loads)
+STAGE_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+HISTOGRAM_PREFIX = "prediction.stage"
+
+_current_scope = contextvars.ContextVar("stage_timing_scope", default=None)
+
+
+class TimingScope:
+    """
+    Spans recorded while the scope is active, in order. A scope with a ticker also feeds the
+    `prediction.stage.<ticker>.<stage>` histograms; a scope without one (e.g. around a whole
+    request) only collects the spans of the scopes nested in it.
+    """
+    def __init__(self, ticker: str = None, parent: "TimingScope" = None):
+        self.ticker = ticker
+        self.parent = parent
+        self.spans: List[Tuple[str, float]] = []
+
+    def record(self, stage: str, duration_ms: float) -> None:
+        ticker = None
+        scope = self
+        while scope is not None:
+            scope.spans.append((stage, duration_ms))
+            ticker = ticker or scope.ticker
+            scope = scope.parent
+        if ticker:
+            get_histogram(f"{HISTOGRAM_PREFIX}.{ticker}.{stage}", STAGE_BUCKETS_MS).observe(duration_ms)
+
+    def totals(self) -> Dict[str, float]:
+        """Stage -> summed milliseconds, in first-seen order."""
+        totals: Dict[str, float] = {}
+        for stage, duration_ms in self.spans:
+            totals[stage] = totals.get(stage, 0.0) + duration_ms
+        return totals
+
+    def server_timing_header(self) -> str:
+        """The spans as a Server-Timing header value, e.g. `latest_bar;dur=0.41, model_predict;dur=2.87`."""
+        return ", ".join(f"{stage};dur={duration_ms:.2f}" for stage, duration_ms in self.totals().items())
+
+
+@contextmanager
+def timing_scope(ticker: str = None):
+    """Activates a TimingScope (nested in the current one, if any) for the enclosed code."""
+    scope = TimingScope(ticker, parent=_current_scope.get())
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+
+
+@contextmanager
+def stage(name: str):
+    """Times the enclosed code as stage `name` of the active scope. A no-op outside of any scope."""
+    scope = _current_scope.get()
+    if scope is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        scope.record(name, (time.perf_counter() - started) * 1000)
+
+
+def stage_timings_snapshot(tickers: Iterable[str] = None) -> Dict[str, Dict[str, dict]]:
+    """Returns ticker -> stage -> histogram snapshot (milliseconds) for the recorded stages."""
+    wanted = {t.upper() for t in tickers} if tickers else None
+    result: Dict[str, Dict[str, dict]] = {}
+    for name, snapshot in metrics_snapshot().items():
+        if not name.startswith(HISTOGRAM_PREFIX + "."):
+            continue
+        ticker, _, stage_name = name[len(HISTOGRAM_PREFIX) + 1:].partition(".")
+        if wanted is None or ticker in wanted:
+            result.setdefault(ticker, {})[stage_name] = snapshot
+    return result
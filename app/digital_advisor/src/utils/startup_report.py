@@ -0,0 +1,71 @@
+# app/utils/startup_report.py
+
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+# --- Startup-time report ---
+# Boots the app in a fresh interpreter with `python -X importtime` and aggregates the
+# per-module import cost, so regressions such as TensorFlow sneaking back into the
+# import path of create_app() are easy to spot.
+
+DEFAULT_BOOT_CODE = "from src import create_app; create_app()"
+
+# Packages that only the prediction path needs; none of them should be imported at boot
+HEAVY_PACKAGES = {"tensorflow", "keras", "sklearn", "pandas", "scipy", "h5py"}
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """
+    Parses `-X importtime` output lines of the form
+    'import time:   self [us] | cumulative | imported package'.
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+            entries.append({
+                "module": module.strip(),
+                "depth": (len(module) - len(module.lstrip())) // 2,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            })
+        except ValueError:
+            continue
+    return entries
+
+
+def collect_startup_report(boot_code: str = DEFAULT_BOOT_CODE, top: int = 25, cwd: str = None) -> Dict:
+    """
+    Runs `boot_code` in a subprocess with import timing enabled.
+
+    Returns a dict with the total import time, the slowest top-level packages
+    (by cumulative time) and the slowest individual modules (by self time).
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", boot_code],
+        capture_output=True, text=True, cwd=cwd, env=env
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"App boot failed while collecting the startup report:\n{completed.stderr[-2000:]}")
+
+    entries = parse_importtime(completed.stderr)
+
+    # Self time summed per top-level package (flask, sqlalchemy, numpy, src, ...)
+    package_ms: Dict[str, float] = {}
+    for e in entries:
+        package = e["module"].split(".")[0]
+        package_ms[package] = package_ms.get(package, 0.0) + e["self_ms"]
+
+    return {
+        "total_import_ms": sum(e["cumulative_ms"] for e in entries if e["depth"] == 0),
+        "modules_imported": len(entries),
+        "slowest_packages": sorted(({"package": p, "self_ms": ms} for p, ms in package_ms.items()),
+                                   key=lambda e: e["self_ms"], reverse=True)[:top],
+        "slowest_modules": sorted(entries, key=lambda e: e["self_ms"], reverse=True)[:top],
+        "heavy_modules_loaded": sorted(set(package_ms) & HEAVY_PACKAGES),
+    }
@@ -0,0 +1,95 @@
+# app/utils/tf_threading.py
+
+import logging
+import os
+import threading
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_applied: Optional[Tuple[int, int]] = None
+_attempted = False
+_apply_lock = threading.Lock()
+
+
+def available_cpus() -> int:
+    """
+    CPUs this process may actually use: its affinity mask (taskset, cpusets), further capped
+    by a cgroup v2 CPU quota (docker --cpus, Kubernetes limits) when one is set.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            cpus = min(cpus, max(1, int(int(quota) // int(period))))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+
+def derive_thread_counts(intra_setting: str, inter_setting: str, processes: int,
+                         cpus: int = None) -> Tuple[int, int]:
+    """
+    Resolves the TF_INTRA_OP_THREADS / TF_INTER_OP_THREADS settings to thread counts.
+
+    "auto" gives every model-serving process an equal share of the usable CPUs for intra-op
+    parallelism (at least 1) and one inter-op thread per two intra-op threads (the models are
+    a single sequential chain of ops, so a wide inter-op pool only adds contention).
+    An integer is used as is; 0 keeps TensorFlow's own default (sized to the whole machine).
+    """
+    if cpus is None:
+        cpus = available_cpus()
+    share = max(1, cpus // max(1, processes))
+
+    def resolve(setting: str, auto_value: int) -> int:
+        setting = str(setting).strip().lower()
+        if setting == "auto":
+            return auto_value
+        try:
+            value = int(setting)
+        except ValueError:
+            raise ValueError(f"Thread count must be 'auto' or a non-negative integer, got '{setting}'.")
+        if value < 0:
+            raise ValueError(f"Thread count must be 'auto' or a non-negative integer, got '{setting}'.")
+        return value
+
+    intra = resolve(intra_setting, share)
+    inter = resolve(inter_setting, max(1, (intra or share) // 2))
+    return intra, inter
+
+
+def apply_tensorflow_threads(intra: int, inter: int) -> Optional[Tuple[int, int]]:
+    """
+    Sizes TensorFlow's intra-/inter-op thread pools for this process. The pools are created
+    with the first TensorFlow op, so this must run before the first model load; only the first
+    call per process has an effect. Returns the applied (intra, inter), or None if TensorFlow
+    is not installed or was already initialized with other sizes.
+    """
+    global _applied, _attempted
+    with _apply_lock:
+        if _attempted:
+            return _applied
+        _attempted = True
+        try:
+            import tensorflow as tf
+        except ImportError:
+            # tflite_runtime-only deployments: the interpreter is sized through num_threads instead
+            return None
+
+        try:
+            if (tf.config.threading.get_intra_op_parallelism_threads() != intra
+                    or tf.config.threading.get_inter_op_parallelism_threads() != inter):
+                tf.config.threading.set_intra_op_parallelism_threads(intra)
+                tf.config.threading.set_inter_op_parallelism_threads(inter)
+        except RuntimeError as e:
+            logger.warning(f"TensorFlow was initialized before its thread pools could be sized "
+                           f"(intra={intra}, inter={inter}): {e}")
+            return None
+        _applied = (intra, inter)
+        logger.info(f"TensorFlow thread pools: intra_op={intra}, inter_op={inter} "
+                    f"({available_cpus()} usable CPUs).")
+        return _applied
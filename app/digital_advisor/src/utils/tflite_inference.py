@@ -0,0 +1,89 @@
+# app/utils/tflite_inference.py
+
+import os
+import threading
+import numpy as np
+
+# --- TFLite interpreter backend for the saved Keras models ---
+# Each company model is converted once to a TFLite flatbuffer that is cached next to the
+# original artifact (<company>_model.keras -> <company>_model.tflite) and served through
+# the TFLite interpreter, which has far less per-call overhead than Keras' model.predict.
+
+
+def _interpreter_class():
+    """Prefers the standalone tflite_runtime package and falls back to the one bundled with tensorflow."""
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        import tensorflow as tf
+        Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+
+def tflite_path_for(model_path: str) -> str:
+    """Path of the cached TFLite flatbuffer for a `.keras` artifact."""
+    return os.path.splitext(model_path)[0] + ".tflite"
+
+
+def convert_keras_file(model_path: str, tflite_path: str) -> None:
+    """
+    Converts a `.keras` model to a TFLite flatbuffer.
+    The graph is traced with a fixed batch size of 1 and its variables are frozen, which
+    lets the converter emit the fused LSTM kernel instead of dynamic TensorList ops.
+    """
+    import tensorflow as tf
+    from tensorflow.python.framework.convert_to_constants import convert_variables_to_constants_v2
+
+    model = tf.keras.models.load_model(model_path)
+    input_spec = tf.TensorSpec([1] + list(model.input_shape[1:]), tf.float32)
+
+    @tf.function(input_signature=[input_spec])
+    def serve(x):
+        return model(x, training=False)
+
+    frozen = convert_variables_to_constants_v2(serve.get_concrete_function())
+    flatbuffer = tf.lite.TFLiteConverter.from_concrete_functions([frozen]).convert()
+
+    # Write atomically so concurrent workers never read a half-written file
+    tmp_path = f"{tflite_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(flatbuffer)
+    os.replace(tmp_path, tflite_path)
+
+
+class TFLiteModel:
+    """
+    Serves a converted model through the TFLite interpreter with the same
+    `predict(model_input)` interface as a Keras model.
+    """
+    def __init__(self, tflite_path: str, num_threads: int = None):
+        self.tflite_path = tflite_path
+        self.interpreter = _interpreter_class()(model_path=tflite_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self.input_shape = tuple(self._input['shape'][1:])
+        # A TFLite interpreter is not thread-safe
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_keras_file(cls, model_path: str, num_threads: int = None) -> "TFLiteModel":
+        """Loads the cached flatbuffer, converting the `.keras` artifact first if the cache is missing or stale."""
+        tflite_path = tflite_path_for(model_path)
+        if not os.path.exists(tflite_path) or os.path.getmtime(tflite_path) < os.path.getmtime(model_path):
+            convert_keras_file(model_path, tflite_path)
+        return cls(tflite_path, num_threads=num_threads)
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        """
+        Runs the interpreter for input shape (batch, SEQ_LENGTH, n_features).
+        The flatbuffer has a static batch size of 1, so larger batches are invoked row by row.
+        """
+        x = np.asarray(x, dtype=np.float32)
+        outputs = []
+        with self._lock:
+            for row in x:
+                self.interpreter.set_tensor(self._input['index'], row[np.newaxis, ...])
+                self.interpreter.invoke()
+                outputs.append(self.interpreter.get_tensor(self._output['index'])[0].copy())
+        return np.stack(outputs)
@@ -1,11 +1,18 @@
+import datetime
 import pytest
+import numpy as np
+from unittest.mock import MagicMock
 from flask import Flask
+from src.config import MODEL_TYPE1_CONFIG
 from src.extensions import db as _db
 from src.models.user import User # Import your User model
+from src.models.dataset import Dataset
+from src.models.prediction import Prediction
 from src.routes.auth_routes import auth_bp
 from src.routes.balance_routes import balance_bp
 from src.routes.transaction_routes import transaction_bp
 from src.routes.prediction_routes import prediction_bp
+from src.routes.health_routes import health_bp
 from src.schemas.user_schema import UserSchema, UserRegisterSchema, UserLoginSchema
 from flask_jwt_extended import JWTManager
 
@@ -31,6 +38,7 @@ def app():
         app.register_blueprint(balance_bp)
         app.register_blueprint(transaction_bp)
         app.register_blueprint(prediction_bp)
+        app.register_blueprint(health_bp)
 
         _db.create_all()
         yield app
@@ -52,4 +60,61 @@ def db(app):
     with app.app_context():
         _db.session.begin_nested() # Use nested transaction for rollback
         yield _db
-        _db.session.rollback() # Rollback changes after each test
\ No newline at end of file
+        _db.session.rollback() # Rollback changes after each test
+
+# Constant macro values of the synthetic cleaned_dataset bars
+BAR_MACRO_VALUES = dict(
+    gdp_growth=0.02, consumer_price_index_for_all_urban_consumers=2.5,
+    retail_sales_data_excluding_food_services=500.0, crude_oil_price=80.0,
+    interest_rate_fed_funds=0.05, stock_market_volatility_vix_index=20.0,
+    ten_year_treasury_yield=0.03
+)
+
+@pytest.fixture(scope='function')
+def add_dataset_bars(app):
+    """
+    Factory inserting consecutive one-minute cleaned_dataset bars (needs an app context):
+    add_dataset_bars(company, closes, start) -> timestamp of the last bar. Open/high/low equal
+    the close, volume is 1000 + i. The bars and the predictions of those tickers are deleted
+    after the test.
+    """
+    companies = set()
+
+    def add(company, closes, start):
+        closes = list(closes)
+        for i, close in enumerate(closes):
+            _db.session.add(Dataset(
+                company_prefix=company, date_value=start + datetime.timedelta(minutes=i),
+                open_value=close, high_value=close, low_value=close, close_value=close, volume=1000 + i,
+                **BAR_MACRO_VALUES
+            ))
+        _db.session.commit()
+        companies.add(company)
+        return start + datetime.timedelta(minutes=len(closes) - 1)
+
+    yield add
+    if companies:
+        with app.app_context():
+            _db.session.rollback()
+            Prediction.query.filter(Prediction.ticker.in_(companies)).delete(synchronize_session=False)
+            Dataset.query.filter(Dataset.company_prefix.in_(companies)).delete(synchronize_session=False)
+            _db.session.commit()
+
+@pytest.fixture(scope='function')
+def make_fake_predictor():
+    """
+    Factory of fake Predictors for the batched window paths (backtest, backfill): identity
+    preprocessing and a Type 1 model predicting the window's last close + `offset`.
+    """
+    close = MODEL_TYPE1_CONFIG["FEATURES"].index('close_value')
+
+    def make(offset=1.0):
+        predictor = MagicMock()
+        preprocessor = predictor.get_preprocessor.return_value
+        preprocessor.prepare_input_batch.side_effect = lambda windows: np.array(windows)
+        preprocessor.inverse_transform_batch.side_effect = lambda pred: pred[:, 0]
+        predictor.model_manager.get_model.return_value.predict.side_effect = \
+            lambda batch: batch[:, -1, close:close + 1] + offset
+        return predictor
+
+    return make
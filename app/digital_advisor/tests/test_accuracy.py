@@ -0,0 +1,129 @@
+# test_accuracy.py
+
+import datetime
+import pytest
+from unittest.mock import MagicMock
+
+from src.extensions import db
+from src.models.dataset import Dataset
+from src.models.prediction import Prediction
+from src.models.prediction_accuracy import PredictionAccuracy
+from src.services.accuracy_service import AccuracyTracker
+from src.services.prediction_scheduler import PredictionScheduler
+
+START = datetime.datetime(2024, 4, 1, 14, 0)
+
+
+def _add_bar(company, minute, close):
+    db.session.add(Dataset(
+        company_prefix=company, date_value=START + datetime.timedelta(minutes=minute),
+        open_value=close, high_value=close, low_value=close, close_value=close, volume=1000
+    ))
+
+
+def _add_prediction(company, minute, price):
+    db.session.add(Prediction(ticker=company, timestamp=START + datetime.timedelta(minutes=minute), predicted_price=price))
+
+
+@pytest.fixture
+def tables(app):
+    with app.app_context():
+        yield
+        db.session.rollback()
+        for model, column in ((Dataset, Dataset.company_prefix), (Prediction, Prediction.ticker),
+                              (PredictionAccuracy, PredictionAccuracy.ticker)):
+            model.query.filter(column.in_(['APP', 'PEP'])).delete(synchronize_session=False)
+        db.session.commit()
+
+
+def test_update_scores_only_newly_realized_predictions(tables):
+    # Bars for minutes 0..2; predictions for 1, 2 and 3 (minute 3 has no bar yet)
+    for minute, close in enumerate([100.0, 102.0, 104.0]):
+        _add_bar('APP', minute, close)
+    _add_prediction('APP', 1, 101.0)  # error 1
+    _add_prediction('APP', 2, 107.0)  # error 3
+    _add_prediction('APP', 3, 110.0)
+    db.session.commit()
+
+    tracker = AccuracyTracker()
+    assert tracker.update(['APP', 'PEP']) == {'APP': 2}
+    assert tracker.update(['APP']) == {}  # Nothing new: the watermark skips scored predictions
+
+    _add_bar('APP', 3, 108.0)  # Realizes the minute-3 prediction (error 2)
+    db.session.commit()
+    assert tracker.update(['APP']) == {'APP': 1}
+
+    bucket = PredictionAccuracy.query.filter_by(ticker='APP').one()
+    assert bucket.count == 3
+    assert bucket.sum_abs_error == pytest.approx(6.0)
+    assert bucket.sum_sq_error == pytest.approx(1 + 9 + 4)
+    assert bucket.last_scored_timestamp == START + datetime.timedelta(minutes=3)
+
+
+def test_get_accuracy_rolling_windows(tables):
+    # One realized prediction per bucket: 3 hours ago (error 4) and in the current hour (error 2)
+    _add_bar('APP', -180, 100.0)
+    _add_prediction('APP', -180, 104.0)
+    _add_bar('APP', 30, 100.0)
+    _add_prediction('APP', 30, 98.0)
+    db.session.commit()
+
+    tracker = AccuracyTracker()
+    tracker.update(['APP'])
+    accuracy = tracker.get_accuracy(['app', 'PEP'])
+
+    assert set(accuracy) == {'APP'}
+    assert accuracy['APP']['1h'] == {"count": 1, "mae": 2.0, "rmse": 2.0, "mape_pct": pytest.approx(2.0)}
+    assert accuracy['APP']['24h']['count'] == 2
+    assert accuracy['APP']['24h']['mae'] == pytest.approx(3.0)
+    assert accuracy['APP']['24h']['rmse'] == pytest.approx((10.0) ** 0.5)
+    assert accuracy['APP']['all']['count'] == 2
+
+
+def test_accuracy_endpoint(client, tables):
+    _add_bar('APP', 0, 100.0)
+    _add_prediction('APP', 0, 101.0)
+    db.session.commit()
+    AccuracyTracker().update(['APP'])
+
+    response = client.get('/predict/accuracy?tickers=APP')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["windows"] == ["1h", "24h", "7d", "30d", "all"]
+    assert body["accuracy"]["APP"]["all"]["mae"] == pytest.approx(1.0)
+
+
+def test_scheduler_tick_updates_accuracy(app, tables):
+    """New bars seen by the scheduler realize earlier predictions, which get scored in the same tick."""
+    _add_bar('APP', 0, 100.0)
+    _add_prediction('APP', 0, 103.0)
+    db.session.commit()
+
+    service = MagicMock()
+    service.run_predictions.return_value = ({'APP': 101.0}, {})
+    scheduler = PredictionScheduler(app, lambda: service, companies=['APP'], lock_file=None)
+    assert scheduler.run_once()["updated"] == ['APP']
+
+    with app.app_context():
+        assert AccuracyTracker().get_accuracy(['APP'])['APP']['all']['mae'] == pytest.approx(3.0)
+
+
+def test_update_scores_late_writes_and_skips_backfilled_predictions(tables):
+    """Rows inserted after a run for earlier minutes are still scored; backfilled rows never are."""
+    for minute, close in enumerate([100.0, 102.0, 104.0]):
+        _add_bar('APP', minute, close)
+    db.session.add(Prediction(ticker='APP', timestamp=START, predicted_price=150.0,
+                              source=Prediction.SOURCE_BACKFILL))
+    _add_prediction('APP', 2, 105.0)  # error 1
+    db.session.commit()
+
+    tracker = AccuracyTracker()
+    assert tracker.update(['APP']) == {'APP': 1}
+
+    _add_prediction('APP', 1, 104.0)  # Written late for an earlier minute (error 2)
+    db.session.commit()
+    assert tracker.update(['APP']) == {'APP': 1}
+
+    accuracy = tracker.get_accuracy(['APP'])['APP']['all']
+    assert accuracy['count'] == 2
+    assert accuracy['mae'] == pytest.approx(1.5)
@@ -0,0 +1,101 @@
+# test_artifact_bundle.py
+
+import json
+import os
+import subprocess
+import sys
+import pytest
+import numpy as np
+from unittest.mock import patch
+
+from src.config import MODEL_TYPE1_CONFIG, MODEL_TYPE2_CONFIG
+from src.services.prediction_service import Predictor
+from src.utils.artifact_bundle import ArtifactBundle, build_bundles, manifest_path
+from src.utils.numpy_inference import NumpyModel
+from src.utils.prediction_utils import BasePreprocessor, Type2Preprocessor, ModelManager
+
+TYPE1_COMPANY = MODEL_TYPE1_CONFIG["COMPANIES"][0]
+TYPE2_COMPANY = MODEL_TYPE2_CONFIG["COMPANIES"][0]
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+@pytest.fixture(scope='module')
+def bundle_dir(tmp_path_factory):
+    for company, model_config in ((TYPE1_COMPANY, MODEL_TYPE1_CONFIG), (TYPE2_COMPANY, MODEL_TYPE2_CONFIG)):
+        if not os.path.exists(os.path.join(model_config["MODEL_DIR"], f"{company}_model.keras")):
+            pytest.skip(f"No saved artifacts for {company}")
+    path = str(tmp_path_factory.mktemp("bundles"))
+    result = build_bundles([TYPE1_COMPANY, TYPE2_COMPANY, "XYZ"], path)
+    assert set(result["built"]) == {TYPE1_COMPANY, TYPE2_COMPANY}
+    assert "XYZ" in result["errors"]
+    return path
+
+
+def _window(model_config, seed=0):
+    rng = np.random.default_rng(seed)
+    window = rng.random((model_config["SEQ_LENGTH"], len(model_config["FEATURES"])))
+    window[:, 0] += 100
+    return window
+
+
+@pytest.mark.parametrize("company,model_config,preprocessor_class", [
+    (TYPE1_COMPANY, MODEL_TYPE1_CONFIG, BasePreprocessor),
+    (TYPE2_COMPANY, MODEL_TYPE2_CONFIG, Type2Preprocessor),
+])
+def test_bundle_matches_legacy_artifacts(bundle_dir, company, model_config, preprocessor_class):
+    """The memory-mapped bundle reproduces the pickled preprocessors and the .keras weights."""
+    bundle = ArtifactBundle.open(company, bundle_dir)
+    assert all(isinstance(array, np.memmap) for array in bundle.arrays.values())
+
+    legacy = preprocessor_class(company)
+    bundled = preprocessor_class.from_bundle(bundle)
+    windows = np.stack([_window(model_config, seed) for seed in range(3)])
+    legacy_input = legacy.prepare_input_batch(windows)
+    np.testing.assert_allclose(bundled.prepare_input_batch(windows), legacy_input, rtol=1e-6)
+
+    legacy_model = NumpyModel.from_keras_file(os.path.join(model_config["MODEL_DIR"], f"{company}_model.keras"))
+    output = bundle.load_model().predict(legacy_input)
+    np.testing.assert_array_equal(output, legacy_model.predict(legacy_input))
+    np.testing.assert_allclose(bundled.inverse_transform_batch(output), legacy.inverse_transform_batch(output), rtol=1e-6)
+
+
+def test_predictor_serves_from_bundles(bundle_dir):
+    with patch('src.utils.artifact_bundle.BUNDLE_DIR', bundle_dir):
+        bundled = Predictor(backend="numpy", use_inference_pool=False)
+        bundled.model_manager = ModelManager(backend="numpy", artifact_format="bundle")
+        legacy = Predictor(backend="numpy", use_inference_pool=False)
+        for company, model_config in ((TYPE1_COMPANY, MODEL_TYPE1_CONFIG), (TYPE2_COMPANY, MODEL_TYPE2_CONFIG)):
+            window = _window(model_config)
+            assert bundled.predict_window(company, window) == pytest.approx(legacy.predict_window(company, window), rel=1e-6)
+        assert bundled.model_manager.models.stats()["loads"] == 2
+
+
+def test_bundle_rejects_missing_and_stale_bundles(bundle_dir, tmp_path):
+    with pytest.raises(FileNotFoundError, match="flask build-artifact-bundles"):
+        ArtifactBundle.open(TYPE1_COMPANY, str(tmp_path))
+
+    with open(manifest_path(TYPE1_COMPANY, bundle_dir)) as f:
+        manifest = json.load(f)
+    manifest["features"] = list(reversed(manifest["features"]))
+    stale_dir = tmp_path / TYPE1_COMPANY
+    stale_dir.mkdir()
+    (stale_dir / "manifest.json").write_text(json.dumps(manifest))
+    with pytest.raises(ValueError, match="do not match the configured FEATURES"):
+        ArtifactBundle.open(TYPE1_COMPANY, str(tmp_path))
+
+
+def test_bundle_serving_does_not_import_sklearn(bundle_dir):
+    """Serving from bundles needs neither sklearn unpickling nor TensorFlow."""
+    code = (
+        "import sys, numpy as np\n"
+        "from src.services.prediction_service import Predictor\n"
+        "p = Predictor(use_inference_pool=False)\n"
+        f"p.predict_window('{TYPE2_COMPANY}', np.random.rand({MODEL_TYPE2_CONFIG['SEQ_LENGTH']}, "
+        f"{len(MODEL_TYPE2_CONFIG['FEATURES'])}) + 100)\n"
+        "print(sorted(m for m in ('sklearn', 'tensorflow') if m in sys.modules))\n"
+    )
+    env = dict(os.environ, ARTIFACT_FORMAT="bundle", INFERENCE_BACKEND="numpy", BUNDLE_DIR=bundle_dir)
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_DIR, env=env,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "[]"
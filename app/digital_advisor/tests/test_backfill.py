@@ -0,0 +1,80 @@
+# test_backfill.py
+
+import datetime
+import pytest
+
+from src.config import MODEL_TYPE1_CONFIG
+from src.extensions import db
+from src.models.prediction import Prediction
+from src.services.backfill_service import BackfillService
+from src.services.prediction_storage_service import PredictionStorageService
+
+START = datetime.datetime(2024, 3, 4, 14, 30)
+SEQ_LENGTH = MODEL_TYPE1_CONFIG["SEQ_LENGTH"]
+NUM_BARS = 120
+
+
+@pytest.fixture
+def seeded(app, add_dataset_bars):
+    with app.app_context():
+        add_dataset_bars('APP', [100.0 + i for i in range(NUM_BARS)], START)
+        yield
+
+
+def test_backfill_stores_one_prediction_per_minute(seeded, make_fake_predictor):
+    results, errors = BackfillService(make_fake_predictor()).backfill(['app', 'XYZ'], batch_size=16, chunk_size=25)
+
+    assert set(errors) == {'XYZ'}
+    # ma30 drops the first 29 bars; every remaining full window, including the newest, predicts its next minute
+    expected = NUM_BARS - 29 - SEQ_LENGTH + 1
+    assert results['APP']['predicted'] == results['APP']['written'] == expected
+    last = START + datetime.timedelta(minutes=NUM_BARS)
+    assert results['APP']['end'] == last.isoformat()
+
+    stored = Prediction.query.filter_by(ticker='APP').order_by(Prediction.timestamp).all()
+    assert len(stored) == expected
+    assert {p.source for p in stored} == {Prediction.SOURCE_BACKFILL}
+    # The prediction for minute m is the close of minute m - 1 plus one: 100 + (m - 1) + 1
+    assert all(p.predicted_price == pytest.approx(100.0 + (p.timestamp - START).total_seconds() / 60) for p in stored)
+
+
+def test_backfill_range_keeps_existing_unless_overwrite(seeded, make_fake_predictor):
+    start = START + datetime.timedelta(minutes=100)
+    end = START + datetime.timedelta(minutes=109)
+    db.session.add(Prediction(ticker='APP', timestamp=start, predicted_price=1.0))
+    db.session.commit()
+
+    results, errors = BackfillService(make_fake_predictor()).backfill(['APP'], start=start, end=end)
+    assert errors == {}
+    assert results['APP']['predicted'] == 10
+    assert results['APP']['written'] == 9
+    kept = Prediction.query.filter_by(ticker='APP', timestamp=start).one()
+    assert (kept.predicted_price, kept.source) == (1.0, Prediction.SOURCE_LIVE)
+
+    # Re-running is idempotent; --overwrite replaces every row of the range
+    assert BackfillService(make_fake_predictor()).backfill(['APP'], start=start, end=end)[0]['APP']['written'] == 0
+    results, _ = BackfillService(make_fake_predictor(offset=2.0)).backfill(['APP'], start=start, end=end, overwrite=True)
+    assert results['APP']['written'] == 10
+    replaced = Prediction.query.filter_by(ticker='APP', timestamp=start).one()
+    assert replaced.predicted_price == pytest.approx(201.0)
+    assert replaced.source == Prediction.SOURCE_BACKFILL
+    assert Prediction.query.filter_by(ticker='APP').count() == 10
+
+
+def test_bulk_upsert_fallback_without_on_conflict(app):
+    with app.app_context():
+        storage = PredictionStorageService()
+        rows = [{"ticker": 'PEP', "timestamp": START + datetime.timedelta(minutes=i), "predicted_price": float(i)}
+                for i in range(5)]
+        try:
+            assert storage._insert_missing(rows[:3], overwrite=False) == 3
+            assert storage._insert_missing(rows, overwrite=False) == 2
+            rows[0]["predicted_price"] = 42.0
+            assert storage._insert_missing(rows[:1], overwrite=True) == 1
+            db.session.commit()
+            assert Prediction.query.filter_by(ticker='PEP', timestamp=START).one().predicted_price == 42.0
+            assert Prediction.query.filter_by(ticker='PEP').count() == 5
+        finally:
+            db.session.rollback()
+            Prediction.query.filter_by(ticker='PEP').delete()
+            db.session.commit()
@@ -0,0 +1,76 @@
+# test_backtest.py
+
+import datetime
+import os
+import pytest
+import numpy as np
+
+from src.config import MODEL_TYPE1_CONFIG
+from src.models.dataset import Dataset
+from src.services.backtest_service import BacktestService, backtest_metrics
+from src.services.prediction_service import Predictor, build_raw_input_from_rows, BASE_QUERY_COLUMNS
+
+START = datetime.datetime(2024, 3, 4, 14, 30)
+SEQ_LENGTH = MODEL_TYPE1_CONFIG["SEQ_LENGTH"]
+NUM_BARS = 120
+
+
+@pytest.fixture
+def seeded(app, add_dataset_bars):
+    with app.app_context():
+        add_dataset_bars('APP', [100.0 + i + np.sin(i) for i in range(NUM_BARS)], START)
+        yield
+
+
+def test_backtest_metrics():
+    metrics = backtest_metrics(np.array([11.0, 9.0, 10.5]), np.array([12.0, 8.0, 10.0]), np.array([10.0, 10.0, 10.0]))
+    assert metrics["samples"] == 3
+    assert metrics["mae"] == pytest.approx((1 + 1 + 0.5) / 3)
+    assert metrics["rmse"] == pytest.approx(np.sqrt((1 + 1 + 0.25) / 3))
+    assert metrics["directional_accuracy"] == 1.0
+    assert metrics["naive_mae"] == pytest.approx((2 + 2 + 0) / 3)
+
+
+def test_backtest_scores_every_window_in_batches(seeded, make_fake_predictor):
+    predictor = make_fake_predictor()
+    results, errors = BacktestService(predictor).run_backtest(['app', 'XYZ'], batch_size=7)
+
+    assert set(errors) == {'XYZ'}
+    metrics = results['APP']
+    # ma30 needs 30 bars, so the first 29 bars are dropped before windows are cut
+    assert metrics['samples'] == NUM_BARS - 29 - SEQ_LENGTH
+    model = predictor.model_manager.get_model.return_value
+    assert model.predict.call_count == -(-metrics['samples'] // 7)
+    # The fake predicts last close + 1; the actual move is 1 + sin(i) - sin(i - 1)
+    closes = 100.0 + np.arange(NUM_BARS) + np.sin(np.arange(NUM_BARS))
+    expected_errors = (closes[:-1] + 1.0 - closes[1:])[-metrics['samples']:]
+    assert metrics['mae'] == pytest.approx(np.mean(np.abs(expected_errors)))
+    assert metrics['end'] == (START + datetime.timedelta(minutes=NUM_BARS - 1)).isoformat()
+
+
+def test_backtest_restricts_to_range_with_warmup(seeded, make_fake_predictor):
+    """Bars before `start` only warm up the indicators and the first window."""
+    start = START + datetime.timedelta(minutes=100)
+    end = START + datetime.timedelta(minutes=109)
+    results, errors = BacktestService(make_fake_predictor()).run_backtest(['APP'], start=start, end=end)
+
+    assert errors == {}
+    assert results['APP']['samples'] == 10
+    assert results['APP']['start'] == start.isoformat()
+    assert results['APP']['end'] == end.isoformat()
+
+
+def test_backtest_matches_single_predictions(seeded):
+    """Batched inference over strided windows equals the live single-window prediction."""
+    if not os.path.exists(os.path.join(MODEL_TYPE1_CONFIG["MODEL_DIR"], "APP_model.keras")):
+        pytest.skip("No saved model for APP")
+    predictor = Predictor(backend="numpy", use_inference_pool=False)
+    last_bar = START + datetime.timedelta(minutes=NUM_BARS - 1)
+    results, _ = BacktestService(predictor).run_backtest(['APP'], start=last_bar, end=last_bar)
+
+    rows = Dataset.query.with_entities(*BASE_QUERY_COLUMNS).filter(
+        Dataset.company_prefix == 'APP', Dataset.date_value < last_bar).all()
+    expected = predictor.predict('APP', build_raw_input_from_rows('APP', rows, MODEL_TYPE1_CONFIG))
+    actual_close = 100.0 + (NUM_BARS - 1) + np.sin(NUM_BARS - 1)
+    assert results['APP']['samples'] == 1
+    assert results['APP']['mae'] == pytest.approx(abs(expected - actual_close), rel=1e-6)
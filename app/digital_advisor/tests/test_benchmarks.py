@@ -0,0 +1,34 @@
+# test_benchmarks.py
+
+import pytest
+import numpy as np
+from types import SimpleNamespace
+
+from src.config import MODEL_TYPE1_CONFIG, MODEL_TYPE2_CONFIG
+from src.services.prediction_service import Predictor, build_feature_matrix_from_rows
+from benchmarks.synthetic import synthetic_bars, build_synthetic_artifacts, use_artifact_dir
+
+
+def test_synthetic_bars_are_deterministic_and_complete():
+    bars = synthetic_bars('APP', 100, seed=3)
+    assert bars == synthetic_bars('APP', 100, seed=3)
+    assert bars != synthetic_bars('PEP', 100, seed=3)
+    assert len(bars) == 100 and all(bar['close_value'] > 0 for bar in bars)
+
+
+def test_synthetic_artifacts_serve_predictions(tmp_path, monkeypatch):
+    pytest.importorskip("keras")
+    # use_artifact_dir mutates the shared config dicts; register them for restoring first
+    for config in (MODEL_TYPE1_CONFIG, MODEL_TYPE2_CONFIG):
+        for key in ("MODEL_DIR", "SCALER_DIR", "PCA_DIR"):
+            monkeypatch.setitem(config, key, config[key])
+
+    build_synthetic_artifacts(str(tmp_path), ['APP', 'META'], num_bars=200)
+    use_artifact_dir(str(tmp_path))
+    assert (tmp_path / "saved_pca_models" / "META_pca.pkl").exists()
+
+    predictor = Predictor(backend="numpy", use_inference_pool=False, micro_batching=False)
+    for company, model_config in (('APP', MODEL_TYPE1_CONFIG), ('META', MODEL_TYPE2_CONFIG)):
+        rows = [SimpleNamespace(**bar) for bar in synthetic_bars(company, 200)]
+        window = build_feature_matrix_from_rows(company, rows, model_config)[-model_config["SEQ_LENGTH"]:]
+        assert np.isfinite(predictor.predict_window(company, window))
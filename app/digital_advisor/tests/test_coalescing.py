@@ -0,0 +1,121 @@
+# test_coalescing.py
+
+import datetime
+import threading
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+
+from src.extensions import db
+from src.models.prediction_claim import PredictionClaim
+from src.services.prediction_service import PredictionService
+from src.services.prediction_storage_service import PredictionStorageService
+from src.utils.single_flight import SingleFlight
+
+TARGET = datetime.datetime(2024, 1, 2, 15, 0)
+
+
+# --- SingleFlight ---
+def test_single_flight_runs_once_for_concurrent_callers():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(2)
+        return 42.0
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do(('APP', TARGET), compute))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 2
+    while flight.in_flight().get(('APP', TARGET), 0) < 7 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [42.0] * 8
+    assert len(calls) == 1
+    assert flight.in_flight() == {}
+    # The key is forgotten once the call finished
+    assert flight.do(('APP', TARGET), lambda: 7.0) == 7.0
+
+
+def test_single_flight_shares_exceptions():
+    flight = SingleFlight()
+    started = threading.Event()
+    errors = []
+
+    def failing():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError("Not enough historical data")
+
+    def follower():
+        started.wait()
+        try:
+            flight.do('key', lambda: 1.0)
+        except ValueError as e:
+            errors.append(str(e))
+
+    thread = threading.Thread(target=follower)
+    thread.start()
+    with pytest.raises(ValueError):
+        flight.do('key', failing)
+    thread.join()
+    assert errors == ["Not enough historical data"]
+
+
+# --- DB claims ---
+@pytest.fixture
+def storage(app):
+    with app.app_context():
+        yield PredictionStorageService()
+        db.session.rollback()
+        PredictionClaim.query.delete()
+        db.session.commit()
+
+
+def test_claim_is_exclusive_until_released(storage):
+    assert storage.try_claim('APP', TARGET, 'host-a:1', ttl_seconds=30)
+    assert not storage.try_claim('APP', TARGET, 'host-b:2', ttl_seconds=30)
+    assert storage.try_claim('APP', TARGET + datetime.timedelta(minutes=1), 'host-b:2', ttl_seconds=30)
+
+    storage.release_claim('APP', TARGET, 'host-a:1')
+    assert storage.try_claim('APP', TARGET, 'host-b:2', ttl_seconds=30)
+
+
+def test_abandoned_claim_is_taken_over(storage):
+    db.session.add(PredictionClaim(ticker='APP', timestamp=TARGET, claimed_by='dead:1',
+                                   claimed_at=datetime.datetime.utcnow() - datetime.timedelta(minutes=5)))
+    db.session.commit()
+    assert storage.try_claim('APP', TARGET, 'host-b:2', ttl_seconds=30)
+    assert PredictionClaim.query.filter_by(ticker='APP', timestamp=TARGET).one().claimed_by == 'host-b:2'
+
+
+def test_service_waits_for_prediction_claimed_by_another_worker(storage):
+    service = PredictionService()
+    service.predictor = MagicMock()
+    storage.try_claim('APP', TARGET, 'other-host:99', ttl_seconds=30)
+
+    with patch('src.services.prediction_service.PREDICTION_CLAIMS_ENABLED', True), \
+         patch.object(service.prediction_storage, 'wait_for_prediction',
+                      return_value=MagicMock(predicted_price=151.5)) as mock_wait:
+        value = service._generate_with_claim('APP', {"SEQ_LENGTH": 30, "FEATURES": []}, TARGET, None)
+
+    assert value == 151.5
+    mock_wait.assert_called_once()
+    service.predictor.predict.assert_not_called()
+
+
+def test_service_releases_its_claim_after_generating(storage):
+    service = PredictionService()
+    with patch('src.services.prediction_service.PREDICTION_CLAIMS_ENABLED', True), \
+         patch.object(service, '_generate_from_dataset', return_value=150.0) as mock_generate:
+        assert service._generate_with_claim('APP', {}, TARGET, None) == 150.0
+
+    mock_generate.assert_called_once()
+    assert PredictionClaim.query.count() == 0
@@ -0,0 +1,95 @@
+# test_feature_buffer.py
+
+import datetime
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from src.config import MODEL_TYPE2_CONFIG
+from src.utils.feature_buffer import RollingFeatureBuffer, RAW_FEATURE_COLUMNS
+
+FEATURES = MODEL_TYPE2_CONFIG["FEATURES"]
+SEQ_LENGTH = MODEL_TYPE2_CONFIG["SEQ_LENGTH"]
+
+
+def _raw_frame(n_rows, seed=3):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-02 14:30', periods=n_rows, freq='min')
+    frame = pd.DataFrame({name: rng.random(n_rows) * 10 + 1 for name in RAW_FEATURE_COLUMNS}, index=index)
+    frame['close_value'] = 100 + np.cumsum(rng.normal(0, 0.5, n_rows))
+    return frame
+
+
+def _pandas_window(frame):
+    """The legacy DataFrame feature engineering the buffer has to reproduce."""
+    frame = frame.copy()
+    frame['ma10'] = frame['close_value'].rolling(window=10).mean()
+    frame['ma30'] = frame['close_value'].rolling(window=30).mean()
+    frame['volatility'] = frame['close_value'].rolling(window=10).std()
+    return frame[FEATURES].dropna().iloc[-SEQ_LENGTH:].to_numpy()
+
+
+def _fill(buffer, frame):
+    for timestamp, row in frame.iterrows():
+        buffer.append(timestamp, row.to_dict())
+
+
+def test_window_matches_pandas_rolling_features():
+    """ma10, ma30 and volatility (ddof=1) match the pandas rolling features bar by bar."""
+    frame = _raw_frame(200)
+    buffer = RollingFeatureBuffer(FEATURES, SEQ_LENGTH)
+    _fill(buffer, frame.iloc[:SEQ_LENGTH + 29])
+    assert buffer.is_ready()
+    for end in range(SEQ_LENGTH + 29, len(frame)):
+        np.testing.assert_allclose(buffer.window(), _pandas_window(frame.iloc[:end]), rtol=1e-9)
+        _fill(buffer, frame.iloc[end:end + 1])
+    assert buffer.last_timestamp == frame.index[-1]
+
+
+def test_window_is_a_contiguous_view():
+    frame = _raw_frame(75)
+    buffer = RollingFeatureBuffer(FEATURES, SEQ_LENGTH)
+    _fill(buffer, frame)
+    window = buffer.window()
+    assert window.shape == (SEQ_LENGTH, len(FEATURES))
+    assert window.base is buffer._rows and window.flags['C_CONTIGUOUS']
+
+
+def test_not_ready_until_long_window_is_defined():
+    frame = _raw_frame(SEQ_LENGTH + 28)
+    buffer = RollingFeatureBuffer(FEATURES, SEQ_LENGTH)
+    _fill(buffer, frame)
+    assert not buffer.is_ready()  # ma30 is still undefined for the oldest row
+    _fill(buffer, _raw_frame(1, seed=9))
+    assert buffer.is_ready()
+
+
+def test_missing_macro_value_makes_window_not_ready():
+    frame = _raw_frame(80)
+    frame.iloc[-3, frame.columns.get_loc('crude_oil_price')] = None
+    buffer = RollingFeatureBuffer(FEATURES, SEQ_LENGTH)
+    for timestamp, row in frame.iterrows():
+        buffer.append(timestamp, {k: (None if pd.isna(v) else v) for k, v in row.items()})
+    assert not buffer.is_ready()
+
+
+def test_periodic_exact_recompute_keeps_parity():
+    frame = _raw_frame(150, seed=11)
+    buffer = RollingFeatureBuffer(FEATURES, SEQ_LENGTH)
+    with patch('src.utils.feature_buffer.RESYNC_SUMS_EVERY', 7):
+        _fill(buffer, frame)
+    np.testing.assert_allclose(buffer.window(), _pandas_window(frame), rtol=1e-9)
+
+
+def test_copy_is_independent_and_reset_clears():
+    frame = _raw_frame(90)
+    buffer = RollingFeatureBuffer(FEATURES, SEQ_LENGTH)
+    _fill(buffer, frame.iloc[:80])
+    clone = buffer.copy()
+    _fill(clone, frame.iloc[80:])
+    np.testing.assert_allclose(buffer.window(), _pandas_window(frame.iloc[:80]), rtol=1e-9)
+    np.testing.assert_allclose(clone.window(), _pandas_window(frame), rtol=1e-9)
+
+    buffer.reset()
+    assert buffer.count == 0 and buffer.last_timestamp is None and not buffer.is_ready()
@@ -0,0 +1,72 @@
+# test_horizon.py
+
+import datetime
+import numpy as np
+import pytest
+from unittest.mock import patch, MagicMock
+
+from src.config import MODEL_TYPE1_CONFIG
+from src.services.prediction_service import PredictionService
+
+START = datetime.datetime(2024, 1, 3, 14, 30)
+FEATURES = MODEL_TYPE1_CONFIG["FEATURES"]
+CLOSE = FEATURES.index('close_value')
+MA10 = FEATURES.index('ma10')
+
+
+@pytest.fixture
+def seeded(app, add_dataset_bars):
+    with app.app_context():
+        yield {'APP': add_dataset_bars('APP', [100.0 + i for i in range(70)], START),
+               'PEP': add_dataset_bars('PEP', [50.0 + i for i in range(20)], START)}
+
+
+def _step_model(windows):
+    """Fake one-step model: next close = last close + 1."""
+    return {company: float(window[-1, CLOSE]) + 1.0 for company, window in windows.items()}, {}
+
+
+def test_rollout_feeds_predictions_back_into_the_window(seeded):
+    service = PredictionService()
+    service.predictor = MagicMock()
+    seen_windows = []
+    service.predictor.predict_windows.side_effect = lambda windows: (
+        seen_windows.append({c: w.copy() for c, w in windows.items()}) or _step_model(windows))
+
+    paths, errors = service.run_prediction_paths(['app', 'PEP', 'XYZ'], horizon=3)
+
+    assert set(errors) == {'PEP', 'XYZ'}  # PEP has too few bars for ma30 + a full window
+    assert [p['predicted_close_value'] for p in paths['APP']] == [170.0, 171.0, 172.0]
+    assert [p['timestamp'] for p in paths['APP']] == [seeded['APP'] + datetime.timedelta(minutes=k) for k in (1, 2, 3)]
+    # One batched model call per step
+    assert service.predictor.predict_windows.call_count == 3
+
+    # The third step's window ends with the two synthetic bars and their incrementally updated ma10
+    last_window = seen_windows[2]['APP']
+    np.testing.assert_allclose(last_window[-2:, CLOSE], [170.0, 171.0])
+    np.testing.assert_allclose(last_window[-1, MA10], np.mean(np.arange(162.0, 172.0)))
+
+    # The live buffer is left untouched by the rollout
+    assert service.feature_buffers['APP'].last_timestamp == seeded['APP']
+
+
+def test_rollout_rejects_invalid_horizon(seeded):
+    service = PredictionService()
+    with pytest.raises(ValueError, match="horizon must be between 1"):
+        service.run_prediction_paths(['APP'], horizon=0)
+
+
+def test_predict_route_with_horizon(client):
+    mock_service = MagicMock()
+    mock_service.run_prediction_paths.return_value = (
+        {'APP': [{"timestamp": START, "predicted_close_value": 101.0}]}, {})
+    with patch('src.routes.prediction_routes.get_prediction_service', return_value=mock_service):
+        response = client.get('/predict?ticker=app&horizon=1')
+        assert response.status_code == 200
+        assert response.get_json() == {"ticker": "APP", "horizon": 1,
+                                       "path": [{"timestamp": START.isoformat(), "predicted_close_value": 101.0}]}
+        mock_service.run_prediction_paths.assert_called_once_with(['APP'], 1)
+
+        assert client.get('/predict?ticker=app&horizon=soon').status_code == 400
+        batch = client.get('/predict/batch?tickers=app,pep&horizon=1').get_json()
+        assert batch['horizon'] == 1 and 'APP' in batch['paths']
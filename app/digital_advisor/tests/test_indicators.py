@@ -0,0 +1,84 @@
+# test_indicators.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.indicators import (
+    sma, rolling_std, ema, log_returns, log_return_volatility, rsi, derived_model_features
+)
+from src.utils.prediction_utils import _calculate_moving_average, _calculate_volatility
+
+
+@pytest.fixture
+def closes():
+    rng = np.random.default_rng(5)
+    return 100 + np.cumsum(rng.normal(0, 1, (3, 120)), axis=1)
+
+
+def _pandas(series_batch, fn):
+    return np.array([fn(pd.Series(row)).to_numpy() for row in series_batch])
+
+
+def test_sma_and_rolling_std_match_pandas(closes):
+    np.testing.assert_allclose(sma(closes, 10), _pandas(closes, lambda s: s.rolling(10).mean()), equal_nan=True)
+    np.testing.assert_allclose(rolling_std(closes, 10), _pandas(closes, lambda s: s.rolling(10).std()), equal_nan=True)
+    np.testing.assert_allclose(rolling_std(closes[0], 5, ddof=0), pd.Series(closes[0]).rolling(5).std(ddof=0), equal_nan=True)
+
+
+def test_sma_propagates_nan_only_inside_window(closes):
+    series = closes[0].copy()
+    series[50] = np.nan
+    np.testing.assert_allclose(sma(series, 10), pd.Series(series).rolling(10).mean(), equal_nan=True)
+
+
+def test_ema_log_returns_and_volatility_match_pandas(closes):
+    np.testing.assert_allclose(ema(closes, span=12), _pandas(closes, lambda s: s.ewm(span=12, adjust=False).mean()))
+    np.testing.assert_allclose(log_returns(closes[1]), np.log(pd.Series(closes[1])).diff(), equal_nan=True)
+    expected = _pandas(closes, lambda s: np.log(s).diff().rolling(20).std())
+    np.testing.assert_allclose(log_return_volatility(closes, 20), expected, equal_nan=True)
+
+
+def test_rsi_matches_wilder_reference(closes):
+    series = closes[2]
+    window = 14
+    deltas = np.diff(series)
+    avg_gain, avg_loss = np.clip(deltas[:window], 0, None).mean(), np.clip(-deltas[:window], 0, None).mean()
+    expected = [100 - 100 / (1 + avg_gain / avg_loss)]
+    for delta in deltas[window:]:
+        avg_gain = (avg_gain * (window - 1) + max(delta, 0)) / window
+        avg_loss = (avg_loss * (window - 1) + max(-delta, 0)) / window
+        expected.append(100 - 100 / (1 + avg_gain / avg_loss))
+
+    result = rsi(series, window)
+    assert np.isnan(result[:window]).all()
+    np.testing.assert_allclose(result[window:], expected)
+    assert rsi(np.arange(30.0), window)[-1] == 100.0
+
+
+def test_derived_model_features_batch_matches_single(closes):
+    batch = derived_model_features(closes)
+    single = derived_model_features(closes[1])
+    for name in ('ma10', 'ma30', 'volatility', 'log_returns'):
+        np.testing.assert_allclose(batch[name][1], single[name], equal_nan=True)
+
+
+def test_legacy_helpers_keep_zero_padded_output():
+    data = [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert _calculate_moving_average(data, 3) == [0.0, 0.0, 2.0, 3.0, 4.0]
+    assert _calculate_moving_average([], 3) == []
+
+    volatility = _calculate_volatility(data, window=2)
+    returns = np.diff(np.log(data))
+    padded = [0.0] + returns.tolist()
+    assert len(volatility) == len(data) and volatility[0] == 0.0
+    np.testing.assert_allclose(volatility[1:], [np.std(padded[i:i + 2]) for i in range(len(returns))])
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        sma([1.0, 2.0], 0)
+    with pytest.raises(ValueError):
+        ema([1.0, 2.0])
+    with pytest.raises(ValueError):
+        sma(np.zeros((2, 2, 2)), 2)
@@ -0,0 +1,96 @@
+# test_inference_pool.py
+
+import os
+import pytest
+import numpy as np
+
+from src.config import MODEL_TYPE1_CONFIG, MODEL_TYPE2_CONFIG
+from src.services.prediction_service import Predictor
+from src.utils.inference_pool import InferencePool
+
+SEQ_LENGTH = max(MODEL_TYPE1_CONFIG["SEQ_LENGTH"], MODEL_TYPE2_CONFIG["SEQ_LENGTH"])
+NUM_FEATURES = max(len(MODEL_TYPE1_CONFIG["FEATURES"]), len(MODEL_TYPE2_CONFIG["FEATURES"]))
+TYPE1_COMPANY = MODEL_TYPE1_CONFIG["COMPANIES"][0]
+TYPE2_COMPANY = MODEL_TYPE2_CONFIG["COMPANIES"][0]
+
+
+def _has_artifacts(company, model_config):
+    return os.path.exists(os.path.join(model_config["MODEL_DIR"], f"{company}_model.keras"))
+
+
+@pytest.fixture(scope='module')
+def pool():
+    """A real two-worker pool on the NumPy backend (spawned processes, shared memory)."""
+    if not (_has_artifacts(TYPE1_COMPANY, MODEL_TYPE1_CONFIG) and _has_artifacts(TYPE2_COMPANY, MODEL_TYPE2_CONFIG)):
+        pytest.skip("Saved model artifacts are required for the inference pool tests")
+    inference_pool = InferencePool(num_workers=2, seq_length=SEQ_LENGTH, num_features=NUM_FEATURES,
+                                   slots=4, backend="numpy", timeout_seconds=120)
+    yield inference_pool
+    inference_pool.shutdown()
+
+
+def _random_window(model_config, seed):
+    rng = np.random.default_rng(seed)
+    window = rng.random((model_config["SEQ_LENGTH"], len(model_config["FEATURES"])))
+    window[:, 0] = 100 + rng.random(model_config["SEQ_LENGTH"]) # Plausible close prices
+    return window
+
+
+def test_inference_pool_matches_in_process_predictions(pool):
+    """Predictions served from worker processes equal the in-process Predictor's."""
+    local = Predictor(backend="numpy", use_inference_pool=False)
+    for seed, (company, model_config) in enumerate([(TYPE1_COMPANY, MODEL_TYPE1_CONFIG),
+                                                    (TYPE2_COMPANY, MODEL_TYPE2_CONFIG)]):
+        window = _random_window(model_config, seed)
+        assert pool.predict(company, window) == pytest.approx(local.predict_window(company, window), rel=1e-6)
+
+
+def test_inference_pool_concurrent_submissions_exceed_slots(pool):
+    """More in-flight requests than slots are served through backpressure, each to its own caller."""
+    windows = [_random_window(MODEL_TYPE1_CONFIG, seed) for seed in range(10)]
+    futures = [pool.submit(TYPE1_COMPANY, window) for window in windows]
+    results = [future.result(timeout=120) for future in futures]
+
+    local = Predictor(backend="numpy", use_inference_pool=False)
+    expected = [local.predict_window(TYPE1_COMPANY, window) for window in windows]
+    np.testing.assert_allclose(results, expected, rtol=1e-6)
+
+
+def test_inference_pool_propagates_worker_errors(pool):
+    """Errors raised in a worker keep their type so the routes can map them to responses."""
+    with pytest.raises(ValueError, match="not configured for prediction"):
+        pool.predict("UNKNOWN", _random_window(MODEL_TYPE1_CONFIG, 0))
+
+
+def test_inference_pool_rejects_oversized_windows(pool):
+    with pytest.raises(ValueError, match="exceeds the inference pool slot shape"):
+        pool.predict(TYPE1_COMPANY, np.zeros((SEQ_LENGTH + 1, NUM_FEATURES)))
+
+
+def test_inference_pool_recovers_from_a_worker_dying_mid_task(pool):
+    """A request held by a dead worker fails right away and its slot is handed back to the pool."""
+    single = InferencePool(num_workers=1, seq_length=SEQ_LENGTH, num_features=NUM_FEATURES,
+                           slots=1, backend="numpy", timeout_seconds=120)
+    try:
+        window = _random_window(MODEL_TYPE1_CONFIG, 0)
+        future = single.submit(TYPE1_COMPANY, window)
+        single._processes[0].kill()  # Still importing the prediction stack, so the task is in flight
+        with pytest.raises(RuntimeError, match="exited"):
+            future.result(timeout=30)
+
+        # The only slot is free again and the restarted worker serves the next request
+        local = Predictor(backend="numpy", use_inference_pool=False)
+        assert single.predict(TYPE1_COMPANY, window) == pytest.approx(local.predict_window(TYPE1_COMPANY, window),
+                                                                      rel=1e-6)
+    finally:
+        single.shutdown()
+
+
+def test_inference_pool_load_warms_every_worker(pool):
+    """load() has each worker load a company's artifacts; load errors reach the caller."""
+    futures = pool.load(TYPE2_COMPANY)
+    assert len(futures) == pool.num_workers
+    assert [future.result(timeout=120) for future in futures] == [None] * pool.num_workers
+
+    with pytest.raises(ValueError, match="not configured for prediction"):
+        pool.load("UNKNOWN")[0].result(timeout=120)
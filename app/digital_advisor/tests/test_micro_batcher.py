@@ -0,0 +1,121 @@
+# test_micro_batcher.py
+
+import threading
+import pytest
+import numpy as np
+from unittest.mock import patch, MagicMock
+
+from src.services.prediction_service import Predictor
+from src.utils.metrics import Histogram
+from src.utils.micro_batcher import MicroBatcher
+
+
+def _submit_concurrently(submit, requests):
+    results = [None] * len(requests)
+    errors = [None] * len(requests)
+
+    def worker(i, key, item):
+        try:
+            results[i] = submit(key, item)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i, key, item)) for i, (key, item) in enumerate(requests)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+def test_histogram_cumulative_buckets():
+    histogram = Histogram("test", buckets=(1, 4))
+    for value in (1, 2, 3, 10):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == 16
+    assert snapshot["buckets"] == {"1": 1, "4": 3, "+Inf": 4}
+
+
+def test_micro_batcher_groups_by_key_and_scatters_results():
+    """Concurrent requests are merged per key and every caller gets its own result back."""
+    calls = []
+    gate = threading.Event()
+
+    def run_batch(key, items):
+        gate.wait(1)
+        calls.append((key, list(items)))
+        return [f"{key}:{item}" for item in items]
+
+    batcher = MicroBatcher(run_batch, max_batch_size=16, max_wait_ms=100, name="test.grouping")
+    requests = [("A", i) for i in range(4)] + [("B", i) for i in range(3)]
+    threading.Timer(0.05, gate.set).start()
+    results, errors = _submit_concurrently(batcher.submit, requests)
+
+    assert errors == [None] * len(requests)
+    assert results == [f"{key}:{item}" for key, item in requests]
+    assert sum(len(items) for _, items in calls) == len(requests)
+    assert len(calls) < len(requests) # At least some requests shared a call
+    assert batcher.batch_size.snapshot()["count"] == len(calls)
+
+
+def test_micro_batcher_propagates_errors_to_the_whole_group():
+    batcher = MicroBatcher(MagicMock(side_effect=ValueError("bad window")), max_wait_ms=20, name="test.errors")
+    results, errors = _submit_concurrently(batcher.submit, [("A", 1), ("A", 2)])
+    assert all(isinstance(e, ValueError) for e in errors)
+
+
+def test_micro_batcher_respects_max_batch_size():
+    sizes = []
+    batcher = MicroBatcher(lambda key, items: sizes.append(len(items)) or list(items),
+                           max_batch_size=2, max_wait_ms=50, name="test.size")
+    _submit_concurrently(batcher.submit, [("A", i) for i in range(5)])
+    assert max(sizes) <= 2
+    assert sum(sizes) == 5
+
+
+def test_micro_batcher_keys_do_not_wait_for_each_other():
+    """A blocked batch (e.g. a cold model load) only delays requests of its own key."""
+    release = threading.Event()
+
+    def run_batch(key, items):
+        if key == "slow":
+            release.wait(5)
+        return list(items)
+
+    batcher = MicroBatcher(run_batch, max_wait_ms=1, name="test.parallel")
+    slow = threading.Thread(target=batcher.submit, args=("slow", 1))
+    slow.start()
+    try:
+        fast_results, fast_errors = _submit_concurrently(batcher.submit, [("fast", 2)])
+        assert slow.is_alive()  # Still blocked while the other key was served
+        assert fast_results == [2] and fast_errors == [None]
+    finally:
+        release.set()
+        slow.join()
+
+
+@patch('src.services.prediction_service.ModelManager')
+@patch('src.services.prediction_service.BasePreprocessor')
+def test_predictor_micro_batching_runs_one_forward_pass(MockPreprocessor, MockModelManager):
+    """Concurrent predict_window calls for one company are stacked into a single model.predict."""
+    preprocessor = MockPreprocessor.return_value
+    preprocessor.prepare_input_batch.side_effect = lambda batch: batch
+    preprocessor.inverse_transform_batch.side_effect = lambda pred: pred[:, 0]
+    model = MockModelManager.return_value.get_model.return_value
+    model.predict.side_effect = lambda batch: batch[:, -1, :1]
+    loaded_in = []
+    MockModelManager.return_value.get_model.side_effect = \
+        lambda company: loaded_in.append(threading.current_thread().name) or model
+
+    predictor = Predictor(use_inference_pool=False, micro_batching=True)
+    predictor.micro_batcher.max_wait_seconds = 0.1
+    windows = [np.full((5, 3), float(i)) for i in range(6)]
+    results, errors = _submit_concurrently(predictor.predict_window, [("APP", w) for w in windows])
+
+    assert errors == [None] * len(windows)
+    assert results == [float(i) for i in range(6)]
+    assert model.predict.call_count < len(windows)
+    # Every caller loads (or finds) the model before queueing, so the dispatcher only gets warm lookups
+    assert sum(not name.startswith("predictor.micro_batch") for name in loaded_in) == len(windows)
@@ -0,0 +1,110 @@
+# test_model_registry.py
+
+import os
+import threading
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+
+from src.utils.model_registry import ModelRegistry
+from src.utils.prediction_utils import ModelManager
+
+
+def _artifact(tmp_path, name, size):
+    path = tmp_path / name
+    path.write_bytes(b"\0" * size)
+    return str(path)
+
+
+def test_registry_loads_each_key_once_under_concurrency(tmp_path):
+    """Concurrent misses for the same key share a single load."""
+    path = _artifact(tmp_path, "A.keras", 10)
+    registry = ModelRegistry()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("A", loader, [path]))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert "A" in registry
+
+
+def test_registry_evicts_least_recently_used_beyond_budget(tmp_path):
+    paths = {key: _artifact(tmp_path, f"{key}.keras", 100) for key in "ABC"}
+    registry = ModelRegistry(memory_budget_bytes=250)
+
+    registry.get("A", object, [paths["A"]])
+    registry.get("B", object, [paths["B"]])
+    registry.get("A", object, [paths["A"]]) # A becomes most recently used
+    registry.get("C", object, [paths["C"]])
+
+    assert registry.keys() == ["A", "C"]
+    assert registry.stats()["evictions"] == 1
+    assert registry.stats()["size_bytes"] == 200
+
+
+def test_registry_caches_load_failures_for_the_ttl(tmp_path):
+    """A missing artifact is not looked up on disk again until the failure TTL expires."""
+    registry = ModelRegistry(failure_ttl_seconds=60)
+    loader = MagicMock(side_effect=FileNotFoundError("missing"))
+
+    for _ in range(3):
+        with pytest.raises(FileNotFoundError):
+            registry.get("A", loader, [str(tmp_path / "A.keras")])
+    assert loader.call_count == 1
+
+    registry.failure_ttl_seconds = 0
+    time.sleep(0.01)
+    with pytest.raises(FileNotFoundError):
+        registry.get("A", loader, [str(tmp_path / "A.keras")])
+    assert loader.call_count == 2
+
+
+def test_registry_hot_reloads_changed_artifacts(tmp_path):
+    path = _artifact(tmp_path, "A.keras", 10)
+    registry = ModelRegistry(reload_check_seconds=0.01)
+    versions = iter(["v1", "v2"])
+    loader = lambda: next(versions)
+
+    assert registry.get("A", loader, [path]) == "v1"
+    time.sleep(0.02)
+    assert registry.get("A", loader, [path]) == "v1" # Unchanged file: no reload
+
+    os.utime(path, (time.time() + 5, time.time() + 5))
+    time.sleep(0.02)
+    assert registry.get("A", loader, [path]) == "v2"
+    assert registry.stats()["reloads"] == 1
+
+
+def test_registry_keeps_serving_when_a_reload_fails(tmp_path):
+    path = _artifact(tmp_path, "A.keras", 10)
+    registry = ModelRegistry(reload_check_seconds=0.01)
+    registry.get("A", lambda: "v1", [path])
+
+    os.utime(path, (time.time() + 5, time.time() + 5))
+    time.sleep(0.02)
+    assert registry.get("A", MagicMock(side_effect=RuntimeError("corrupt")), [path]) == "v1"
+
+
+@patch('src.utils.prediction_utils.load_model')
+def test_model_manager_uses_registry(mock_load_model, tmp_path):
+    """ModelManager serves repeated get_model calls from its registry."""
+    model_path = _artifact(tmp_path, "APP_model.keras", 10)
+    manager = ModelManager(backend="keras")
+    with patch.object(ModelManager, 'model_path', return_value=model_path):
+        first = manager.get_model("APP")
+        second = manager.get_model("APP")
+
+    assert first is second
+    mock_load_model.assert_called_once_with(model_path)
+    assert "APP" in manager.models
@@ -0,0 +1,81 @@
+# test_numpy_inference.py
+
+import os
+import pytest
+import numpy as np
+from unittest.mock import patch
+
+from src.config import MODEL_TYPE1_CONFIG, MODEL_TYPE2_CONFIG
+from src.utils.numpy_inference import NumpyModel
+from src.utils.prediction_utils import ModelManager
+
+
+@pytest.fixture(scope='module')
+def keras():
+    """Keras is only needed to produce reference outputs for the parity tests."""
+    tf = pytest.importorskip("tensorflow")
+    return tf.keras
+
+
+def _assert_parity(keras, model_path, batch_size=4):
+    keras_model = keras.models.load_model(model_path)
+    numpy_model = NumpyModel.from_keras_file(model_path)
+
+    rng = np.random.default_rng(42)
+    x = rng.random((batch_size, *numpy_model.input_shape), dtype=np.float32)
+    np.testing.assert_allclose(numpy_model.predict(x), keras_model.predict(x, verbose=0), rtol=1e-4, atol=1e-5)
+
+
+def test_numpy_model_parity_with_synthetic_keras_model(keras, tmp_path):
+    """Stacked LSTM/GRU/Dropout/Dense layers replay exactly like Keras."""
+    keras.utils.set_random_seed(0)
+    model = keras.Sequential([
+        keras.layers.Input(shape=(7, 5)),
+        keras.layers.LSTM(8, return_sequences=True),
+        keras.layers.GRU(6),
+        keras.layers.Dropout(0.3),
+        keras.layers.Dense(4, activation='relu'),
+        keras.layers.Dense(2),
+    ])
+    model_path = str(tmp_path / 'synthetic_model.keras')
+    model.save(model_path)
+
+    _assert_parity(keras, model_path)
+
+
+@pytest.mark.parametrize("model_dir,company", [
+    (MODEL_TYPE1_CONFIG["MODEL_DIR"], MODEL_TYPE1_CONFIG["COMPANIES"][0]),
+    (MODEL_TYPE2_CONFIG["MODEL_DIR"], MODEL_TYPE2_CONFIG["COMPANIES"][0]),
+])
+def test_numpy_model_parity_with_saved_artifacts(keras, model_dir, company):
+    """The shipped per-company models give the same predictions through both backends."""
+    model_path = os.path.join(model_dir, f"{company}_model.keras")
+    if not os.path.exists(model_path):
+        pytest.skip(f"No saved model for {company}")
+    _assert_parity(keras, model_path)
+
+
+def test_numpy_model_rejects_unsupported_layers():
+    """Unknown layer types fail loudly instead of producing wrong predictions."""
+    with pytest.raises(ValueError, match="not supported by the NumPy inference backend"):
+        NumpyModel.from_config([{'class_name': 'Conv1D', 'config': {}}], {})
+
+
+@patch('src.utils.prediction_utils.load_model')
+@patch('src.utils.prediction_utils.NumpyModel')
+@patch('os.path.exists', return_value=True)
+def test_model_manager_numpy_backend(mock_exists, MockNumpyModel, mock_load_model):
+    """ModelManager(backend='numpy') loads NumpyModels instead of Keras models."""
+    manager = ModelManager(backend='numpy')
+    model = manager.get_model('APP')
+
+    MockNumpyModel.from_keras_file.assert_called_once_with(
+        os.path.join(MODEL_TYPE1_CONFIG["MODEL_DIR"], 'APP_model.keras'))
+    assert model is MockNumpyModel.from_keras_file.return_value
+    mock_load_model.assert_not_called()
+
+
+def test_model_manager_rejects_unknown_backend():
+    """An unknown INFERENCE_BACKEND is reported when the manager is created."""
+    with pytest.raises(ValueError, match="Unsupported inference backend"):
+        ModelManager(backend='onnx')
@@ -5,6 +5,7 @@ from unittest.mock import patch, MagicMock, mock_open
 import numpy as np
 import pandas as pd
 import datetime
+import time
 import os
 from marshmallow import ValidationError
 
@@ -509,4 +510,152 @@ def mock_prediction_response_schema():
     with patch('src.routes.prediction_routes.PredictionResponseSchema') as MockSchemaClass:
         mock_schema_instance = MockSchemaClass.return_value
         mock_schema_instance.dump.return_value = {"predicted_close_value": 165.75}
-        yield mock_schema_instance
\ No newline at end of file
+        yield mock_schema_instance
+
+# --- Batch Prediction Tests ---
+@pytest.fixture
+def batch_dataset(app, add_dataset_bars, mock_prediction_utils_config):
+    """Seeds cleaned_dataset with enough bars for AAPL (Type 1) and MSFT (Type 2)."""
+    start = datetime.datetime(2024, 1, 2, 14, 30)
+    with app.app_context():
+        yield {
+            'AAPL': add_dataset_bars('AAPL', [100.0 + i for i in range(45)], start),
+            'MSFT': add_dataset_bars('MSFT', [200.0 + i for i in range(50)], start),
+        }
+
+
+def test_run_predictions_uses_one_window_query_and_saves(batch_dataset, mock_prediction_utils_config):
+    """run_predictions builds every window from one query, predicts the batch and stores the results."""
+    from src.models.prediction import Prediction
+    service = PredictionService()
+    service.predictor = MagicMock()
+    service.predictor.predict_batch.return_value = ({'AAPL': 150.0, 'MSFT': 250.0}, {})
+
+    with patch.dict('src.services.prediction_service.MODEL_TYPE2_CONFIG', {"FEATURES": DUMMY_FEATURES_TYPE1}):
+        predictions, errors = service.run_predictions(['aapl', 'MSFT', 'XYZ', 'AAPL'])
+
+    assert predictions == {'AAPL': 150.0, 'MSFT': 250.0}
+    assert list(errors) == ['XYZ']
+    raw_inputs = service.predictor.predict_batch.call_args[0][0]
+    assert set(raw_inputs) == {'AAPL', 'MSFT'}
+    assert len(raw_inputs['AAPL']['close_value']) == DUMMY_SEQ_LENGTH_TYPE1
+    assert len(raw_inputs['MSFT']['close_value']) == DUMMY_SEQ_LENGTH_TYPE2
+    assert raw_inputs['AAPL']['close_value'][-1] == 144.0
+
+    stored = Prediction.query.filter_by(
+        ticker='AAPL', timestamp=batch_dataset['AAPL'] + datetime.timedelta(minutes=1)).first()
+    assert stored is not None and stored.predicted_price == 150.0
+
+    # A second call is served from the stored predictions without running the models again
+    service.predictor.predict_batch.reset_mock()
+    predictions, errors = service.run_predictions(['AAPL', 'MSFT'])
+    assert predictions == {'AAPL': 150.0, 'MSFT': 250.0}
+    assert errors == {}
+    service.predictor.predict_batch.assert_not_called()
+
+
+def test_run_prediction_uses_incremental_feature_buffer(batch_dataset, mock_prediction_utils_config):
+    """run_prediction predicts from the rolling buffer and only appends bars newer than it on later calls."""
+    from src.services.prediction_service import build_raw_input_from_rows, BASE_QUERY_COLUMNS
+    service = PredictionService()
+    service.predictor = MagicMock()
+    service.predictor.predict_window.return_value = 150.0
+
+    assert service.run_prediction('AAPL') == 150.0
+    window = service.predictor.predict_window.call_args[0][1]
+    rows = db.session.query(*BASE_QUERY_COLUMNS).filter(Dataset.company_prefix == 'AAPL').order_by(Dataset.date_value).all()
+    expected = build_raw_input_from_rows('AAPL', rows, {"SEQ_LENGTH": DUMMY_SEQ_LENGTH_TYPE1, "FEATURES": DUMMY_FEATURES_TYPE1})
+    np.testing.assert_allclose(window, np.array([expected[f] for f in DUMMY_FEATURES_TYPE1]).T)
+    service.predictor.predict.assert_not_called()
+    buffer = service.feature_buffers['AAPL']
+    synced_count = buffer.count
+
+    # One new bar: the buffer is extended in place instead of being rebuilt
+    new_bar = batch_dataset['AAPL'] + datetime.timedelta(minutes=1)
+    db.session.add(Dataset(company_prefix='AAPL', date_value=new_bar, open_value=145.0, high_value=145.0,
+                           low_value=145.0, close_value=145.0, volume=1045))
+    db.session.commit()
+    service.invalidate_cache(['AAPL'])
+    assert service.run_prediction('AAPL') == 150.0
+    assert buffer.count == synced_count + 1 and buffer.last_timestamp == new_bar
+    assert service.predictor.predict_window.call_args[0][1][-1][0] == 145.0
+
+
+def test_predict_batch_route(client):
+    """GET /predict/batch returns the predictions and per-ticker errors as one JSON map."""
+    with patch('src.routes.prediction_routes.get_prediction_service') as mock_get_service:
+        mock_service = mock_get_service.return_value
+        mock_service.run_predictions.return_value = ({'APP': 101.5}, {'XYZ': 'not configured'})
+        response = client.get('/predict/batch?tickers=app, xyz')
+
+    assert response.status_code == 200
+    assert response.get_json() == {'predictions': {'APP': 101.5}, 'errors': {'XYZ': 'not configured'}}
+    mock_service.run_predictions.assert_called_once_with(['APP', 'XYZ'])
+
+
+def test_predict_batch_route_missing_tickers(client):
+    """GET /predict/batch without tickers is rejected."""
+    response = client.get('/predict/batch')
+    assert response.status_code == 400
+
+
+# --- Preload / Readiness Tests ---
+@patch('src.services.prediction_service.ModelManager')
+@patch('src.services.prediction_service.BasePreprocessor')
+@patch('src.services.prediction_service.Type2Preprocessor', side_effect=FileNotFoundError("PCA object not found"))
+def test_predictor_preload_records_status(MockType2Preprocessor, MockBasePreprocessor, MockModelManager, mock_prediction_utils_config):
+    """Predictor.preload loads every configured ticker and records per-ticker status and load time."""
+    predictor = Predictor()
+    predictor.preload(max_workers=2)
+
+    status = predictor.get_load_status()
+    assert set(status) == {'AAPL', 'GOOG', 'MSFT', 'AMZN'}
+    assert status['AAPL']['status'] == 'ready'
+    assert status['AAPL']['load_time_ms'] is not None
+    assert status['MSFT']['status'] == 'failed'
+    assert "PCA object not found" in status['MSFT']['error']
+    assert not predictor.is_ready()
+    MockModelManager.return_value.get_model.assert_any_call('GOOG')
+
+
+def test_readiness_route_reports_loading_workers(client):
+    """GET /healthz/ready returns 503 until every preloaded ticker is ready."""
+    with patch('src.routes.health_routes.get_prediction_service') as mock_get_service:
+        mock_service = mock_get_service.return_value
+        mock_service.predictor.is_ready.return_value = False
+        mock_service.predictor.get_load_status.return_value = {
+            'APP': {'status': 'loading', 'load_time_ms': None, 'error': None}
+        }
+        response = client.get('/healthz/ready')
+        assert response.status_code == 503
+        assert response.get_json()['tickers']['APP']['status'] == 'loading'
+
+        mock_service.predictor.is_ready.return_value = True
+        assert client.get('/healthz/ready').status_code == 200
+
+
+@patch('src.services.prediction_service.ModelManager')
+def test_predictor_preload_waits_for_inference_pool_workers(MockModelManager, mock_prediction_utils_config):
+    """In inference server mode a ticker stays "loading" until every pool worker confirmed loading it."""
+    from concurrent.futures import Future
+    predictor = Predictor(use_inference_pool=False)
+    predictor.inference_pool = MagicMock(timeout_seconds=5)
+    worker_loads = [Future(), Future()]
+    predictor.inference_pool.load.return_value = worker_loads
+
+    predictor.preload(companies=['AAPL'], wait=False)
+    for _ in range(100):
+        if predictor.inference_pool.load.called:
+            break
+        time.sleep(0.01)
+    worker_loads[0].set_result(None)
+    assert predictor.get_load_status()['AAPL']['status'] == 'loading'
+    assert not predictor.is_ready()
+
+    worker_loads[1].set_result(None)
+    for _ in range(100):
+        if predictor.is_ready():
+            break
+        time.sleep(0.01)
+    assert predictor.get_load_status()['AAPL']['status'] == 'ready'
+    predictor.inference_pool.load.assert_called_once_with('AAPL')
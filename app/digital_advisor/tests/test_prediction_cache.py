@@ -0,0 +1,93 @@
+# test_prediction_cache.py
+
+import datetime
+import pytest
+from unittest.mock import patch, MagicMock
+
+from src.extensions import db
+from src.models.dataset import Dataset
+from src.models.prediction import Prediction
+from src.services.prediction_service import PredictionService
+from src.services.prediction_storage_service import PredictionStorageService
+from src.utils.prediction_cache import PredictionCache
+
+BAR = datetime.datetime(2024, 1, 2, 14, 59)
+
+
+# --- PredictionCache ---
+def test_fresh_hit_needs_confirmed_latest_bar():
+    cache = PredictionCache(max_entries=10, ttl_seconds=60)
+    assert cache.get_fresh('APP') is None
+    assert cache.get('APP', BAR) is None
+    cache.put('APP', BAR, 150.0)
+    assert cache.get_fresh('APP') == 150.0
+
+    cache.invalidate('APP')
+    assert cache.get_fresh('APP') is None
+    assert cache.get('APP', BAR) == 150.0  # values survive invalidation, only the latest bar is forgotten
+    assert cache.stats()['hits'] == 2 and cache.stats()['misses'] == 1
+
+
+def test_fresh_hit_expires_after_ttl():
+    cache = PredictionCache(ttl_seconds=5)
+    with patch('src.utils.prediction_cache.time.monotonic', return_value=100.0):
+        cache.put('APP', BAR, 150.0)
+    with patch('src.utils.prediction_cache.time.monotonic', return_value=106.0):
+        assert cache.get_fresh('APP') is None
+
+
+def test_cache_is_bounded_lru():
+    cache = PredictionCache(max_entries=2, ttl_seconds=60)
+    cache.put('APP', BAR, 1.0)
+    cache.put('PEP', BAR, 2.0)
+    cache.get('APP', BAR)
+    cache.put('TSLA', BAR, 3.0)
+    assert cache.stats()['size'] == 2
+    assert cache.get('PEP', BAR) is None
+    assert cache.get('APP', BAR) == 1.0
+
+
+# --- Joined read path ---
+@pytest.fixture
+def seeded(app):
+    with app.app_context():
+        for minute in range(57, 60):
+            db.session.add(Dataset(company_prefix='APP', date_value=BAR.replace(minute=minute), open_value=1.0,
+                                   high_value=1.0, low_value=1.0, close_value=1.0, volume=1))
+        db.session.commit()
+        yield
+        db.session.rollback()
+        Prediction.query.filter_by(ticker='APP').delete()
+        Dataset.query.filter_by(company_prefix='APP').delete()
+        db.session.commit()
+
+
+def test_latest_bar_with_prediction_single_query(seeded):
+    storage = PredictionStorageService()
+    assert storage.get_latest_bar_with_prediction('APP') == (BAR, None)
+    assert storage.get_latest_bar_with_prediction('PEP') == (None, None)
+
+    # A prediction for an older bar's next minute is not the one for the latest bar
+    db.session.add(Prediction(ticker='APP', timestamp=BAR, predicted_price=99.0))
+    db.session.add(Prediction(ticker='APP', timestamp=BAR + datetime.timedelta(minutes=3), predicted_price=98.0))
+    db.session.commit()
+    assert storage.get_latest_bar_with_prediction('APP') == (BAR, None)
+
+    db.session.add(Prediction(ticker='APP', timestamp=BAR + datetime.timedelta(minutes=1), predicted_price=151.0))
+    db.session.commit()
+    latest, prediction = storage.get_latest_bar_with_prediction('APP')
+    assert latest == BAR and prediction.predicted_price == 151.0
+
+
+def test_run_prediction_hit_skips_the_database(seeded):
+    service = PredictionService()
+    db.session.add(Prediction(ticker='APP', timestamp=BAR + datetime.timedelta(minutes=1), predicted_price=151.0))
+    db.session.commit()
+
+    assert service.run_prediction('APP') == 151.0
+    with patch('src.services.prediction_service.db.session.query') as mock_query, \
+         patch.object(service.prediction_storage, 'get_latest_bar_with_prediction') as mock_lookup:
+        assert service.run_prediction('APP') == 151.0
+    mock_query.assert_not_called()
+    mock_lookup.assert_not_called()
+    assert service.prediction_cache.stats()['hits'] == 1
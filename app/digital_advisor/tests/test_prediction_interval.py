@@ -0,0 +1,117 @@
+# test_prediction_interval.py
+
+import os
+import pytest
+import numpy as np
+from unittest.mock import patch, MagicMock
+
+from src.config import MODEL_TYPE1_CONFIG, MODEL_TYPE2_CONFIG
+from src.services.prediction_service import Predictor
+
+
+@patch('src.services.prediction_service.ModelManager')
+@patch('src.services.prediction_service.Type2Preprocessor')
+def test_predict_interval_runs_one_sampled_batch(MockPreprocessor, MockModelManager):
+    """K samples are one forward pass with dropout on and one inverse transform over the batch."""
+    preprocessor = MockPreprocessor.return_value
+    preprocessor.prepare_input_batch.side_effect = lambda batch: batch
+    preprocessor.inverse_transform_batch.side_effect = lambda pred: pred[:, 0] * 10.0
+    MockModelManager.return_value.backend = "numpy"
+    model = MockModelManager.return_value.get_model.return_value
+    model.sample.side_effect = lambda x, samples: np.arange(samples, dtype=float)[:, np.newaxis]
+
+    predictor = Predictor(use_inference_pool=False, micro_batching=False)
+    interval = predictor.predict_interval("META", np.ones((5, 3)), samples=101, confidence=0.8)
+
+    assert model.sample.call_count == 1
+    assert model.sample.call_args.args[0].shape == (1, 5, 3)
+    assert model.sample.call_args.args[1] == 101
+    assert preprocessor.prepare_input_batch.call_count == 1
+    assert preprocessor.inverse_transform_batch.call_count == 1
+    # Samples are 0, 10, ..., 1000: the central 80% spans the 10th to the 90th percentile
+    assert interval["lower"] == pytest.approx(100.0)
+    assert interval["upper"] == pytest.approx(900.0)
+    assert interval["mean"] == pytest.approx(500.0)
+    assert interval["samples"] == 101
+    assert interval["confidence"] == 0.8
+
+
+def test_numpy_model_sample_repeats_only_after_dropout():
+    from src.utils.numpy_inference import NumpyModel, DropoutLayer, DenseLayer
+
+    prefix = MagicMock(side_effect=lambda x, training=False: x * 2.0)
+    dense = DenseLayer({'activation': 'linear'}, [np.ones((4, 1), dtype=np.float32), np.zeros(1, dtype=np.float32)])
+    model = NumpyModel([prefix, DropoutLayer({'rate': 0.5}, []), dense])
+
+    sampled = model.sample(np.ones((1, 4)), samples=500)
+    assert sampled.shape == (500, 1)
+    assert prefix.call_count == 1 and prefix.call_args.args[0].shape == (1, 4)
+    # Each kept unit contributes 2 / (1 - 0.5) = 4: the samples take several values averaging ~8
+    assert len(np.unique(sampled)) > 1
+    assert sampled.mean() == pytest.approx(8.0, rel=0.1)
+
+
+@patch('src.services.prediction_service.ModelManager')
+def test_predict_interval_rejects_invalid_requests(MockModelManager):
+    MockModelManager.return_value.backend = "tflite"
+    predictor = Predictor(use_inference_pool=False, micro_batching=False)
+    window = np.ones((5, 3))
+    with pytest.raises(ValueError, match="tflite"):
+        predictor.predict_interval("APP", window)
+    with pytest.raises(ValueError, match="at least 2 samples"):
+        predictor.predict_interval("APP", window, samples=1)
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        predictor.predict_interval("APP", window, confidence=1.5)
+
+
+@pytest.mark.parametrize("company, model_config", [("APP", MODEL_TYPE1_CONFIG), ("META", MODEL_TYPE2_CONFIG)])
+def test_predict_interval_with_saved_model(company, model_config):
+    """The saved models keep their Dropout layer, so the sampled closes spread around the point prediction."""
+    if not os.path.exists(os.path.join(model_config["MODEL_DIR"], f"{company}_model.keras")):
+        pytest.skip(f"No saved model for {company}")
+    predictor = Predictor(backend="numpy", use_inference_pool=False, micro_batching=False)
+    rng = np.random.default_rng(0)
+    window = 100.0 + rng.normal(size=(model_config["SEQ_LENGTH"], len(model_config["FEATURES"])))
+
+    point = predictor.predict_window(company, window)
+    interval = predictor.predict_interval(company, window, samples=256, confidence=0.98)
+
+    assert interval["upper"] > interval["lower"]
+    assert interval["std"] > 0
+    assert interval["lower"] <= point <= interval["upper"]
+
+
+def test_predict_endpoint_returns_interval(client):
+    service = MagicMock()
+    service.run_prediction.return_value = 101.0
+    service.run_prediction_interval.return_value = {
+        "lower": 99.0, "upper": 103.0, "mean": 101.2, "std": 1.1, "samples": 64, "confidence": 0.8, "latency_ms": 1.5
+    }
+    with patch('src.routes.prediction_routes.get_prediction_service', return_value=service):
+        response = client.get('/predict?ticker=APP&interval=true&confidence=0.8')
+        plain = client.get('/predict?ticker=APP')
+        invalid = client.get('/predict?ticker=APP&interval=1&confidence=high')
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["predicted_close_value"] == 101.0
+    assert body["interval"]["lower"] == 99.0 and body["interval"]["upper"] == 103.0
+    service.run_prediction_interval.assert_called_once_with('APP', confidence=0.8)
+    assert "interval" not in plain.get_json()
+    assert invalid.status_code == 400
+
+
+def test_predict_batch_endpoint_returns_intervals(client):
+    service = MagicMock()
+    service.run_predictions.return_value = ({'APP': 101.0, 'META': 500.0}, {})
+    interval = {"lower": 99.0, "upper": 103.0, "mean": 101.2, "std": 1.1, "samples": 64, "confidence": 0.9, "latency_ms": 1.5}
+    service.run_prediction_interval.side_effect = \
+        lambda ticker, confidence: interval if ticker == 'APP' else (_ for _ in ()).throw(ValueError("no data"))
+    with patch('src.routes.prediction_routes.get_prediction_service', return_value=service):
+        response = client.get('/predict/batch?tickers=APP,META&interval=true')
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["predictions"] == {'APP': 101.0, 'META': 500.0}
+    assert body["intervals"] == {'APP': interval}
+    assert body["errors"] == {'META': "Interval unavailable: no data"}
@@ -0,0 +1,78 @@
+# test_prediction_scheduler.py
+
+import datetime
+import fcntl
+import pytest
+from unittest.mock import MagicMock
+
+from src.extensions import db
+from src.models.dataset import Dataset
+from src.services.prediction_scheduler import PredictionScheduler
+
+
+def _add_bar(company, minute):
+    db.session.add(Dataset(company_prefix=company, date_value=datetime.datetime(2024, 1, 2, 14, minute),
+                           open_value=100.0, high_value=100.0, low_value=100.0, close_value=100.0, volume=1000))
+    db.session.commit()
+
+
+@pytest.fixture
+def scheduler(app, tmp_path):
+    service = MagicMock()
+    service.run_predictions.side_effect = lambda companies: ({c: 123.0 for c in companies}, {})
+    scheduler = PredictionScheduler(app, lambda: service, companies=['APP', 'TSLA'],
+                                    interval_seconds=60, jitter_seconds=5,
+                                    lock_file=str(tmp_path / 'scheduler.lock'))
+    with app.app_context():
+        yield scheduler, service
+        db.session.rollback()
+        Dataset.query.filter(Dataset.company_prefix.in_(['APP', 'TSLA'])).delete(synchronize_session=False)
+        db.session.commit()
+
+
+def test_tick_predicts_only_tickers_with_new_bars(scheduler):
+    scheduler, service = scheduler
+    _add_bar('APP', 30)
+    _add_bar('TSLA', 30)
+
+    summary = scheduler.run_once()
+    assert summary['status'] == 'ok' and summary['predicted'] == ['APP', 'TSLA']
+    service.run_predictions.assert_called_once_with(['APP', 'TSLA'])
+
+    # Nothing new: no inference at all
+    service.run_predictions.reset_mock()
+    assert scheduler.run_once()['updated'] == []
+    service.run_predictions.assert_not_called()
+
+    _add_bar('TSLA', 31)
+    scheduler.run_once()
+    service.run_predictions.assert_called_once_with(['TSLA'])
+
+
+def test_failed_ticker_is_retried_next_tick(scheduler):
+    scheduler, service = scheduler
+    _add_bar('APP', 30)
+    service.run_predictions.side_effect = [({}, {'APP': 'Not enough historical data'}), ({'APP': 1.0}, {})]
+
+    assert scheduler.run_once()['errors'] == {'APP': 'Not enough historical data'}
+    assert scheduler.run_once()['predicted'] == ['APP']
+    assert service.run_predictions.call_count == 2
+
+
+def test_overlapping_ticks_are_skipped(scheduler):
+    scheduler, service = scheduler
+    with scheduler._run_lock:
+        assert scheduler.run_once()['status'] == 'skipped'
+
+    with open(scheduler.lock_file, 'a') as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        assert scheduler.run_once() == {'status': 'skipped', 'reason': 'locked by another process'}
+        fcntl.flock(handle, fcntl.LOCK_UN)
+    service.run_predictions.assert_not_called()
+
+
+def test_next_delay_adds_jitter(scheduler):
+    scheduler, _ = scheduler
+    delays = [scheduler.next_delay() for _ in range(50)]
+    assert all(60 <= d <= 65 for d in delays)
+    assert len(set(delays)) > 1
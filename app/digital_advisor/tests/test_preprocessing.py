@@ -0,0 +1,81 @@
+# test_preprocessing.py
+
+import os
+import pytest
+import numpy as np
+from unittest.mock import patch
+from sklearn.preprocessing import MinMaxScaler
+from sklearn.decomposition import PCA
+
+from src.config import MODEL_TYPE1_CONFIG, MODEL_TYPE2_CONFIG
+from src.utils.prediction_utils import BasePreprocessor, Type2Preprocessor
+
+N_FEATURES = len(MODEL_TYPE2_CONFIG["FEATURES"])
+SEQ_LENGTH = MODEL_TYPE2_CONFIG["SEQ_LENGTH"]
+
+
+def _training_data(rng):
+    # Features on very different scales, like close_value vs. volume vs. rates
+    return rng.random((500, N_FEATURES)) * np.logspace(0, 6, N_FEATURES) + np.arange(N_FEATURES)
+
+
+@pytest.fixture
+def fitted_objects():
+    rng = np.random.default_rng(7)
+    train = _training_data(rng)
+    scaler = MinMaxScaler().fit(train)
+    pca = PCA(n_components=3).fit(scaler.transform(train))
+    whitened_pca = PCA(n_components=3, whiten=True).fit(scaler.transform(train))
+    windows = _training_data(rng)[:4 * SEQ_LENGTH].reshape(4, SEQ_LENGTH, N_FEATURES)
+    return scaler, pca, whitened_pca, windows
+
+
+@patch('os.path.exists', return_value=True)
+def test_base_preprocessor_fused_parity(mock_exists, fitted_objects):
+    """The precomputed scale/offset vectors match MinMaxScaler in both directions for a whole batch."""
+    scaler, _, _, windows = fitted_objects
+    with patch('joblib.load', return_value=scaler):
+        preprocessor = BasePreprocessor('APP')
+    assert preprocessor.forward_scale is not None
+
+    expected = np.stack([scaler.transform(w) for w in windows])
+    np.testing.assert_allclose(preprocessor.prepare_input_batch(windows), expected, rtol=1e-10, atol=1e-12)
+
+    scaled_close = np.array([[0.1], [0.5], [0.9]])
+    dummy = np.zeros((3, N_FEATURES))
+    dummy[:, preprocessor.close_value_idx] = scaled_close.ravel()
+    expected_close = scaler.inverse_transform(dummy)[:, preprocessor.close_value_idx]
+    np.testing.assert_allclose(preprocessor.inverse_transform_batch(scaled_close), expected_close, rtol=1e-10)
+
+
+@pytest.mark.parametrize("whiten", [False, True])
+@patch('os.path.exists', return_value=True)
+def test_type2_preprocessor_fused_parity(mock_exists, whiten, fitted_objects):
+    """The fused scaler+PCA matrix and the closed-form inverse match the sklearn objects."""
+    scaler, pca, whitened_pca, windows = fitted_objects
+    pca = whitened_pca if whiten else pca
+    with patch('joblib.load', side_effect=[scaler, pca]):
+        preprocessor = Type2Preprocessor('NVDA')
+    assert preprocessor.forward_matrix.shape == (N_FEATURES, 3)
+
+    expected = np.stack([pca.transform(scaler.transform(w)) for w in windows])
+    np.testing.assert_allclose(preprocessor.prepare_input_batch(windows), expected, rtol=1e-9, atol=1e-9)
+
+    predicted = np.random.default_rng(3).normal(size=(5, 3))
+    expected_close = scaler.inverse_transform(pca.inverse_transform(predicted))[:, preprocessor.close_value_idx]
+    np.testing.assert_allclose(preprocessor.inverse_transform_batch(predicted), expected_close, rtol=1e-9)
+    assert preprocessor.inverse_transform_prediction(predicted[:1]) == pytest.approx(expected_close[0])
+
+
+def test_type2_preprocessor_fused_parity_with_saved_artifacts():
+    """The shipped scaler/PCA pickles give the same model input through the fused path."""
+    company = MODEL_TYPE2_CONFIG["COMPANIES"][0]
+    if not os.path.exists(os.path.join(MODEL_TYPE2_CONFIG["PCA_DIR"], f"{company}_pca.pkl")):
+        pytest.skip(f"No saved PCA for {company}")
+    preprocessor = Type2Preprocessor(company)
+
+    rng = np.random.default_rng(11)
+    low, high = preprocessor.scaler.data_min_, preprocessor.scaler.data_max_
+    windows = low + rng.random((2, SEQ_LENGTH, N_FEATURES)) * (high - low)
+    expected = np.stack([preprocessor.pca.transform(preprocessor.scaler.transform(w)) for w in windows])
+    np.testing.assert_allclose(preprocessor.prepare_input_batch(windows), expected, rtol=1e-8, atol=1e-8)
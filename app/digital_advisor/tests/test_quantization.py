@@ -0,0 +1,83 @@
+# test_quantization.py
+
+import datetime
+import os
+import pytest
+import numpy as np
+from unittest.mock import patch
+
+from src.config import MODEL_TYPE1_CONFIG, MODEL_TYPE2_CONFIG
+from src.services.prediction_service import PredictionService
+from src.services.quantization_report import build_quantization_report
+from src.utils.numpy_inference import NumpyModel, QuantizedTensor
+from src.utils.prediction_utils import ModelManager
+
+META_MODEL = os.path.join(MODEL_TYPE2_CONFIG["MODEL_DIR"], "META_model.keras")
+
+
+@pytest.fixture(scope='module')
+def meta_model():
+    if not os.path.exists(META_MODEL):
+        pytest.skip("No saved model for META")
+    return NumpyModel.from_keras_file(META_MODEL)
+
+
+def test_int8_tensor_round_trip_within_half_a_step():
+    rng = np.random.default_rng(0)
+    weights = rng.normal(size=(12, 32)).astype(np.float32)
+    tensor = QuantizedTensor.quantize(weights, "int8")
+
+    assert tensor.values.dtype == np.int8
+    assert np.abs(tensor.dequantize() - weights).max() <= tensor.scale / 2 + 1e-7
+    x = rng.random((3, 12), dtype=np.float32)
+    np.testing.assert_allclose(x @ tensor, x @ tensor.dequantize(), rtol=1e-5, atol=1e-6)
+
+
+@pytest.mark.parametrize("precision,max_ratio,tolerance", [("float16", 0.51, 1e-3), ("int8", 0.27, 2e-2)])
+def test_quantized_model_tracks_float32(meta_model, precision, max_ratio, tolerance):
+    """Reduced-precision weights shrink the model and stay close to the float32 predictions."""
+    quantized = meta_model.quantized(precision)
+    x = np.random.default_rng(1).random((16, *meta_model.input_shape), dtype=np.float32)
+
+    assert quantized.precision == precision
+    assert quantized.nbytes <= meta_model.nbytes * max_ratio + 1024 # Biases stay float32
+    np.testing.assert_allclose(quantized.predict(x), meta_model.predict(x), atol=tolerance)
+    assert meta_model.precision == "float32" # The source model is not modified
+
+
+def test_model_manager_rejects_reduced_precision_without_numpy_backend():
+    with pytest.raises(ValueError, match="only supported by the 'numpy' inference backend"):
+        ModelManager(backend='keras', precision='int8')
+    with pytest.raises(ValueError, match="Unsupported model precision"):
+        ModelManager(backend='numpy', precision='int4')
+
+
+@patch('src.utils.prediction_utils.NumpyModel')
+@patch('os.path.exists', return_value=True)
+def test_model_manager_applies_precision_overrides(mock_exists, MockNumpyModel):
+    manager = ModelManager(backend='numpy', precision='float16', precision_overrides={'PEP': 'int8', 'TSLA': 'float32'})
+    loaded = MockNumpyModel.from_keras_file.return_value
+
+    manager.get_model('APP')
+    manager.get_model('PEP')
+    assert manager.get_model('TSLA') is loaded
+    assert [c.args for c in loaded.quantized.call_args_list] == [('float16',), ('int8',)]
+
+
+def test_quantization_report_over_recent_windows(app, add_dataset_bars):
+    """The report compares every precision on real artifacts over the seeded cleaned_dataset rows."""
+    if not os.path.exists(os.path.join(MODEL_TYPE1_CONFIG["MODEL_DIR"], "APP_model.keras")):
+        pytest.skip("No saved model for APP")
+    start = datetime.datetime(2024, 2, 1, 14, 30)
+    with app.app_context():
+        add_dataset_bars('APP', [100.0 + np.sin(i / 5.0) for i in range(100)], start)
+        service = PredictionService()
+        report = build_quantization_report(service, ['APP', 'XYZ'], num_windows=20, latency_repeats=2)
+
+    assert 'XYZ' in report["errors"]
+    app_report = report["companies"]["APP"]
+    assert app_report["windows"] == 20
+    assert set(app_report) == {"windows", "float32", "float16", "int8"}
+    assert app_report["int8"]["weight_bytes"] < app_report["float16"]["weight_bytes"] < app_report["float32"]["weight_bytes"]
+    assert app_report["float16"]["mae"] <= app_report["int8"]["mae"] + 1e-6
+    assert app_report["float32"]["mae_vs_actual"] is not None
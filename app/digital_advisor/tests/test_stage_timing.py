@@ -0,0 +1,94 @@
+# test_stage_timing.py
+
+import datetime
+import pytest
+from unittest.mock import patch
+
+from src.services.prediction_service import PredictionService
+from src.utils.stage_timing import timing_scope, stage, stage_timings_snapshot
+
+START = datetime.datetime(2024, 5, 6, 14, 30)
+NUM_BARS = 80
+
+
+@pytest.fixture
+def seeded(app, add_dataset_bars):
+    with app.app_context():
+        add_dataset_bars('TSLA', [50.0 + i for i in range(NUM_BARS)], START)
+        yield
+
+
+@pytest.fixture
+def service():
+    with patch('src.services.prediction_service.ModelManager') as MockModelManager, \
+         patch('src.services.prediction_service.BasePreprocessor') as MockPreprocessor:
+        preprocessor = MockPreprocessor.return_value
+        preprocessor.prepare_input_batch.side_effect = lambda batch: batch
+        preprocessor.inverse_transform_batch.side_effect = lambda pred: pred[:, 0]
+        MockModelManager.return_value.get_model.return_value.predict.side_effect = lambda batch: batch[:, -1, :1] + 1.0
+        yield PredictionService()
+
+
+def test_nested_scopes_and_server_timing_header():
+    with timing_scope() as request_scope:
+        with stage("outside_any_ticker"):
+            pass
+        with timing_scope("ZZTEST"):
+            with stage("query"):
+                pass
+            with stage("query"):
+                pass
+    with stage("no_scope"):
+        pass
+
+    assert [name for name, _ in request_scope.spans] == ["outside_any_ticker", "query", "query"]
+    assert list(request_scope.totals()) == ["outside_any_ticker", "query"]
+    header = request_scope.server_timing_header()
+    assert header.startswith("outside_any_ticker;dur=") and ", query;dur=" in header
+    # Only spans inside a ticker scope feed the histograms
+    snapshot = stage_timings_snapshot(["zztest"])
+    assert list(snapshot) == ["ZZTEST"] and list(snapshot["ZZTEST"]) == ["query"]
+    assert snapshot["ZZTEST"]["query"]["count"] == 2
+
+
+def test_run_prediction_records_every_stage(seeded, service):
+    before = stage_timings_snapshot(["TSLA"]).get("TSLA", {})
+    with timing_scope() as scope:
+        predicted = service.run_prediction('TSLA')
+
+    assert predicted == pytest.approx(50.0 + NUM_BARS - 1 + 1.0)
+    assert list(scope.totals()) == ["latest_bar", "buffer_sync", "preprocess", "model_predict",
+                                    "inverse_transform", "save", "total"]
+    after = stage_timings_snapshot(["TSLA"])["TSLA"]
+    for name in scope.totals():
+        assert after[name]["count"] == before.get(name, {}).get("count", 0) + 1
+    # The stages run inside `total`
+    totals = scope.totals()
+    assert sum(ms for name, ms in totals.items() if name != "total") <= totals["total"]
+
+
+def test_run_prediction_unknown_ticker_records_no_histograms(service):
+    """Arbitrary tickers from requests are rejected before any per-ticker histogram is created."""
+    for i in range(3):
+        with pytest.raises(ValueError, match="not configured for prediction"):
+            service.run_prediction(f'JUNK{i}')
+    assert stage_timings_snapshot([f'JUNK{i}' for i in range(3)]) == {}
+
+
+def test_predict_endpoint_server_timing_header(app, client, seeded, service):
+    with patch('src.routes.prediction_routes.get_prediction_service', return_value=service):
+        app.config["SERVER_TIMING_ENABLED"] = True
+        try:
+            response = client.get('/predict?ticker=TSLA')
+        finally:
+            app.config["SERVER_TIMING_ENABLED"] = False
+        plain = client.get('/predict?ticker=TSLA')
+
+    assert response.status_code == 200
+    header = response.headers['Server-Timing']
+    assert "latest_bar;dur=" in header and "model_predict;dur=" in header and "total;dur=" in header
+    assert 'Server-Timing' not in plain.headers
+
+    timings = client.get('/predict/timings?tickers=TSLA').get_json()["timings"]
+    assert set(timings) == {"TSLA"}
+    assert timings["TSLA"]["total"]["count"] >= 2
@@ -0,0 +1,46 @@
+# test_startup.py
+
+import os
+import subprocess
+import sys
+
+from src.utils.startup_report import parse_importtime
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def test_create_app_does_not_import_prediction_stack():
+    """Booting the app must not pull in TensorFlow, scikit-learn or pandas."""
+    code = (
+        "import sys; from src import create_app; create_app(); "
+        "print(','.join(m for m in ('tensorflow', 'keras', 'sklearn', 'pandas') if m in sys.modules))"
+    )
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                               cwd=PROJECT_DIR, check=True)
+    assert completed.stdout.strip() == ""
+
+
+def test_prediction_service_is_built_lazily():
+    """The shared PredictionService is only created on first use."""
+    from src.routes import prediction_routes
+
+    prediction_routes._prediction_service_instance = None
+    service = prediction_routes.get_prediction_service()
+    assert service is prediction_routes.get_prediction_service()
+    prediction_routes._prediction_service_instance = None
+
+
+def test_parse_importtime():
+    """`-X importtime` lines are parsed into per-module timings."""
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     _io\n"
+        "import time:      2500 |       4000 | numpy\n"
+        "unrelated line\n"
+    )
+    entries = parse_importtime(stderr)
+    assert [e["module"] for e in entries] == ["_io", "numpy"]
+    assert entries[0]["depth"] == 2
+    assert entries[1]["depth"] == 0
+    assert entries[1]["self_ms"] == 2.5
+    assert entries[1]["cumulative_ms"] == 4.0
@@ -0,0 +1,106 @@
+# test_swr.py
+
+import datetime
+import threading
+import pytest
+from unittest.mock import patch, MagicMock
+
+from src.extensions import db
+from src.models.dataset import Dataset
+from src.models.prediction import Prediction
+from src.services import price_service
+from src.services.prediction_service import PredictionService
+from src.utils.background_refresh import BackgroundRefresher
+
+BAR = datetime.datetime(2024, 1, 2, 15, 10)
+
+
+@pytest.fixture
+def seeded(app):
+    with app.app_context():
+        db.session.add(Dataset(company_prefix='PEP', date_value=BAR, open_value=1.0, high_value=1.0,
+                               low_value=1.0, close_value=1.0, volume=1))
+        db.session.add(Prediction(ticker='PEP', timestamp=BAR - datetime.timedelta(minutes=1), predicted_price=170.0))
+        db.session.commit()
+        yield
+        db.session.rollback()
+        Prediction.query.filter_by(ticker='PEP').delete()
+        Dataset.query.filter_by(company_prefix='PEP').delete()
+        db.session.commit()
+
+
+def test_swr_serves_previous_prediction_without_running_the_model(seeded):
+    service = PredictionService()
+    service.predictor = MagicMock()
+
+    value, freshness, age_seconds = service.get_prediction_swr('pep', max_staleness_seconds=300)
+    assert (value, freshness, age_seconds) == (170.0, 'stale', 120.0)
+    service.predictor.predict.assert_not_called()
+    service.predictor.predict_window.assert_not_called()
+
+    # Too old for the allowed staleness: computed synchronously instead
+    with patch.object(service, 'run_prediction', return_value=171.0) as mock_run:
+        assert service.get_prediction_swr('PEP', max_staleness_seconds=60) == (171.0, 'fresh', 0.0)
+    mock_run.assert_called_once_with('PEP')
+
+
+def test_swr_returns_fresh_prediction_for_latest_bar(seeded):
+    db.session.add(Prediction(ticker='PEP', timestamp=BAR + datetime.timedelta(minutes=1), predicted_price=172.0))
+    db.session.commit()
+    service = PredictionService()
+    assert service.get_prediction_swr('PEP', max_staleness_seconds=300) == (172.0, 'fresh', 0.0)
+
+
+def test_predict_route_swr_schedules_refresh(client, app):
+    mock_service = MagicMock()
+    mock_service.get_prediction_swr.return_value = (170.0, 'stale', 120.0)
+    mock_refresher = MagicMock()
+    with patch.dict(app.config, {"SWR_ENABLED": True}), \
+         patch('src.routes.prediction_routes.get_prediction_service', return_value=mock_service), \
+         patch('src.routes.prediction_routes.get_background_refresher', return_value=mock_refresher):
+        response = client.get('/predict?ticker=pep')
+
+    assert response.status_code == 200
+    assert response.headers['X-Data-Freshness'] == 'stale'
+    assert response.get_json() == {"predicted_close_value": 170.0, "freshness": "stale", "age_seconds": 120.0}
+    assert mock_refresher.submit.call_args[0][1] == ('predict', 'PEP')
+
+
+def test_price_swr_snapshots(monkeypatch):
+    monkeypatch.setattr(price_service, '_price_snapshots', {})
+    clock = [100.0]
+    monkeypatch.setattr(price_service.time, 'monotonic', lambda: clock[0])
+    reads = []
+    monkeypatch.setattr(price_service, 'get_latest_prices_for_tickers',
+                        lambda tickers: reads.append(list(tickers)) or {t: 10.0 for t in tickers})
+
+    assert price_service.get_latest_prices_swr(['APP'], 5, 60) == ({'APP': 10.0}, 'fresh', 0.0)
+    clock[0] = 103.0
+    assert price_service.get_latest_prices_swr(['APP'], 5, 60)[1] == 'fresh'
+    clock[0] = 130.0
+    assert price_service.get_latest_prices_swr(['APP'], 5, 60) == ({'APP': 10.0}, 'stale', 30.0)
+    clock[0] = 200.0
+    assert price_service.get_latest_prices_swr(['APP'], 5, 60)[1] == 'fresh'
+    assert len(reads) == 2
+
+
+def test_background_refresher_deduplicates_by_key(app):
+    refresher = BackgroundRefresher(max_workers=1)
+    release = threading.Event()
+    done = threading.Event()
+    calls = []
+
+    def refresh():
+        calls.append(1)
+        release.wait(2)
+        done.set()
+
+    assert refresher.submit(app, 'APP', refresh)
+    assert not refresher.submit(app, 'APP', refresh)
+    release.set()
+    done.wait(2)
+    for _ in range(100):
+        if not refresher.pending():
+            break
+        threading.Event().wait(0.01)
+    assert calls == [1] and refresher.pending() == set()
@@ -0,0 +1,72 @@
+# test_tf_threading.py
+
+import pytest
+from unittest.mock import patch
+
+from src.utils import tf_threading
+from src.utils.prediction_utils import ModelManager
+from src.utils.tf_threading import available_cpus, derive_thread_counts
+
+
+def test_derive_thread_counts_splits_cpus_over_processes():
+    assert derive_thread_counts("auto", "auto", processes=1, cpus=16) == (16, 8)
+    assert derive_thread_counts("auto", "auto", processes=4, cpus=16) == (4, 2)
+    # More processes than CPUs still leaves every process one thread of each kind
+    assert derive_thread_counts("auto", "auto", processes=8, cpus=4) == (1, 1)
+    # Explicit values win; 0 keeps TensorFlow's default
+    assert derive_thread_counts("3", "auto", processes=4, cpus=16) == (3, 1)
+    assert derive_thread_counts("0", "0", processes=4, cpus=16) == (0, 0)
+    assert derive_thread_counts("0", "auto", processes=4, cpus=16) == (0, 2)
+
+
+@pytest.mark.parametrize("setting", ["many", "-1"])
+def test_derive_thread_counts_rejects_invalid_settings(setting):
+    with pytest.raises(ValueError, match="non-negative integer"):
+        derive_thread_counts(setting, "auto", processes=1, cpus=4)
+
+
+def test_available_cpus_is_positive():
+    assert available_cpus() >= 1
+
+
+@patch('src.utils.prediction_utils.os.path.exists', return_value=True)
+@patch('src.utils.prediction_utils.load_model')
+@patch('src.utils.prediction_utils.apply_tensorflow_threads')
+def test_model_manager_sizes_threads_before_the_first_keras_load(mock_apply, mock_load_model, mock_exists):
+    calls = []
+    mock_apply.side_effect = lambda intra, inter: calls.append(("apply", intra, inter))
+    mock_load_model.side_effect = lambda path: calls.append(("load", path))
+
+    manager = ModelManager(backend="keras", intra_op_threads="auto", inter_op_threads="1", serving_processes=1)
+    manager.get_model("APP")
+
+    assert manager.inter_op_threads == 1
+    assert manager.intra_op_threads == available_cpus()
+    assert [call[0] for call in calls] == ["apply", "load"]
+    assert calls[0][1:] == (manager.intra_op_threads, 1)
+
+
+@patch('src.utils.prediction_utils.os.path.exists', return_value=True)
+@patch('src.utils.prediction_utils.TFLiteModel')
+@patch('src.utils.prediction_utils.apply_tensorflow_threads')
+def test_model_manager_sizes_tflite_interpreter(mock_apply, MockTFLiteModel, mock_exists):
+    ModelManager(backend="tflite", intra_op_threads="2", inter_op_threads="1").get_model("APP")
+    assert MockTFLiteModel.from_keras_file.call_args.kwargs == {"num_threads": 2}
+    mock_apply.assert_called_once_with(2, 1)
+
+
+@patch('src.utils.prediction_utils.NumpyModel')
+@patch('src.utils.prediction_utils.os.path.exists', return_value=True)
+@patch('src.utils.prediction_utils.apply_tensorflow_threads')
+def test_numpy_backend_leaves_tensorflow_alone(mock_apply, mock_exists, MockNumpyModel):
+    ModelManager(backend="numpy").get_model("APP")
+    mock_apply.assert_not_called()
+
+
+def test_apply_tensorflow_threads_runs_once_per_process(monkeypatch):
+    monkeypatch.setattr(tf_threading, "_attempted", False)
+    monkeypatch.setattr(tf_threading, "_applied", None)
+    with patch.dict('sys.modules', {'tensorflow': None}):
+        # Without TensorFlow (tflite_runtime deployments) there is nothing to size
+        assert tf_threading.apply_tensorflow_threads(2, 1) is None
+    assert tf_threading.apply_tensorflow_threads(4, 2) is None
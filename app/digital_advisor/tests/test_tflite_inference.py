@@ -0,0 +1,73 @@
+# test_tflite_inference.py
+
+import os
+import pytest
+import numpy as np
+from unittest.mock import patch
+
+from src.config import MODEL_TYPE2_CONFIG
+from src.utils.tflite_inference import TFLiteModel, tflite_path_for
+from src.utils.prediction_utils import ModelManager
+
+
+@pytest.fixture(scope='module')
+def keras():
+    tf = pytest.importorskip("tensorflow")
+    return tf.keras
+
+
+@pytest.fixture
+def synthetic_model_path(keras, tmp_path):
+    keras.utils.set_random_seed(1)
+    model = keras.Sequential([
+        keras.layers.Input(shape=(6, 4)),
+        keras.layers.LSTM(8),
+        keras.layers.Dropout(0.3),
+        keras.layers.Dense(5),
+        keras.layers.Dense(3),
+    ])
+    model_path = str(tmp_path / 'TEST_model.keras')
+    model.save(model_path)
+    return model_path
+
+
+def test_tflite_model_parity_and_cache(keras, synthetic_model_path):
+    """The converted flatbuffer is cached next to the .keras file and matches Keras' predictions."""
+    tflite_model = TFLiteModel.from_keras_file(synthetic_model_path)
+    assert os.path.exists(tflite_path_for(synthetic_model_path))
+
+    x = np.random.default_rng(0).random((3, 6, 4), dtype=np.float32)
+    expected = keras.models.load_model(synthetic_model_path).predict(x, verbose=0)
+    np.testing.assert_allclose(tflite_model.predict(x), expected, rtol=1e-4, atol=1e-5)
+
+    # Second load reuses the cached flatbuffer
+    with patch('src.utils.tflite_inference.convert_keras_file') as mock_convert:
+        TFLiteModel.from_keras_file(synthetic_model_path)
+        mock_convert.assert_not_called()
+
+
+def test_tflite_model_reconverts_stale_cache(keras, synthetic_model_path):
+    """A .keras artifact newer than its cached flatbuffer is converted again."""
+    TFLiteModel.from_keras_file(synthetic_model_path)
+    tflite_path = tflite_path_for(synthetic_model_path)
+    stale = os.path.getmtime(synthetic_model_path) - 60
+    os.utime(tflite_path, (stale, stale))
+
+    with patch('src.utils.tflite_inference.convert_keras_file') as mock_convert, \
+         patch('src.utils.tflite_inference.TFLiteModel.__init__', return_value=None):
+        TFLiteModel.from_keras_file(synthetic_model_path)
+        mock_convert.assert_called_once_with(synthetic_model_path, tflite_path)
+
+
+@patch('src.utils.prediction_utils.load_model')
+@patch('src.utils.prediction_utils.TFLiteModel')
+@patch('os.path.exists', return_value=True)
+def test_model_manager_tflite_backend(mock_exists, MockTFLiteModel, mock_load_model):
+    """ModelManager(backend='tflite') serves TFLiteModels."""
+    manager = ModelManager(backend='tflite')
+    model = manager.get_model('NVDA')
+
+    MockTFLiteModel.from_keras_file.assert_called_once_with(
+        os.path.join(MODEL_TYPE2_CONFIG["MODEL_DIR"], 'NVDA_model.keras'), num_threads=manager.intra_op_threads or None)
+    assert model is MockTFLiteModel.from_keras_file.return_value
+    mock_load_model.assert_not_called()